@@ -4,7 +4,7 @@ Provides a web interface for generating presentations from documentation.
 """
 import os
 import json
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from werkzeug.utils import secure_filename
 from datetime import datetime
 from dotenv import load_dotenv
@@ -13,9 +13,16 @@ import traceback
 # Load environment variables from .env file
 load_dotenv(override=True)
 
-from src.core.graph_pipeline2 import create_pipeline2_graph
-from src.utils.registry_helper import load_all_registries
+from src.core.graph_pipeline2 import get_pipeline2_graph
+from src.utils.registry_helper import get_registry_store, list_template_files
 from src.core.state import PPTState
+from src.config import (
+    LLM_CACHE_ENABLED, CONTENT_CACHE_ENABLED,
+    TEMPLATE_WATCH_ENABLED, TEMPLATE_WATCH_DEBOUNCE_SECONDS, TEMPLATE_WATCH_POLL_SECONDS,
+    DECK_STREAM_CHUNK_KB, PERSIST_STREAMED_DECKS
+)
+from src.utils.llm_cache import get_llm_cache, get_content_cache
+from src.utils.deck_output import PPTX_MIMETYPE, get_deck_persister, iter_chunks
 from langchain_core.runnables import RunnableConfig
 
 app = Flask(__name__)
@@ -39,22 +46,22 @@ def get_templates():
     """Get list of available templates."""
     try:
         templates_dir = 'data/templates'
-        registry_dir = 'data/registry'
         
         if not os.path.exists(templates_dir):
             return jsonify({'error': 'Templates directory not found'}), 404
         
+        # Both listings are cached and only re-scanned when their directory changes
+        registry_catalog = get_registry_store().catalog()
+        
         templates = []
-        for file in os.listdir(templates_dir):
-            if file.endswith('.pptx'):
-                template_name = os.path.splitext(file)[0]
-                registry_file = os.path.join(registry_dir, f"{template_name}.json")
-                
-                templates.append({
-                    'name': file,
-                    'displayName': template_name.replace('_', ' ').title(),
-                    'hasRegistry': os.path.exists(registry_file)
-                })
+        for file in list_template_files(templates_dir):
+            template_name = os.path.splitext(file)[0]
+            
+            templates.append({
+                'name': file,
+                'displayName': template_name.replace('_', ' ').title(),
+                'hasRegistry': template_name in registry_catalog
+            })
         
         return jsonify({'templates': templates})
     
@@ -62,13 +69,32 @@ def get_templates():
         return jsonify({'error': str(e)}), 500
 
 
+def _deck_response(deck: bytes, filename: str) -> Response:
+    """Attachment response streaming an in-memory deck in chunks (length is known up front)."""
+    response = Response(
+        iter_chunks(deck, DECK_STREAM_CHUNK_KB * 1024),
+        mimetype=PPTX_MIMETYPE,
+        direct_passthrough=True,
+    )
+    response.headers['Content-Length'] = str(len(deck))
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @app.route('/api/generate', methods=['POST'])
 def generate_presentation():
-    """Generate a presentation from the provided documentation."""
+    """
+    Generate a presentation from the provided documentation.
+    
+    With "stream": true (or ?stream=1) the .pptx itself is the response body;
+    otherwise a JSON body with a download URL is returned. Either way the deck
+    is rendered in memory and written to data/outputs in the background.
+    """
     try:
         data = request.json
         documentation = data.get('documentation', '').strip()
         template_name = data.get('template', 'template2.pptx')
+        stream = bool(data.get('stream')) or request.args.get('stream') == '1'
         
         if not documentation:
             return jsonify({'error': 'Documentation text is required'}), 400
@@ -76,24 +102,23 @@ def generate_presentation():
         if len(documentation) < 50:
             return jsonify({'error': 'Documentation text is too short (minimum 50 characters)'}), 400
         
-        # Load all template registries
-        combined_registry = load_all_registries()
+        # Look up the selected template's registry (cached, lazily loaded)
+        registry_store = get_registry_store()
         
-        if not combined_registry:
+        if not registry_store.catalog():
             return jsonify({
                 'error': 'No templates found in registry. Please run Pipeline 1 first to index templates.'
             }), 400
         
         # Get the registry for the selected template
         template_key = os.path.splitext(template_name)[0]
+        target_registry = registry_store.get(template_key)
         
-        if template_key not in combined_registry:
+        if target_registry is None:
             return jsonify({
                 'error': f'Registry for {template_name} not found. Please index this template first.'
             }), 400
         
-        target_registry = combined_registry[template_key]
-        
         # Generate unique filename
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_filename = f"presentation_{timestamp}.pptx"
@@ -108,19 +133,28 @@ def generate_presentation():
             slide_plans=[],
             manifest=[],
             final_file_path=output_path,
+            render_to_memory=True,
             validation_errors=[],
             thread_id=f"web_gen_{timestamp}",
             current_step="start"
         )
         
-        # Initialize and run the graph
-        app_graph = create_pipeline2_graph()
+        # Run the shared, compiled-once graph
+        app_graph = get_pipeline2_graph()
         config_obj = RunnableConfig(configurable={"thread_id": f"web_gen_{timestamp}"})
         
         print(f"--- 🚀 Starting Web Generation for: {template_name} ---")
         final_state = app_graph.invoke(initial_state, config=config_obj)
+        deck = final_state.get("final_file_bytes")
         
-        if final_state.get("final_file_path") and os.path.exists(final_state["final_file_path"]):
+        if deck and stream:
+            if PERSIST_STREAMED_DECKS:
+                get_deck_persister().submit(output_path, deck)
+            return _deck_response(deck, output_filename)
+        
+        if deck:
+            # The download URL is served from memory until the background write lands
+            get_deck_persister().submit(output_path, deck)
             return jsonify({
                 'success': True,
                 'message': 'Presentation generated successfully!',
@@ -150,6 +184,10 @@ def download_file(filename):
         filename = secure_filename(filename)
         file_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
         
+        deck = get_deck_persister().pending(file_path)
+        if deck is not None:
+            return _deck_response(deck, filename)
+        
         if not os.path.exists(file_path):
             return jsonify({'error': 'File not found'}), 404
         
@@ -157,7 +195,7 @@ def download_file(filename):
             file_path,
             as_attachment=True,
             download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.presentationml.presentation'
+            mimetype=PPTX_MIMETYPE
         )
     
     except Exception as e:
@@ -198,13 +236,29 @@ def get_history():
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
+    caches = {}
+    if LLM_CACHE_ENABLED:
+        caches['llm'] = get_llm_cache().stats()
+    if CONTENT_CACHE_ENABLED:
+        caches['content'] = get_content_cache().stats()
+    
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'caches': caches
     })
 
 
 if __name__ == '__main__':
     print("🚀 Starting PPT Generation Web Server...")
     print("📍 Access the application at: http://localhost:5000")
+    # The debug reloader runs this block twice; only the serving child should watch
+    if TEMPLATE_WATCH_ENABLED and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from index_templates import index_template
+        from src.utils.template_watcher import TemplateWatcher
+        TemplateWatcher(
+            index_template,
+            debounce_seconds=TEMPLATE_WATCH_DEBOUNCE_SECONDS,
+            poll_seconds=TEMPLATE_WATCH_POLL_SECONDS,
+        ).start()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,80 @@
+"""
+Benchmark: deck save, python-pptx prs.save vs the passthrough deck writer.
+
+Builds a media-heavy master (the default template plus --images embedded
+pictures of --image-mb each), renders 20 new slides onto a pooled copy and
+reports the best wall time and CPU time of --repeat saves on each path.
+
+Run: python bench_deck_writer.py [--images 8] [--image-mb 2] [--repeat 5] [--level 6]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+import zlib
+
+from pptx import Presentation
+from pptx.util import Inches
+from src.utils.deck_writer import save_presentation
+from src.utils.template_pool import TemplatePool
+
+
+def _png(size_mb, seed):
+    """A valid PNG padded with an incompressible-ish ancillary chunk (like photo data)."""
+    head = bytes.fromhex("89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+                         "1f15c4890000000d49444154789c6360000002000154a24f5d")
+    body = os.urandom(size_mb * 1024 * 1024 // 2) + bytes(size_mb * 1024 * 1024 // 2)
+    chunk = len(body).to_bytes(4, "big") + b"prVt" + body
+    chunk += zlib.crc32(b"prVt" + body).to_bytes(4, "big")
+    return head + chunk + bytes.fromhex("0000000049454e44ae426082") + seed.to_bytes(4, "big")
+
+
+def _best(fn, repeat):
+    wall = cpu = float("inf")
+    for _ in range(repeat):
+        w, c = time.perf_counter(), time.process_time()
+        fn()
+        wall = min(wall, time.perf_counter() - w)
+        cpu = min(cpu, time.process_time() - c)
+    return wall, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--image-mb", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--level", type=int, default=6)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, "master.pptx")
+        master = Presentation()
+        for i in range(args.images):
+            slide = master.slides.add_slide(master.slide_layouts[6])
+            slide.shapes.add_picture(io.BytesIO(_png(args.image_mb, i)), Inches(0), Inches(0))
+        master.save(template)
+
+        prs = TemplatePool.checkout(template)
+        for i in range(20):
+            prs.slides.add_slide(prs.slide_layouts[1]).shapes.title.text = f"Slide {i}"
+        archive = TemplatePool.archive(template)
+
+        output = os.path.join(tmp, "deck.pptx")
+        old_wall, old_cpu = _best(lambda: prs.save(output), args.repeat)
+        old_size = os.path.getsize(output)
+        new_wall, new_cpu = _best(lambda: save_presentation(prs, output, archive, args.level), args.repeat)
+        new_size = os.path.getsize(output)
+        stats = save_presentation(prs, output, archive, args.level)
+
+        print(f"master: {os.path.getsize(template) / 1e6:.1f} MB, {args.images} images x {args.image_mb} MB")
+        print(f"entries copied/written: {stats['copied']}/{stats['written']}")
+        print(f"{'':>12}  {'wall':>9}  {'cpu':>9}  {'size':>8}")
+        print(f"{'prs.save':>12}  {old_wall * 1000:>6.1f} ms  {old_cpu * 1000:>6.1f} ms  {old_size / 1e6:>5.1f} MB")
+        print(f"{'passthrough':>12}  {new_wall * 1000:>6.1f} ms  {new_cpu * 1000:>6.1f} ms  {new_size / 1e6:>5.1f} MB")
+        print(f"{'speedup':>12}  {old_wall / new_wall:>8.1f}x  {old_cpu / new_cpu:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
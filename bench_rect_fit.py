@@ -0,0 +1,97 @@
+"""
+Benchmark: placeholder (rectangle) text fitting over thousands of slots.
+
+Compares a scalar per-size greedy wrap (_scalar_fit, the straightforward loop the
+vectorized engine replaces) with fit_rect_font_size, cold and with repeats served
+from its (word lengths, slot) cache. Slot texts are generated with a fixed seed;
+--unique controls how many distinct (text, slot) pairs a run of --slots contains.
+
+Run: python bench_rect_fit.py [--slots 5000] [--unique 1000] [--bullets 8] [--repeat 5]
+"""
+import argparse
+import math
+import random
+import time
+
+from src.nodes.pipeline_2_generation.beautifier import CHAR_WIDTH_RATIO, LINE_HEIGHT_RATIO
+from src.utils.text_fit import fit_rect_font_size, paragraph_lengths
+
+FONT_BOUNDS = [(28, 50), (14, 24), (10, 20), (12, 21)]
+BOXES_PT = [(860.0, 90.0), (860.0, 380.0), (420.0, 380.0), (280.0, 200.0), (600.0, 60.0)]
+
+
+def _scalar_fit(paragraphs, width, height, font_range):
+    """Wrap at every size from the largest down; first size that fits wins."""
+    for font in range(font_range[1], font_range[0] - 1, -1):
+        capacity = width / (font * CHAR_WIDTH_RATIO)
+        max_lines = math.floor(height / (font * LINE_HEIGHT_RATIO))
+        lines = 0
+        for paragraph in paragraphs:
+            line = None
+            for word in paragraph.split() or [""]:
+                if line is not None and line + 1 + len(word) <= capacity:
+                    line += 1 + len(word)
+                elif len(word) > capacity:
+                    lines, line = lines + math.ceil(len(word) / capacity), None
+                else:
+                    lines, line = lines + 1, len(word)
+            if lines > max_lines:
+                break
+        if lines <= max_lines:
+            return font
+    return None
+
+
+def _vectorized(paragraphs, width, height, font_range):
+    return fit_rect_font_size(paragraph_lengths(paragraphs), width, height, font_range,
+                              CHAR_WIDTH_RATIO, LINE_HEIGHT_RATIO)
+
+
+def _slots(count, unique, bullets, seed=11):
+    rng = random.Random(seed)
+    vocabulary = ["revenue", "growth", "margin", "q3", "customer", "retention", "pipeline", "a", "of",
+                  "year-over-year", "increase", "platform", "adoption", "cost", "savings", "net", "the"]
+    pairs = []
+    for _ in range(unique):
+        paragraphs = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(3, 18)))
+                      for _ in range(rng.randint(1, bullets))]
+        width, height = rng.choice(BOXES_PT)
+        pairs.append((paragraphs, width, height, rng.choice(FONT_BOUNDS)))
+    return [pairs[i % unique] for i in range(count)]
+
+
+def _time(fn, slots, repeat):
+    """Best wall time over `repeat` runs; the fit cache is cleared before each run."""
+    best = float("inf")
+    for _ in range(repeat):
+        fit_rect_font_size.cache_clear()
+        start = time.perf_counter()
+        sizes = [fn(*slot) for slot in slots]
+        best = min(best, time.perf_counter() - start)
+    return best, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slots", type=int, default=5000, help="Placeholders to fit")
+    parser.add_argument("--unique", type=int, default=1000, help="Distinct (text, slot) pairs")
+    parser.add_argument("--bullets", type=int, default=8, help="Maximum paragraphs per slot")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    slots = _slots(args.slots, args.unique, args.bullets)
+
+    scalar_time, scalar_sizes = _time(_scalar_fit, slots, args.repeat)
+    cold_time, _ = _time(_vectorized, slots[:args.unique], args.repeat)
+    new_time, new_sizes = _time(_vectorized, slots, args.repeat)
+
+    mismatches = sum(n != o for n, o in zip(new_sizes, scalar_sizes))
+    print(f"{args.slots} slots ({args.unique} distinct, up to {args.bullets} paragraphs)")
+    print(f"  scalar wrap per size:    {scalar_time * 1000:8.1f} ms")
+    print(f"  vectorized, no repeats:  {cold_time * 1000:8.1f} ms for {args.unique} slots")
+    print(f"  vectorized, all slots:   {new_time * 1000:8.1f} ms ({scalar_time / new_time:.1f}x)")
+    print(f"  sizes differing from scalar: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: registry load time and retained memory, JSON vs binary snapshot.
+
+Uses the registries in data/registry/ (or --registry-dir); --copies replicates them
+to simulate a multi-template catalog.
+
+Run: python bench_registry_load.py [--registry-dir data/registry] [--copies 20] [--repeat 5]
+"""
+import argparse
+import gc
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from src.utils.registry_helper import load_registry, write_registry_snapshot, snapshot_path
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _measure(paths, loader, repeat):
+    """Best wall time over `repeat` runs, plus bytes still allocated while all registries are held."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        loaded = [loader(p) for p in paths]
+        best = min(best, time.perf_counter() - start)
+        del loaded
+
+    gc.collect()
+    tracemalloc.start()
+    loaded = [loader(p) for p in paths]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    return best, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registry-dir", default="data/registry")
+    parser.add_argument("--copies", type=int, default=20, help="Copies of each registry (catalog size)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sources = sorted(Path(args.registry_dir).glob("*.json"))
+    if not sources:
+        print(f"No registries found in {args.registry_dir}")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for source in sources:
+            for i in range(args.copies):
+                target = Path(tmp) / f"{source.stem}_{i}.json"
+                shutil.copyfile(source, target)
+                write_registry_snapshot(target)
+                paths.append(target)
+
+        json_bytes = sum(p.stat().st_size for p in paths)
+        snap_bytes = sum(snapshot_path(p).stat().st_size for p in paths)
+        json_time, json_mem = _measure(paths, _load_json, args.repeat)
+        snap_time, snap_mem = _measure(paths, lambda p: load_registry(p, refresh_snapshot=False), args.repeat)
+
+    print(f"Registries: {len(paths)} ({len(sources)} sources x {args.copies} copies)")
+    print(f"{'':10} {'on disk':>12} {'load (ms)':>12} {'retained':>12}")
+    print(f"{'JSON':10} {json_bytes / 1024:>10.0f}KB {json_time * 1000:>12.1f} {json_mem / 1024:>10.0f}KB")
+    print(f"{'snapshot':10} {snap_bytes / 1024:>10.0f}KB {snap_time * 1000:>12.1f} {snap_mem / 1024:>10.0f}KB")
+    print(f"Speedup: {json_time / snap_time:.1f}x, memory: {snap_mem / json_mem:.0%} of JSON")
+
+
+if __name__ == "__main__":
+    main()
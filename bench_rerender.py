@@ -0,0 +1,67 @@
+"""
+Benchmark: one-slide edit, full injector render vs incremental re-render.
+
+Renders a deck of --slides semantic slides, edits the title of the middle
+slide, and reports the best wall time of --repeat runs for re-rendering the
+whole manifest vs rerender_deck on the previous output.
+
+Run: python bench_rerender.py [--slides 20 200] [--repeat 3]
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import tempfile
+import time
+
+from pptx import Presentation
+from src.nodes.pipeline_2_generation import injector
+from src.nodes.pipeline_2_generation.rerender import rerender_deck
+from src.utils.template_pool import TemplatePool
+from bench_slide_render import _manifest
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, "master.pptx")
+        previous = os.path.join(tmp, "previous.pptx")
+        output = os.path.join(tmp, "deck.pptx")
+        Presentation().save(template)
+        TemplatePool.checkout(template)  # Parse once outside the timings
+
+        def render(manifest, path):
+            injector.surgical_injection_node({
+                "primary_master_path": template, "manifest": manifest, "final_file_path": path,
+            })
+
+        print(f"{'slides':>7}  {'full render':>12}  {'incremental':>12}  {'speedup':>8}")
+        for count in args.slides:
+            manifest = _manifest(count)
+            with contextlib.redirect_stdout(io.StringIO()):
+                render(manifest, previous)
+            edited = copy.deepcopy(manifest)
+            edited[count // 2]["content"]["0"]["runs"][0]["text"] = "Edited headline"
+
+            full = _best(lambda: render(edited, output), args.repeat)
+            incremental = _best(lambda: rerender_deck(previous, manifest, edited, output), args.repeat)
+            print(f"{count:>7}  {full * 1000:>9.1f} ms  {incremental * 1000:>9.1f} ms  {full / incremental:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: injector rendering, python-pptx object model vs the compiled slide renderer.
+
+Renders decks of 10/100/1000 semantic slides (title + five bullets, cycling through
+a few layouts of the default python-pptx template) with each path and reports the
+best wall time of --repeat runs, split into render (add slides + text) and save.
+
+Run: python bench_slide_render.py [--slides 10 100 1000] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from pptx import Presentation
+from pptx.presentation import Presentation as PresentationObject
+from src.nodes.pipeline_2_generation import injector
+from src.utils.template_pool import TemplatePool
+
+LAYOUTS = [1, 3, 4]  # Title and Content, Two Content, Comparison (all have idx 0 and 1)
+
+
+def _manifest(count):
+    slides = []
+    for i in range(count):
+        bullets = [{"runs": [{"text": f"Point {k} on slide {i} ", "bold": False, "italic": False},
+                             {"text": "key figure", "bold": True, "italic": False}]} for k in range(5)]
+        slides.append({
+            "layout_index": LAYOUTS[i % len(LAYOUTS)],
+            "content": {
+                "0": {"runs": [{"text": f"Slide {i} headline", "bold": False, "italic": False}],
+                      "font_size": None, "alignment": None, "semantic_role": "title"},
+                "1": {"bullets": bullets, "font_size": 18, "alignment": "LEFT", "semantic_role": "bullets"},
+            },
+            "slide_role": "CONTENT",
+            "background_image": {"enabled": False},
+            "_is_semantic": True,
+        })
+    return slides
+
+
+class _TimedSave:
+    """Wraps Presentation.save to split render time from save time."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._original = None
+
+    def __enter__(self):
+        self._original = original = PresentationObject.save
+
+        def save(prs, path):
+            start = time.perf_counter()
+            original(prs, path)
+            self.seconds += time.perf_counter() - start
+
+        PresentationObject.save = save
+        return self
+
+    def __exit__(self, *exc):
+        PresentationObject.save = self._original
+
+
+def _time(template, output, manifest, compiled, repeat):
+    injector.COMPILED_SLIDE_RENDERER = compiled
+    best = (float("inf"), 0.0)
+    for _ in range(repeat):
+        with _TimedSave() as saved, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            injector.surgical_injection_node({
+                "primary_master_path": template, "manifest": manifest, "final_file_path": output,
+            })
+            total = time.perf_counter() - start
+        if total < sum(best):
+            best = (total - saved.seconds, saved.seconds)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, "master.pptx")
+        output = os.path.join(tmp, "deck.pptx")
+        Presentation().save(template)
+        TemplatePool.checkout(template)  # Parse once outside the timings
+
+        print(f"{'slides':>7}  {'python-pptx render/save':>24}  {'compiled render/save':>21}  {'render speedup':>14}")
+        for count in args.slides:
+            manifest = _manifest(count)
+            old_render, old_save = _time(template, output, manifest, False, args.repeat)
+            new_render, new_save = _time(template, output, manifest, True, args.repeat)
+            print(f"{count:>7}  {old_render * 1000:>12.1f} / {old_save * 1000:>7.1f} ms"
+                  f"  {new_render * 1000:>9.1f} / {new_save * 1000:>7.1f} ms"
+                  f"  {old_render / new_render:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
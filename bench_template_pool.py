@@ -0,0 +1,72 @@
+"""
+Benchmark: cloning a pooled master, deep copy vs re-parsing the pooled bytes.
+
+TemplatePool.checkout hands every render an independent Presentation. This compares
+the two ways of producing one: copy.deepcopy of the pristine parse (what the pool
+does) and Presentation(BytesIO(blob)) on the master's bytes. Each is timed
+sequentially and with --threads concurrent callers, as under /api/generate.
+
+Uses python-pptx's default template unless --template points at a real master.
+
+Run: python bench_template_pool.py [--template master.pptx] [--clones 50] [--threads 8] [--repeat 3]
+"""
+import argparse
+import copy
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pptx import Presentation
+
+
+def _measure(clone, clones, threads, repeat):
+    """Best wall time over `repeat` runs of `clones` clones spread over `threads` workers."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if threads == 1:
+            for _ in range(clones):
+                clone()
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(lambda _: clone(), range(clones)))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--template", help="Master .pptx (default: python-pptx's built-in template)")
+    parser.add_argument("--clones", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.template:
+        with open(args.template, "rb") as f:
+            blob = f.read()
+    else:
+        buffer = io.BytesIO()
+        Presentation().save(buffer)
+        blob = buffer.getvalue()
+    pristine = Presentation(io.BytesIO(blob))
+    layouts = sum(len(master.slide_layouts) for master in pristine.slide_masters)
+
+    strategies = {
+        "deepcopy": lambda: copy.deepcopy(pristine),
+        "re-parse": lambda: Presentation(io.BytesIO(blob)),
+    }
+
+    print(f"Master: {args.template or 'python-pptx default'} ({len(blob) / 1024:.0f}KB, {layouts} layouts)")
+    print(f"{'':10} {'sequential (ms/clone)':>22} {f'{args.threads} threads (ms/clone)':>22}")
+    results = {}
+    for name, clone in strategies.items():
+        seq = _measure(clone, args.clones, 1, args.repeat) / args.clones
+        par = _measure(clone, args.clones, args.threads, args.repeat) / args.clones
+        results[name] = seq
+        print(f"{name:10} {seq * 1000:>22.2f} {par * 1000:>22.2f}")
+    print(f"deepcopy vs re-parse (sequential): {results['re-parse'] / results['deepcopy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
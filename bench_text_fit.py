@@ -0,0 +1,111 @@
+"""
+Benchmark: circle text fitting, previous binary search vs the vectorized engine.
+
+The previous implementation is reproduced below (_binary_search_fit) as the
+baseline. Callout texts are generated with a fixed seed; --unique controls how
+many distinct texts a deck of --callouts shapes contains (repeats hit the cache).
+
+Run: python bench_text_fit.py [--callouts 2000] [--unique 200] [--words 40] [--repeat 5]
+"""
+import argparse
+import math
+import random
+import time
+
+from src.nodes.pipeline_2_generation.beautifier import (
+    CHAR_WIDTH_RATIO,
+    FONT_SIZE_RANGE,
+    LINE_HEIGHT_RATIO,
+    TEXT_PADDING_RATIO,
+    _fit_text_in_circle,
+)
+from src.utils.text_fit import fit_ellipse_font_size
+
+
+def _chord(y, radius):
+    dy = abs(y)
+    return 0.0 if dy >= radius else 2.0 * math.sqrt(radius * radius - dy * dy)
+
+
+def _binary_search_fit(text, radius, padding_ratio=TEXT_PADDING_RATIO):
+    """The fitter before the vectorized engine (binary search, re-wraps on every probe)."""
+    effective_radius = radius * (1.0 - padding_ratio)
+    min_font, max_font = FONT_SIZE_RANGE
+    best_fit = min_font
+    while max_font - min_font > 0.5:
+        mid_font = (min_font + max_font) / 2.0
+        line_height = (mid_font * LINE_HEIGHT_RATIO) / 720.0
+        current_line = []
+        current_y = -effective_radius
+        fits = True
+        for word in text.split():
+            available_width = _chord(current_y + line_height / 2, effective_radius)
+            if current_line and sum(len(w) + 1 for w in current_line) * (mid_font * CHAR_WIDTH_RATIO) / 960.0 > available_width:
+                current_line = [word]
+                current_y += line_height
+                if current_y + line_height > effective_radius:
+                    fits = False
+                    break
+            else:
+                current_line.append(word)
+        if current_line and fits:
+            current_y += line_height
+            if current_y > effective_radius:
+                fits = False
+        if fits:
+            best_fit = mid_font
+            min_font = mid_font
+        else:
+            max_font = mid_font
+    return int(best_fit)
+
+
+def _callouts(count, unique, words, seed=7):
+    rng = random.Random(seed)
+    vocabulary = ["revenue", "growth", "margin", "q3", "customer", "retention", "pipeline", "a", "of",
+                  "year-over-year", "increase", "platform", "adoption", "cost", "savings", "net"]
+    texts = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, words))) for _ in range(unique)]
+    radii = [rng.choice([0.08, 0.12, 0.15, 0.2, 0.3]) for _ in range(unique)]
+    return [(texts[i % unique], radii[i % unique]) for i in range(count)]
+
+
+def _time(fn, callouts, repeat):
+    """Best wall time over `repeat` runs; the fit cache is cleared before each run."""
+    best = float("inf")
+    for _ in range(repeat):
+        fit_ellipse_font_size.cache_clear()
+        start = time.perf_counter()
+        sizes = [fn(text, radius) for text, radius in callouts]
+        best = min(best, time.perf_counter() - start)
+    return best, sizes
+
+
+def _vectorized(text, radius):
+    return _fit_text_in_circle(text, [], radius)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callouts", type=int, default=2000, help="Circle shapes in the deck")
+    parser.add_argument("--unique", type=int, default=200, help="Distinct callout texts")
+    parser.add_argument("--words", type=int, default=40, help="Maximum words per callout")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    callouts = _callouts(args.callouts, args.unique, args.words)
+
+    old_time, old_sizes = _time(_binary_search_fit, callouts, args.repeat)
+    cold_time, _ = _time(_vectorized, callouts[:args.unique], args.repeat)
+    new_time, new_sizes = _time(_vectorized, callouts, args.repeat)
+
+    larger = sum(n > o for n, o in zip(new_sizes, old_sizes))
+    smaller = sum(n < o for n, o in zip(new_sizes, old_sizes))
+    print(f"{args.callouts} callouts ({args.unique} distinct, up to {args.words} words)")
+    print(f"  binary search:           {old_time * 1000:8.1f} ms")
+    print(f"  vectorized, no repeats:  {cold_time * 1000:8.1f} ms for {args.unique} texts")
+    print(f"  vectorized, full deck:   {new_time * 1000:8.1f} ms ({old_time / new_time:.1f}x)")
+    print(f"  sizes: {larger} larger (binary search truncates 0.5pt probes), {smaller} smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,209 @@
+import argparse
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-import json
 from dotenv import load_dotenv
 from src.core.graph import create_pipeline1_graph
+from src.nodes.pipeline_1_indexing.parser import hash_template_file
+from src.nodes.pipeline_1_indexing.layout_validator import INDEXER_VERSION
+from src.utils.registry_helper import write_registry, load_registry
+from src.utils.template_watcher import TemplateWatcher
+from src.config import TEMPLATE_WATCH_DEBOUNCE_SECONDS, TEMPLATE_WATCH_POLL_SECONDS
 
-def start_indexing():
-    # Load environment variables from .env file
+# Compiled Pipeline 1 graph, built once per (worker) process
+_graph = None
+
+
+def _get_graph():
+    global _graph
+    if _graph is None:
+        _graph = create_pipeline1_graph()
+    return _graph
+
+
+def _init_worker():
+    # Spawned workers do not inherit the parent's loaded .env
     load_dotenv()
-    # 1. Setup paths
-    # Using absolute path for safety, but relative works if run from root
-    root_dir = Path.cwd()
-    templates_dir = root_dir / "data" / "templates"
-    registry_dir = root_dir / "data" / "registry"
-    registry_dir.mkdir(parents=True, exist_ok=True)
 
-    # 2. Find templates
-    template_files = list(templates_dir.glob("*.pptx"))
-    if not template_files:
-        print(f"❌ No .pptx files found in {templates_dir}")
-        return
 
-    # 3. Initialize the Graph
-    app = create_pipeline1_graph()
-    
-    print(f"--- 🚀 Starting Pipeline 1 for {len(template_files)} files ---")
+def _load_previous_registry(registry_path: Path):
+    """Existing registry for incremental re-indexing, or None if absent/unreadable."""
+    if not registry_path.exists():
+        return None
+    try:
+        return load_registry(registry_path)
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable registry {registry_path.name}: {e}")
+        return None
+
+
+def index_template(template_path: str, registry_dir: str, full: bool = False) -> dict:
+    """
+    Run Pipeline 1 for one template and atomically write its registry.
+
+    Incremental by default: a template whose file hash and INDEXER_VERSION match
+    its registry is skipped, and otherwise only layouts whose XML fingerprint changed are re-parsed.
+    Never raises: failures are reported in the result so one broken template
+    cannot abort the rest of the batch.
+
+    Args:
+        full: Ignore the existing registry and rebuild every layout
+
+    Returns:
+        {"template", "ok", "skipped", "registry", "error", "seconds"}
+    """
+    template = Path(template_path)
+    started = time.perf_counter()
+    registry_path = Path(registry_dir) / f"{template.stem}.json"
+    result = {"template": template.name, "ok": False, "skipped": False, "registry": None,
+              "error": None, "seconds": 0.0}
+
+    try:
+        previous = None if full else _load_previous_registry(registry_path)
+        if (
+            previous
+            and previous.get("indexer_version") == INDEXER_VERSION
+            and previous.get("template_hash") == hash_template_file(str(template))
+        ):
+            result.update(ok=True, skipped=True, registry=str(registry_path),
+                          seconds=time.perf_counter() - started)
+            return result
 
-    for template in template_files:
-        print(f"\n📄 Processing: {template.name}...")
-        
         # We pass the path as the initial state
         initial_state = {
             "template_path": str(template),
+            "previous_registry": previous,
             "raw_shape_data": [],
             "json_description": None,
             "is_valid": False
         }
-        
-        # Run the graph
         config = {"configurable": {"thread_id": f"index_{template.stem}"}}
-        try:
-            result = app.invoke(initial_state, config=config)
-            
-            # 4. Save the Registry
-            if result.get("json_description"):
-                output_path = registry_dir / f"{template.stem}.json"
-                with open(output_path, "w", encoding='utf-8') as f:
-                    # result['json_description'] might already be a dict or a JSON string
-                    # based on your LLM node implementation
-                    data = result["json_description"]
-                    if isinstance(data, str):
-                        f.write(data)
-                    else:
-                        json.dump(data, f, indent=4)
-                
-                print(f"✅ Created Registry: {output_path}")
-            else:
-                print(f"⚠️ Failed to generate metadata for {template.name} (no json_description returned)")
-        except Exception as e:
-            print(f"❌ Error processing {template.name}: {e}")
+
+        state = _get_graph().invoke(initial_state, config=config)
+
+        # result['json_description'] might already be a dict or a JSON string
+        # based on your LLM node implementation
+        data = state.get("json_description")
+        if data:
+            output_path = write_registry(registry_path, data)
+            result.update(ok=True, registry=str(output_path))
+        else:
+            result["error"] = "no json_description returned"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def _report(done: int, total: int, result: dict):
+    if result.get("skipped"):
+        print(f"[{done}/{total}] ⏭️  {result['template']} unchanged")
+    elif result["ok"]:
+        print(f"[{done}/{total}] ✅ {result['template']} → {result['registry']} ({result['seconds']:.1f}s)")
+    else:
+        print(f"[{done}/{total}] ❌ {result['template']}: {result['error']}")
+
+
+def start_indexing(workers: int = 1, templates_dir=None, registry_dir=None, full: bool = False) -> list:
+    """
+    Index every .pptx in data/templates into data/registry.
+
+    Args:
+        workers: Number of worker processes (1 = sequential in this process)
+        full: Rebuild every registry from scratch instead of incrementally
+
+    Returns:
+        One result dict per template (see index_template), in completion order
+    """
+    # Load environment variables from .env file
+    load_dotenv()
+    # 1. Setup paths
+    # Using absolute path for safety, but relative works if run from root
+    root_dir = Path.cwd()
+    templates_dir = Path(templates_dir) if templates_dir else root_dir / "data" / "templates"
+    registry_dir = Path(registry_dir) if registry_dir else root_dir / "data" / "registry"
+    registry_dir.mkdir(parents=True, exist_ok=True)
+
+    # 2. Find templates
+    template_files = sorted(templates_dir.glob("*.pptx"))
+    if not template_files:
+        print(f"❌ No .pptx files found in {templates_dir}")
+        return []
+
+    total = len(template_files)
+    workers = max(1, min(workers, total))
+    print(f"--- 🚀 Starting Pipeline 1 for {total} files ({workers} worker{'s' if workers > 1 else ''}) ---")
+    started = time.perf_counter()
+    results = []
+
+    if workers == 1:
+        for template in template_files:
+            results.append(index_template(str(template), str(registry_dir), full))
+            _report(len(results), total, results[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {
+                pool.submit(index_template, str(template), str(registry_dir), full): template
+                for template in template_files
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker process died (e.g. killed/OOM); the template's old registry is untouched
+                    result = {"template": futures[future].name, "ok": False, "skipped": False, "registry": None,
+                              "error": f"worker crashed: {type(e).__name__}: {e}", "seconds": 0.0}
+                results.append(result)
+                _report(len(results), total, result)
+
+    failed = [r for r in results if not r["ok"]]
+    skipped = sum(1 for r in results if r.get("skipped"))
+    print(f"\n--- Indexed {total - len(failed)}/{total} templates ({skipped} unchanged) "
+          f"in {time.perf_counter() - started:.1f}s ---")
+    for r in failed:
+        print(f"  ❌ {r['template']}: {r['error']}")
+    return results
+
+
+def watch(templates_dir=None, registry_dir=None) -> TemplateWatcher:
+    """
+    Start watch mode: re-index templates as they are added or changed (returns the running watcher).
+
+    Existing templates are checked once at start-up; unchanged ones are skipped by hash.
+    """
+    load_dotenv()
+    root_dir = Path.cwd()
+    templates_dir = Path(templates_dir) if templates_dir else root_dir / "data" / "templates"
+    registry_dir = Path(registry_dir) if registry_dir else root_dir / "data" / "registry"
+    registry_dir.mkdir(parents=True, exist_ok=True)
+
+    watcher = TemplateWatcher(
+        index_template,
+        templates_dir=str(templates_dir),
+        registry_dir=str(registry_dir),
+        debounce_seconds=TEMPLATE_WATCH_DEBOUNCE_SECONDS,
+        poll_seconds=TEMPLATE_WATCH_POLL_SECONDS,
+    )
+    return watcher.start()
+
 
 if __name__ == "__main__":
-    start_indexing()
+    parser = argparse.ArgumentParser(description="Index PowerPoint templates into registries (Pipeline 1)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (default 1 = sequential, 0 = one per CPU core)")
+    parser.add_argument("--full", action="store_true",
+                        help="Rebuild every registry instead of re-parsing only changed layouts")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-index templates whenever they change")
+    args = parser.parse_args()
+    if args.watch:
+        watcher = watch()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            watcher.stop()
+    else:
+        start_indexing(workers=args.workers or os.cpu_count() or 1, full=args.full)
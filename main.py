@@ -4,7 +4,7 @@ from dotenv import load_dotenv
 # Force reload of .env file
 load_dotenv(override=True)
 from src.core.graph import create_pipeline1_graph
-import json
+from src.utils.registry_helper import write_registry
 
 def run_pipeline_1(template_filename: str):
     # 1. Setup the initial state
@@ -31,16 +31,22 @@ def run_pipeline_1(template_filename: str):
     # 4. Save the Result to the Registry
     if final_state.get("json_description"):
         registry_path = f"data/registry/{template_filename.replace('.pptx', '.json')}"
-        with open(registry_path, "w") as f:
-            json.dump(final_state["json_description"], f, indent=4)
+        # Temp file + rename: a crash never leaves a half-written registry
+        write_registry(registry_path, final_state["json_description"])
         
         print(f"--- ✅ Success! Metadata saved to: {registry_path} ---")
     else:
         print("--- ❌ Pipeline failed to generate metadata. ---")
 
 if __name__ == "__main__":
+    import argparse
     import pathlib
     
+    parser = argparse.ArgumentParser(description="Run Pipeline 1 for every template in data/templates")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (default 1 = sequential, 0 = one per CPU core)")
+    args = parser.parse_args()
+    
     # Define templates directory
     templates_dir = pathlib.Path("data/templates")
     
@@ -56,5 +62,10 @@ if __name__ == "__main__":
         print(f"No .pptx files found in '{templates_dir}'.")
     else:
         print(f"--- Found {len(pptx_files)} templates to process ---")
-        for pptx_file in pptx_files:
-            run_pipeline_1(pptx_file.name)
+        if args.workers != 1:
+            # Process pool with progress reporting and per-template failure isolation
+            from index_templates import start_indexing
+            start_indexing(workers=args.workers or os.cpu_count() or 1)
+        else:
+            for pptx_file in pptx_files:
+                run_pipeline_1(pptx_file.name)
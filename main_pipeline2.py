@@ -26,18 +26,18 @@ for mod_name in [
     else:
         print(f"  [OK] Fresh load: {mod_name}")
 
-from src.core.graph_pipeline2 import create_pipeline2_graph
-from src.utils.registry_helper import load_all_registries
+from src.core.graph_pipeline2 import get_pipeline2_graph
+from src.utils.registry_helper import get_registry_store
 from src.core.state import PPTState
  
 def run_pipeline_2(raw_documentation: str, primary_master: str = "template2.pptx"):
     """
     Execute Pipeline 2 to generate a complete EY presentation.
     """
-    # Load all template registries (Unified Registry)
-    combined_registry = load_all_registries()
+    # Template registries (Unified Registry), loaded lazily per key
+    registry_store = get_registry_store()
     
-    if not combined_registry:
+    if not registry_store.catalog():
         print("Error: No EY templates found in registry. Run Pipeline 1 first!")
         return
         
@@ -45,11 +45,10 @@ def run_pipeline_2(raw_documentation: str, primary_master: str = "template2.pptx
     primary_registry_key = os.path.splitext(primary_master_name)[0]
     
     # We strictly use the registry for the PRIMARY MASTER
-    if primary_registry_key not in combined_registry:
+    target_registry = registry_store.get(primary_registry_key)
+    if target_registry is None:
         print(f"Error: Registry for {primary_master_name} not found in data/registry/")
         return
-        
-    target_registry = combined_registry[primary_registry_key]
     
     # Setup initial state
     initial_state = PPTState(
@@ -65,8 +64,8 @@ def run_pipeline_2(raw_documentation: str, primary_master: str = "template2.pptx
         current_step="start"
     )
     
-    # Initialize and run the graph
-    app = create_pipeline2_graph()
+    # Get the compiled graph and run it
+    app = get_pipeline2_graph()
     
     print(f"--- 🚀 Starting Pipeline 2 for EY: {primary_master_name} ---")
     config = {"configurable": {"thread_id": "ey_gen_001"}}
@@ -19,9 +19,73 @@ ENABLE_AUTOFIT_ROLES = set(
     os.getenv("ENABLE_AUTOFIT_ROLES", "caption,circular_text").split(",")
 ) if os.getenv("ENABLE_AUTOFIT_ROLES", "caption,circular_text").strip() else set()
 
+# Fit semantic text to its placeholder (registry font bounds + slot geometry) and write
+# the resulting normAutofit fontScale into the deck (see src/utils/text_fit.py)
+TEXT_FIT_ENABLED = os.getenv("TEXT_FIT_ENABLED", "true").lower() == "true"
+
+# Split bullet lists that overflow a split_slide slot into "(cont.)" slides (see paginator.py)
+SPLIT_SLIDE_ENABLED = os.getenv("SPLIT_SLIDE_ENABLED", "true").lower() == "true"
+
+# Injector: stamp slides from compiled per-layout XML skeletons and write runs directly
+# (see src/utils/slide_compiler.py); output is identical to the python-pptx path
+COMPILED_SLIDE_RENDERER = os.getenv("COMPILED_SLIDE_RENDERER", "false").lower() == "true"
+
+# Deck save: copy unchanged master zip entries as-is, compress only new/modified parts at this zlib level
+PASSTHROUGH_DECK_WRITER = os.getenv("PASSTHROUGH_DECK_WRITER", "true").lower() == "true"
+DECK_COMPRESSLEVEL = min(9, max(0, int(os.getenv("DECK_COMPRESSLEVEL", "6"))))
+
+# Opt-in: drop layouts, masters and custom XML the rendered deck does not use (see src/utils/deck_slimmer.py)
+SLIM_OUTPUT_DECKS = os.getenv("SLIM_OUTPUT_DECKS", "false").lower() == "true"
+
+# /api/generate stream mode: decks are rendered in memory and streamed in chunks of this size;
+# PERSIST_STREAMED_DECKS also writes them to data/outputs in the background (see src/utils/deck_output.py)
+DECK_STREAM_CHUNK_KB = max(1, int(os.getenv("DECK_STREAM_CHUNK_KB", "64")))
+PERSIST_STREAMED_DECKS = os.getenv("PERSIST_STREAMED_DECKS", "true").lower() == "true"
+
+# Writer fan-out: maximum number of concurrent per-slide LLM calls (1 = sequential)
+WRITER_MAX_CONCURRENCY = max(1, int(os.getenv("WRITER_MAX_CONCURRENCY", "4")))
+
+# Pipeline 1: parse layout/master XML directly with lxml (python-pptx object model when false)
+FAST_TEMPLATE_PARSER = os.getenv("FAST_TEMPLATE_PARSER", "true").lower() == "true"
+
+# Extractor map-reduce: documents above EXTRACTOR_SINGLE_PASS_TOKENS are chunked to
+# EXTRACTOR_CHUNK_TOKENS, summarized in parallel, then reduced into the content map
+EXTRACTOR_SINGLE_PASS_TOKENS = int(os.getenv("EXTRACTOR_SINGLE_PASS_TOKENS", "12000"))
+EXTRACTOR_CHUNK_TOKENS = int(os.getenv("EXTRACTOR_CHUNK_TOKENS", "4000"))
+EXTRACTOR_MAX_CONCURRENCY = max(1, int(os.getenv("EXTRACTOR_MAX_CONCURRENCY", "4")))
+
+# Persistent LLM response cache (see src/utils/llm_cache.py)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/cache/llm_cache.sqlite")
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))  # 0 = never expire
+
+# Content-addressed extractor cache: extracted text and content map keyed by input SHA-256
+CONTENT_CACHE_ENABLED = os.getenv("CONTENT_CACHE_ENABLED", "true").lower() == "true"
+CONTENT_CACHE_PATH = os.getenv("CONTENT_CACHE_PATH", "data/cache/content_cache.sqlite")
+CONTENT_CACHE_MAX_MB = int(os.getenv("CONTENT_CACHE_MAX_MB", "128"))
+# Streamed files with more extracted text than this are not text-cached (their content map still is)
+CONTENT_CACHE_MAX_TEXT_MB = float(os.getenv("CONTENT_CACHE_MAX_TEXT_MB", "4"))
+
+# Watch mode: re-index changed templates in the background (see src/utils/template_watcher.py)
+TEMPLATE_WATCH_ENABLED = os.getenv("TEMPLATE_WATCH_ENABLED", "false").lower() == "true"
+TEMPLATE_WATCH_DEBOUNCE_SECONDS = float(os.getenv("TEMPLATE_WATCH_DEBOUNCE_SECONDS", "2.0"))
+TEMPLATE_WATCH_POLL_SECONDS = float(os.getenv("TEMPLATE_WATCH_POLL_SECONDS", "2.0"))  # Polling fallback only
+
 # Debug: Log configuration on import
 if os.getenv("DEBUG_CONFIG", "false").lower() == "true":
     print(f"📋 Config loaded:")
     print(f"  RESPECT_MASTER_DEFAULTS: {RESPECT_MASTER_DEFAULTS}")
     print(f"  FORCE_FONT_SIZE_LAYOUTS: {FORCE_FONT_SIZE_LAYOUTS}")
     print(f"  ENABLE_AUTOFIT_ROLES: {ENABLE_AUTOFIT_ROLES}")
+    print(f"  TEXT_FIT_ENABLED: {TEXT_FIT_ENABLED}")
+    print(f"  SPLIT_SLIDE_ENABLED: {SPLIT_SLIDE_ENABLED}")
+    print(f"  COMPILED_SLIDE_RENDERER: {COMPILED_SLIDE_RENDERER}")
+    print(f"  PASSTHROUGH_DECK_WRITER: {PASSTHROUGH_DECK_WRITER} (level {DECK_COMPRESSLEVEL})")
+    print(f"  SLIM_OUTPUT_DECKS: {SLIM_OUTPUT_DECKS}")
+    print(f"  PERSIST_STREAMED_DECKS: {PERSIST_STREAMED_DECKS} (chunks of {DECK_STREAM_CHUNK_KB} KB)")
+    print(f"  FAST_TEMPLATE_PARSER: {FAST_TEMPLATE_PARSER}")
+    print(f"  WRITER_MAX_CONCURRENCY: {WRITER_MAX_CONCURRENCY}")
+    print(f"  LLM_CACHE_ENABLED: {LLM_CACHE_ENABLED} ({LLM_CACHE_PATH})")
+    print(f"  CONTENT_CACHE_ENABLED: {CONTENT_CACHE_ENABLED} ({CONTENT_CACHE_PATH})")
+    print(f"  TEMPLATE_WATCH_ENABLED: {TEMPLATE_WATCH_ENABLED}")
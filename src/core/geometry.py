@@ -0,0 +1,261 @@
+"""
+Columnar slot geometry: one NumPy array per field for every slot of a template.
+
+Pipeline 1 normalizes placeholder geometry and derives role hints, layout purpose
+and density for a whole template in a few array operations instead of per-shape
+Python branches. The same store can be built from a registry (slot "geometry"
+dicts) for Pipeline 2 consumers; see RegistryIndex.geometry().
+
+Rows are grouped by layout: rows offsets[i]:offsets[i + 1] belong to layout position i.
+"""
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EMU_PER_INCH = 914400
+
+# shape_type codes (GeometryMetadata.shape_type)
+SHAPE_TYPES = ("rectangle", "oval", "other")
+_SHAPE_CODES = {name: code for code, name in enumerate(SHAPE_TYPES)}
+SHAPE_OVAL = _SHAPE_CODES["oval"]
+
+# Role hint rules (see registry_builder.derive_role_hint)
+TITLE_MAX_TOP = 0.2
+TITLE_MAX_HEIGHT = 0.2
+FOOTER_MIN_TOP = 0.8
+BODY_MIN_AREA = 0.3
+LARGE_TITLE_MIN_AREA = 0.05
+ELLIPSE_TOLERANCE = 0.01  # |norm_width - norm_height| above this is an ellipse, not a circle
+
+_ROLE_HINTS = np.array(["title", "footer", "body", "content"], dtype=object)
+_PURPOSES = np.array(
+    ["TITLE_SLIDE", "VISUAL_SLIDE", "COMPARISON_SLIDE", "CONTENT_SLIDE", "GENERAL_CONTENT"], dtype=object
+)
+_DENSITIES = np.array(["low", "medium", "high"], dtype=object)
+
+
+def _shape_code(shape_type: Optional[str]) -> int:
+    return _SHAPE_CODES.get(shape_type or "rectangle", _SHAPE_CODES["other"])
+
+
+def _offsets(counts: Sequence[int]) -> np.ndarray:
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _candidate_count(lo: List[float], hi: List[float], members: List[int]) -> int:
+    """Roughly the pairs a sweep along this axis would test (boxes starting inside another's extent)."""
+    starts = sorted(lo[i] for i in members)
+    return sum(bisect_left(starts, hi[i]) - bisect_left(starts, lo[i]) for i in members)
+
+
+def _sweep(lo_a, hi_a, lo_b, hi_b, members: List[int], pairs: List[Tuple[int, int]]):
+    """Sort by start on axis a; each box is tested only against boxes starting inside its extent."""
+    order = sorted(members, key=lo_a.__getitem__)
+    starts = [lo_a[i] for i in order]
+    for pos, i in enumerate(order):
+        end = bisect_left(starts, hi_a[i], pos + 1)
+        for j in order[pos + 1:end]:
+            if lo_a[i] < hi_a[j] and lo_b[i] < hi_b[j] and lo_b[j] < hi_b[i]:
+                pairs.append((i, j) if i < j else (j, i))
+
+
+def find_overlaps(left, top, width, height, padding: float = 0,
+                  groups: Optional[Sequence[int]] = None) -> List[Tuple[int, int]]:
+    """
+    All pairs of boxes that overlap or are closer than padding, via a sweep line.
+
+    Boxes collide unless one ends padding or more before the other starts, on
+    either axis (edges exactly padding apart are fine).
+    Each group (e.g. the layout position of every row) is checked separately.
+    The sweep runs along whichever axis has fewer candidate pairs, so columns and
+    rows of boxes both stay O(n log n + overlaps).
+
+    Returns:
+        Sorted (i, j) row pairs with i < j
+    """
+    x1 = np.asarray(left).tolist()
+    y1 = np.asarray(top).tolist()
+    x2 = (np.asarray(left) + np.asarray(width) + padding).tolist()
+    y2 = (np.asarray(top) + np.asarray(height) + padding).tolist()
+
+    members_by_group: Dict[Any, List[int]] = {}
+    for i, group in enumerate(np.asarray(groups).tolist() if groups is not None else [0] * len(x1)):
+        members_by_group.setdefault(group, []).append(i)
+
+    pairs: List[Tuple[int, int]] = []
+    for members in members_by_group.values():
+        if len(members) < 2:
+            continue
+        if _candidate_count(x1, x2, members) <= _candidate_count(y1, y2, members):
+            _sweep(x1, x2, y1, y2, members, pairs)
+        else:
+            _sweep(y1, y2, x1, x2, members, pairs)
+    return sorted(pairs)
+
+
+class SlotGeometry:
+    """
+    Normalized geometry columns for all slots of a template.
+
+    Attributes (length = number of slots unless noted):
+        layout: Layout position of each row (0..n_layouts-1)
+        norm_left, norm_top, norm_width, norm_height, area_ratio: float64 (0.0-1.0)
+        shape_code: int8 index into SHAPE_TYPES
+        area_score: float64 EMU area in square inches (from_emu only, else None)
+        offsets: n_layouts + 1 row offsets per layout position
+    """
+
+    def __init__(self, counts: Sequence[int], norm_left, norm_top, norm_width, norm_height,
+                 area_ratio, shape_code, area_score=None):
+        self.offsets = _offsets(counts)
+        self.n_layouts = len(counts)
+        self.layout = np.repeat(np.arange(self.n_layouts), counts)
+        self.norm_left = np.asarray(norm_left, dtype=np.float64)
+        self.norm_top = np.asarray(norm_top, dtype=np.float64)
+        self.norm_width = np.asarray(norm_width, dtype=np.float64)
+        self.norm_height = np.asarray(norm_height, dtype=np.float64)
+        self.area_ratio = np.asarray(area_ratio, dtype=np.float64)
+        self.shape_code = np.asarray(shape_code, dtype=np.int8)
+        self.area_score = None if area_score is None else np.asarray(area_score, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.layout)
+
+    # --- Construction ---
+
+    @classmethod
+    def from_emu(cls, layouts: List[Dict[str, Any]], slide_width: int, slide_height: int) -> "SlotGeometry":
+        """
+        Normalize raw parser output ([{"shapes": [{left, top, width, height, shape_type}]}]).
+
+        Missing/None dimensions count as 0, as in the per-shape parser code. Results are
+        bit-identical to the scalar formulas (EMU products stay below 2**53).
+        """
+        counts = [len(layout["shapes"]) for layout in layouts]
+        shapes = [shape for layout in layouts for shape in layout["shapes"]]
+        emu = np.array(
+            [[s.get("left") or 0, s.get("top") or 0, s.get("width") or 0, s.get("height") or 0] for s in shapes],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        left, top, width, height = emu.T
+
+        def normalize(values, extent):
+            return values / extent if extent > 0 else np.zeros_like(values)
+
+        total_area = slide_width * slide_height
+        return cls(
+            counts,
+            norm_left=normalize(left, slide_width),
+            norm_top=normalize(top, slide_height),
+            norm_width=normalize(width, slide_width),
+            norm_height=normalize(height, slide_height),
+            area_ratio=normalize(width * height, total_area),
+            shape_code=[_shape_code(s.get("shape_type", "rectangle")) for s in shapes],
+            area_score=(width * height) / (EMU_PER_INCH ** 2),
+        )
+
+    @classmethod
+    def from_layouts(cls, layouts: List[Dict[str, Any]], key: str = "slots") -> "SlotGeometry":
+        """
+        Columns from already normalized rows.
+
+        key="shapes" reads enriched parser shapes (norm_* fields on the shape);
+        key="slots" reads registry layouts (norm_* fields under slot["geometry"]).
+        """
+        counts = []
+        rows = []
+        codes = []
+        for layout in layouts:
+            items = layout.get(key) or []
+            counts.append(len(items))
+            for item in items:
+                geometry = item if key == "shapes" else (item.get("geometry") or {})
+                rows.append((
+                    geometry.get("norm_left", 0), geometry.get("norm_top", 0),
+                    geometry.get("norm_width", 0), geometry.get("norm_height", 0),
+                    geometry.get("area_ratio", 0),
+                ))
+                codes.append(_shape_code(geometry.get("shape_type", "rectangle")))
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 5).T
+        return cls(counts, *columns, shape_code=codes)
+
+    @classmethod
+    def from_registry(cls, registry: Dict[str, Any]) -> "SlotGeometry":
+        """Columns for a registry dict (rows follow layouts[...]["slots"] order)."""
+        return cls.from_layouts(registry.get("layouts", []) or [], key="slots")
+
+    # --- Row access ---
+
+    def rows(self, layout_pos: int) -> slice:
+        """Row slice for a layout position."""
+        return slice(int(self.offsets[layout_pos]), int(self.offsets[layout_pos + 1]))
+
+    def layout_counts(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows per layout position (only rows where mask is True, if given)."""
+        weights = None if mask is None else np.asarray(mask, dtype=np.float64)
+        return np.bincount(self.layout, weights=weights, minlength=self.n_layouts).astype(np.int64)
+
+    def overlaps(self, padding: float = 0) -> List[Tuple[int, int]]:
+        """Row pairs of the same layout whose boxes overlap or are within padding (normalized units)."""
+        return find_overlaps(self.norm_left, self.norm_top, self.norm_width, self.norm_height,
+                             padding=padding, groups=self.layout)
+
+    # --- Derived columns ---
+
+    @property
+    def is_circular(self) -> np.ndarray:
+        return self.shape_code == SHAPE_OVAL
+
+    def radius(self) -> np.ndarray:
+        """Normalized radius (min axis / 2) for ovals, NaN elsewhere."""
+        return np.where(self.is_circular, np.minimum(self.norm_width, self.norm_height) / 2, np.nan)
+
+    def is_ellipse(self) -> np.ndarray:
+        """Ovals whose axes differ by more than ELLIPSE_TOLERANCE."""
+        return self.is_circular & (np.abs(self.norm_width - self.norm_height) > ELLIPSE_TOLERANCE)
+
+    def role_hints(self) -> np.ndarray:
+        """Vectorized derive_role_hint: object array of title/footer/body/content."""
+        choice = np.select(
+            [
+                (self.norm_top < TITLE_MAX_TOP) & (self.norm_height < TITLE_MAX_HEIGHT),
+                self.norm_top > FOOTER_MIN_TOP,
+                self.area_ratio > BODY_MIN_AREA,
+            ],
+            [0, 1, 2],
+            default=3,
+        )
+        return _ROLE_HINTS[choice]
+
+    def classify_layouts(self, role_hints: Optional[np.ndarray] = None,
+                         is_picture: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Layout purpose and density per layout position (build_registry_node rules).
+
+        Args:
+            role_hints: Per-row role hints (computed if omitted)
+            is_picture: Per-row bool mask of image placeholders (none if omitted)
+
+        Returns:
+            (purposes, densities) object arrays of length n_layouts
+        """
+        hints = self.role_hints() if role_hints is None else role_hints
+        is_title = hints == "title"
+        titles = self.layout_counts(is_title)
+        bodies = self.layout_counts(hints == "body")
+        contents = self.layout_counts(hints == "content")
+        images = self.layout_counts(is_picture) if is_picture is not None else np.zeros(self.n_layouts, np.int64)
+        large_titles = self.layout_counts(is_title & (self.area_ratio > LARGE_TITLE_MIN_AREA))
+        slots = self.layout_counts()
+
+        only_title = (titles >= 1) & (bodies == 0) & (contents <= 1)
+        purpose = np.select(
+            [only_title & (large_titles > 0), images > 0, contents >= 2, bodies >= 1],
+            [0, 1, 2, 3],
+            default=4,
+        )
+        density = np.select([slots <= 2, slots >= 5], [0, 2], default=1)
+        return _PURPOSES[purpose], _DENSITIES[density]
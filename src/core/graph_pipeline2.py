@@ -3,6 +3,9 @@ Pipeline 2 StateGraph: Surgical Template Injection Workflow
 Enforces strict separation of concerns with dedicated styling node
 """
 import os
+import sys
+import importlib
+import threading
 from langgraph.graph import StateGraph, END
 from src.core.state import PPTState
 from src.utils.vault_client import VaultClient
@@ -10,6 +13,7 @@ from src.nodes.pipeline_2_generation import (
     extract_context_node,
     architect_slides_node,
     writer_node,
+    paginator_node,
     image_director_node,
     beautifier_node,
     surgical_injection_node
@@ -23,9 +27,10 @@ def create_pipeline2_graph():
     1. Extractor: Condense raw docs into content_map
     2. Architect: Match content to templates, create slide_plans with roles
     3. Writer: Generate specific content for each slide (create manifest)
-    4. Image Director: Enrich manifest with background image specs
-    5. Beautifier: Convert text to deterministic style instructions (IR)
-    6. Injector: Perform surgical injection and create .pptx
+    4. Paginator: Split overflowing bullet lists into continuation slides
+    5. Image Director: Enrich manifest with background image specs
+    6. Beautifier: Convert text to deterministic style instructions (IR)
+    7. Injector: Perform surgical injection and create .pptx
     
     The Beautifier serves as the "contract enforcement boundary" between
     LLM-generated content and physical document rendering.
@@ -40,18 +45,62 @@ def create_pipeline2_graph():
     workflow.add_node("extractor", extract_context_node)
     workflow.add_node("architect", architect_slides_node)
     workflow.add_node("writer", writer_node)
+    workflow.add_node("paginator", paginator_node)
     workflow.add_node("image_director", image_director_node)
     workflow.add_node("beautifier", beautifier_node)
     workflow.add_node("injector", surgical_injection_node)
     
-    # Define flow with Image Director and Beautifier in the pipeline
+    # Define flow with Paginator, Image Director and Beautifier in the pipeline
     workflow.set_entry_point("extractor")
     workflow.add_edge("extractor", "architect")
     workflow.add_edge("architect", "writer")
-    workflow.add_edge("writer", "image_director")
+    workflow.add_edge("writer", "paginator")
+    workflow.add_edge("paginator", "image_director")
     workflow.add_edge("image_director", "beautifier")
     workflow.add_edge("beautifier", "injector")
     
     workflow.add_edge("injector", END)
     
     return workflow.compile()
+
+
+# Compiled graph shared by every request in this process (Flask and Streamlit)
+_compiled_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_pipeline2_graph():
+    """
+    Return the process-wide compiled Pipeline 2 graph, building it on first use.
+    
+    Compiled LangGraph graphs are stateless between invocations (no checkpointer
+    is attached), so one instance can serve concurrent requests.
+    """
+    global _compiled_graph
+    if _compiled_graph is None:
+        with _graph_lock:
+            if _compiled_graph is None:  # Double-check
+                print("🧩 Compiling Pipeline 2 graph (first call)...")
+                _compiled_graph = create_pipeline2_graph()
+    return _compiled_graph
+
+
+def rebuild_pipeline2_graph(reload_nodes: bool = False):
+    """
+    Discard and recompile the shared graph (dev reloads after node modules change).
+    
+    Args:
+        reload_nodes: Also re-import the Pipeline 2 node modules and rebind the
+                      node functions used by create_pipeline2_graph()
+    """
+    global _compiled_graph
+    with _graph_lock:
+        if reload_nodes:
+            package_name = "src.nodes.pipeline_2_generation"
+            for mod_name in list(sys.modules):
+                if mod_name.startswith(package_name + "."):
+                    importlib.reload(sys.modules[mod_name])
+            package = importlib.reload(sys.modules[package_name])
+            globals().update({name: getattr(package, name) for name in package.__all__})
+        _compiled_graph = create_pipeline2_graph()
+    return _compiled_graph
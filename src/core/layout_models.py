@@ -1,5 +1,9 @@
-from pydantic import BaseModel, Field, model_validator, field_validator
-from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, ValidationError, ValidationInfo, model_validator, field_validator
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+from src.core.geometry import find_overlaps
+
+# Minimum gap between slots (px)
+SLOT_PADDING = 20
 
 class Coordinates(BaseModel):
     x: int = Field(..., ge=0, le=1920, description="X coordinate (0-1920)")
@@ -50,7 +54,7 @@ class StrictLayout(BaseModel):
     slots: List[StrictSlot]
 
     @model_validator(mode='after')
-    def validate_structure(self):
+    def validate_structure(self, info: ValidationInfo):
         # 1. Check sequential IDs
         sorted_slots = sorted(self.slots, key=lambda s: s.slot_id)
         ids = [s.slot_id for s in sorted_slots]
@@ -69,34 +73,68 @@ class StrictLayout(BaseModel):
                     if slot.coordinates.y >= 270:
                         raise ValueError(f"HEADER slot {slot.slot_id} must start in the top 25% (y < 270). Got y={slot.coordinates.y}")
         
-        # 3. Collision Detection with Padding
-        PADDING = 20
-        for i, s1 in enumerate(self.slots):
-            for s2 in self.slots[i+1:]:
-                if self._check_overlap(s1.coordinates, s2.coordinates, padding=PADDING):
-                    raise ValueError(f"Slot {s1.slot_id} is too close to Slot {s2.slot_id} (min padding {PADDING}px)")
+        # 3. Collision Detection with Padding (validate_layouts checks a whole batch at once instead)
+        if not (info.context or {}).get("skip_collisions"):
+            collisions = self.collisions()
+            if collisions:
+                raise ValueError(_collision_message(collisions))
                     
         return self
 
-    def _check_overlap(self, c1: Coordinates, c2: Coordinates, padding: int = 0) -> bool:
-        # Check if rectangles overlap OR are within padding distance
-        # Effective rectangle = original + padding/2 on all sides? 
-        # Simpler: Expand box 1 by padding and check intersection
-        
-        # Rect 1 with padding
-        r1_x1 = c1.x - padding
-        r1_y1 = c1.y - padding
-        r1_x2 = c1.x + c1.w + padding
-        r1_y2 = c1.y + c1.h + padding
-
-        # Rect 2 (strict)
-        r2_x1 = c2.x
-        r2_y1 = c2.y
-        r2_x2 = c2.x + c2.w
-        r2_y2 = c2.y + c2.h
-
-        if r1_x1 >= r2_x2 or r2_x1 >= r1_x2:
-            return False
-        if r1_y1 >= r2_y2 or r2_y1 >= r1_y2:
-            return False
-        return True
+    def collisions(self, padding: int = SLOT_PADDING) -> List[Tuple[int, int]]:
+        """All (slot_id, slot_id) pairs closer than padding, in slot order (sweep line, see find_overlaps)."""
+        return find_layout_collisions([self], padding=padding)[0]
+
+
+def _collision_message(collisions: List[Tuple[int, int]], padding: int = SLOT_PADDING) -> str:
+    return "; ".join(
+        f"Slot {a} is too close to Slot {b} (min padding {padding}px)" for a, b in collisions
+    )
+
+
+def find_layout_collisions(layouts: Sequence[StrictLayout], padding: int = SLOT_PADDING) -> List[List[Tuple[int, int]]]:
+    """
+    Padded slot collisions for many layouts in one sweep.
+
+    Returns:
+        One list of (slot_id, slot_id) pairs per layout; pairs follow slot order, so
+        the first pair is the one a pairwise scan over the slots would find first
+    """
+    rows = [(g, slot) for g, layout in enumerate(layouts) for slot in layout.slots]
+    coords = [slot.coordinates for _, slot in rows]
+    pairs = find_overlaps(
+        [c.x for c in coords], [c.y for c in coords], [c.w for c in coords], [c.h for c in coords],
+        padding=padding, groups=[g for g, _ in rows],
+    )
+    result: List[List[Tuple[int, int]]] = [[] for _ in layouts]
+    for i, j in pairs:
+        result[rows[i][0]].append((rows[i][1].slot_id, rows[j][1].slot_id))
+    return result
+
+
+def validate_layouts(layouts: Sequence[Dict[str, Any]], padding: int = SLOT_PADDING) -> List[Tuple[Optional[StrictLayout], List[str]]]:
+    """
+    Validate a batch of layout dicts, reporting every error instead of the first.
+
+    Field and structure checks run per layout; collision detection runs once for the
+    whole batch.
+
+    Returns:
+        (StrictLayout or None, error messages) per input, in order
+    """
+    results: List[Tuple[Optional[StrictLayout], List[str]]] = []
+    parsed: List[Tuple[int, StrictLayout]] = []
+    for data in layouts:
+        try:
+            layout = StrictLayout.model_validate(data, context={"skip_collisions": True})
+        except ValidationError as e:
+            results.append((None, [err["msg"] for err in e.errors()]))
+            continue
+        parsed.append((len(results), layout))
+        results.append((layout, []))
+
+    collisions = find_layout_collisions([layout for _, layout in parsed], padding=padding)
+    for (pos, layout), pairs in zip(parsed, collisions):
+        if pairs:
+            results[pos] = (None, [_collision_message([pair], padding) for pair in pairs])
+    return results
@@ -9,9 +9,14 @@ class Pipeline1State(TypedDict):
     """
     # --- Inputs ---
     template_path: str          # Path to the .pptx file we are analyzing
+    previous_registry: Optional[dict]  # Existing registry for incremental re-indexing (optional)
     
     # --- Internal Data ---
-    raw_shape_data: List[dict]   # List of IDs, names, and sizes from parser.py
+    raw_shape_data: List[dict]   # List of IDs, names, and sizes from parser.py (changed layouts only)
+    template_hash: Optional[str]             # SHA-256 of the .pptx bytes
+    layout_fingerprints: Optional[Dict[str, str]]  # layout index -> layout XML fingerprint
+    reused_layouts: Optional[List[int]]      # Layout indices unchanged since previous_registry
+    slide_size: Optional[List[int]]          # [width, height] of the slides in EMU
     
     # --- Outputs ---
     json_description: Optional[dict]  # The final structured JSON from registry_builder.py
@@ -85,6 +90,8 @@ class PPTState(TypedDict):
     
     # --- Output ---
     final_file_path: Optional[str] # Path to generated .pptx
+    render_to_memory: Optional[bool]   # Injector returns final_file_bytes instead of saving to final_file_path
+    final_file_bytes: Optional[bytes]  # Generated .pptx when render_to_memory is set
     
     # --- Control Flags ---
     validation_errors: List[str]   # Track any issues
\ No newline at end of file
@@ -0,0 +1,344 @@
+# Fast template parser: reads layout/master XML straight from the package with lxml
+"""
+lxml-based alternative to walking python-pptx proxies in parse_template_node.
+
+Produces the same per-shape metadata as ppt_helper.get_placeholder_metadata for
+slide layout placeholders (including geometry inherited from the master), and
+additionally resolves defaults that python-pptx reports as unset:
+
+- default_font_size_pt: layout lstStyle → master placeholder lstStyle → master txStyles
+- default_alignment:    same chain (instead of the hard "LEFT" fallback)
+- auto_size:            layout bodyPr → master placeholder bodyPr
+"""
+import hashlib
+import posixpath
+import zipfile
+from typing import Any, Dict, List, Optional
+from lxml import etree
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.enum.text import MSO_AUTO_SIZE, PP_ALIGN
+from pptx.util import Centipoints, Emu
+
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS = {"p": P_NS, "a": A_NS, "r": R_NS}
+
+_SHAPE_TAGS = {f"{{{P_NS}}}{tag}" for tag in ("sp", "grpSp", "graphicFrame", "cxnSp", "pic", "contentPart")}
+_SP_TAG = f"{{{P_NS}}}sp"
+
+# Master placeholder a layout placeholder inherits geometry from (as in python-pptx LayoutPlaceholder)
+_BASE_PH_TYPE = {
+    PP_PLACEHOLDER.BODY: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.CHART: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.BITMAP: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.CENTER_TITLE: PP_PLACEHOLDER.TITLE,
+    PP_PLACEHOLDER.ORG_CHART: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.DATE: PP_PLACEHOLDER.DATE,
+    PP_PLACEHOLDER.FOOTER: PP_PLACEHOLDER.FOOTER,
+    PP_PLACEHOLDER.MEDIA_CLIP: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.OBJECT: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.PICTURE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.SLIDE_NUMBER: PP_PLACEHOLDER.SLIDE_NUMBER,
+    PP_PLACEHOLDER.SUBTITLE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.TABLE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.TITLE: PP_PLACEHOLDER.TITLE,
+}
+
+# Master text style each placeholder type falls back to
+_TITLE_TYPES = {PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE, PP_PLACEHOLDER.VERTICAL_TITLE}
+_OTHER_TYPES = {PP_PLACEHOLDER.DATE, PP_PLACEHOLDER.FOOTER, PP_PLACEHOLDER.SLIDE_NUMBER, PP_PLACEHOLDER.HEADER}
+
+_AUTOFIT = {
+    f"{{{A_NS}}}noAutofit": MSO_AUTO_SIZE.NONE,
+    f"{{{A_NS}}}normAutofit": MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE,
+    f"{{{A_NS}}}spAutoFit": MSO_AUTO_SIZE.SHAPE_TO_FIT_TEXT,
+}
+
+# Default bodyPr insets (EMU), as reported by python-pptx
+_DEFAULT_INSETS = {"lIns": 91440, "rIns": 91440, "tIns": 45720, "bIns": 45720}
+
+
+def _bool(value: Optional[str]) -> Optional[bool]:
+    if value is None:
+        return None
+    return value in ("1", "true")
+
+
+def _part_name(base_part: str, target: str) -> str:
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base_part), target))
+
+
+def _rels(zf: zipfile.ZipFile, part_name: str) -> Dict[str, str]:
+    """rId -> target part name for a part's internal relationships."""
+    rels_name = posixpath.join(posixpath.dirname(part_name), "_rels", posixpath.basename(part_name) + ".rels")
+    root = etree.fromstring(zf.read(rels_name))
+    return {
+        rel.get("Id"): _part_name(part_name, rel.get("Target"))
+        for rel in root.iterchildren(f"{{{PKG_REL_NS}}}Relationship")
+        if rel.get("TargetMode") != "External"
+    }
+
+
+def _ph(shape_elm) -> Optional[Any]:
+    found = shape_elm.xpath("./*[1]/p:nvPr/p:ph", namespaces=NS)
+    return found[0] if found else None
+
+
+def _ph_type(ph) -> PP_PLACEHOLDER:
+    value = ph.get("type")
+    return PP_PLACEHOLDER.from_xml(value) if value is not None else PP_PLACEHOLDER.OBJECT
+
+
+def _placeholder_elements(root) -> List[Any]:
+    sp_tree = root.find("p:cSld/p:spTree", NS)
+    if sp_tree is None:
+        return []
+    return [e for e in sp_tree.iterchildren() if e.tag in _SHAPE_TAGS and _ph(e) is not None]
+
+
+def _xfrm_values(shape_elm) -> Dict[str, Optional[int]]:
+    """Directly-applied left/top/width/height (None where absent)."""
+    xfrm = shape_elm.find("p:spPr/a:xfrm", NS)
+    if xfrm is None:
+        xfrm = shape_elm.find("p:xfrm", NS)  # graphicFrame
+    off = xfrm.find("a:off", NS) if xfrm is not None else None
+    ext = xfrm.find("a:ext", NS) if xfrm is not None else None
+    return {
+        "left": Emu(int(off.get("x"))) if off is not None else None,
+        "top": Emu(int(off.get("y"))) if off is not None else None,
+        "width": Emu(int(ext.get("cx"))) if ext is not None else None,
+        "height": Emu(int(ext.get("cy"))) if ext is not None else None,
+    }
+
+
+def _level_props(lst_style, level: int):
+    if lst_style is None:
+        return None
+    return lst_style.find(f"a:lvl{level + 1}pPr", NS)
+
+
+def _paragraph_text(p) -> str:
+    parts = []
+    for child in p:
+        if child.tag in (f"{{{A_NS}}}r", f"{{{A_NS}}}fld"):
+            t = child.find("a:t", NS)
+            parts.append((t.text or "") if t is not None else "")
+        elif child.tag == f"{{{A_NS}}}br":
+            parts.append("\v")
+    return "".join(parts)
+
+
+def _line_spacing(pPr):
+    if pPr is None:
+        return None
+    pct = pPr.find("a:lnSpc/a:spcPct", NS)
+    if pct is not None:
+        value = pct.get("val")
+        return float(value[:-1]) / 100.0 if value.endswith("%") else int(value) / 100000.0
+    pts = pPr.find("a:lnSpc/a:spcPts", NS)
+    if pts is not None:
+        return Centipoints(int(pts.get("val")))
+    return None
+
+
+class TemplatePackage:
+    """
+    Raw view of a .pptx for indexing: slide size, the first master's layouts in
+    python-pptx order (prs.slide_layouts), and their parsed XML.
+    """
+
+    def __init__(self, template_path: str):
+        self.template_path = template_path
+        with zipfile.ZipFile(template_path) as zf:
+            presentation = etree.fromstring(zf.read("ppt/presentation.xml"))
+            sld_sz = presentation.find("p:sldSz", NS)
+            self.slide_width = int(sld_sz.get("cx")) if sld_sz is not None else None
+            self.slide_height = int(sld_sz.get("cy")) if sld_sz is not None else None
+
+            pres_rels = _rels(zf, "ppt/presentation.xml")
+            master_id = presentation.find("p:sldMasterIdLst/p:sldMasterId", NS)
+            self.master_part = pres_rels[master_id.get(f"{{{R_NS}}}id")]
+            self.master_bytes = zf.read(self.master_part)
+            self.master = etree.fromstring(self.master_bytes)
+
+            master_rels = _rels(zf, self.master_part)
+            self.layout_parts = [
+                master_rels[layout_id.get(f"{{{R_NS}}}id")]
+                for layout_id in self.master.iterfind("p:sldLayoutIdLst/p:sldLayoutId", NS)
+            ]
+            self.layout_bytes = [zf.read(part) for part in self.layout_parts]
+
+        self._layouts: Dict[int, Any] = {}
+        self._master_placeholders = _placeholder_elements(self.master)
+        self._text_styles = {
+            "title": self.master.find("p:txStyles/p:titleStyle", NS),
+            "body": self.master.find("p:txStyles/p:bodyStyle", NS),
+            "other": self.master.find("p:txStyles/p:otherStyle", NS),
+        }
+
+    def __len__(self) -> int:
+        return len(self.layout_parts)
+
+    def layout(self, index: int):
+        if index not in self._layouts:
+            self._layouts[index] = etree.fromstring(self.layout_bytes[index])
+        return self._layouts[index]
+
+    def layout_name(self, index: int) -> str:
+        c_sld = self.layout(index).find("p:cSld", NS)
+        return c_sld.get("name", "") if c_sld is not None else ""
+
+    def layout_fingerprints(self) -> List[str]:
+        """Same fingerprints as parser.layout_fingerprints (slide size + master XML + layout XML)."""
+        size = f"{self.slide_width}x{self.slide_height}".encode("utf-8")
+        master_digest = hashlib.sha256(self.master_bytes).digest()
+        fingerprints = []
+        for layout_bytes in self.layout_bytes:
+            digest = hashlib.sha256(size)
+            digest.update(master_digest)
+            digest.update(layout_bytes)
+            fingerprints.append(digest.hexdigest())
+        return fingerprints
+
+    def _master_placeholder(self, ph_type: PP_PLACEHOLDER):
+        """First master placeholder of the given type (MasterPlaceholders.get)."""
+        for elm in self._master_placeholders:
+            if _ph_type(_ph(elm)) == ph_type:
+                return elm
+        return None
+
+    def _text_style(self, ph_type: PP_PLACEHOLDER):
+        if ph_type in _TITLE_TYPES:
+            return self._text_styles["title"]
+        if ph_type in _OTHER_TYPES:
+            return self._text_styles["other"]
+        return self._text_styles["body"]
+
+    def layout_shapes(self, index: int) -> List[Dict[str, Any]]:
+        """Placeholder metadata for one layout (get_placeholder_metadata output format)."""
+        shapes = []
+        for elm in _placeholder_elements(self.layout(index)):
+            try:
+                shapes.append(self._placeholder_metadata(elm))
+            except KeyError as e:
+                # python-pptx cannot resolve the inherited geometry either and skips the shape
+                print(f"⚠️ Warning: Skipping problematic shape - {e}")
+        return shapes
+
+    def _placeholder_metadata(self, elm) -> Dict[str, Any]:
+        ph = _ph(elm)
+        ph_type = _ph_type(ph)
+        is_layout_placeholder = elm.tag == _SP_TAG
+        c_nv_pr = elm.find("./*[1]/p:cNvPr", NS)
+
+        geometry = _xfrm_values(elm)
+        master_ph = None
+        if is_layout_placeholder:
+            needs_inherit = any(v is None for v in geometry.values())
+            base_type = _BASE_PH_TYPE.get(ph_type)
+            if base_type is not None:
+                master_ph = self._master_placeholder(base_type)
+            elif needs_inherit:
+                raise KeyError(ph_type)
+            if needs_inherit:
+                inherited = _xfrm_values(master_ph) if master_ph is not None else {}
+                geometry = {k: v if v is not None else inherited.get(k) for k, v in geometry.items()}
+
+        metadata = {
+            # Canonical identity
+            "idx": int(ph.get("idx", "0")),
+            "name": c_nv_pr.get("name") if c_nv_pr is not None else "Unnamed",
+            "type": str(ph_type),
+            "type_id": int(ph_type),
+
+            # Geometry
+            **geometry,
+            "shape_type": "rectangle",  # Placeholders always map to rectangle (see map_shape_type)
+
+            # Template intelligence
+            "template_text": None,
+            "default_font_size_pt": None,
+            "default_font_name": None,
+            "is_bold": None,
+            "is_italic": None,
+            "default_alignment": None,
+            "line_spacing": None,
+            "indent_level": None,
+            "word_wrap": None,
+            "auto_size": None,
+            "margin_left": None,
+            "margin_right": None,
+            "margin_top": None,
+            "margin_bottom": None
+        }
+        if not is_layout_placeholder:
+            return metadata  # Pictures/graphic frames have no text frame
+
+        tx_body = elm.find("p:txBody", NS)
+        body_pr = tx_body.find("a:bodyPr", NS) if tx_body is not None else None
+        paragraphs = tx_body.findall("a:p", NS) if tx_body is not None else [None]
+
+        text = "\n".join(_paragraph_text(p) for p in paragraphs if p is not None)
+        if text:
+            metadata["template_text"] = text.strip()
+
+        wrap = body_pr.get("wrap") if body_pr is not None else None
+        metadata["word_wrap"] = {"square": True, "none": False}.get(wrap)
+        auto_size = self._auto_size(body_pr, master_ph)
+        metadata["auto_size"] = str(auto_size)
+        for key, attr in (("margin_left", "lIns"), ("margin_right", "rIns"),
+                          ("margin_top", "tIns"), ("margin_bottom", "bIns")):
+            value = body_pr.get(attr) if body_pr is not None else None
+            metadata[key] = Emu(int(value) if value is not None else _DEFAULT_INSETS[attr])
+
+        if not paragraphs:
+            return metadata
+
+        first = paragraphs[0]
+        pPr = first.find("a:pPr", NS) if first is not None else None
+        level = int(pPr.get("lvl", "0")) if pPr is not None else 0
+        style_chain = [
+            _level_props(tx_body.find("a:lstStyle", NS) if tx_body is not None else None, level),
+            _level_props(master_ph.find("p:txBody/a:lstStyle", NS) if master_ph is not None else None, level),
+            _level_props(self._text_style(ph_type), level),
+        ]
+
+        algn = pPr.get("algn") if pPr is not None else None
+        if algn is None:
+            algn = next((s.get("algn") for s in style_chain if s is not None and s.get("algn")), None)
+        metadata["default_alignment"] = str(PP_ALIGN.from_xml(algn)) if algn else "LEFT"
+        metadata["line_spacing"] = _line_spacing(pPr)
+        metadata["indent_level"] = level
+
+        first_run = first.find("a:r", NS) if first is not None else None
+        r_pr = first_run.find("a:rPr", NS) if first_run is not None else None
+        if first_run is not None:
+            latin = r_pr.find("a:latin", NS) if r_pr is not None else None
+            metadata["default_font_name"] = (latin.get("typeface") or None) if latin is not None else None
+            metadata["is_bold"] = _bool(r_pr.get("b")) if r_pr is not None else None
+            metadata["is_italic"] = _bool(r_pr.get("i")) if r_pr is not None else None
+
+        size = r_pr.get("sz") if r_pr is not None else None
+        if size is None:
+            size = next((
+                s.find("a:defRPr", NS).get("sz") for s in style_chain
+                if s is not None and s.find("a:defRPr", NS) is not None and s.find("a:defRPr", NS).get("sz")
+            ), None)
+        if size is not None:
+            metadata["default_font_size_pt"] = Centipoints(int(size)).pt
+
+        return metadata
+
+    @staticmethod
+    def _auto_size(body_pr, master_ph):
+        for candidate in (body_pr, master_ph.find("p:txBody/a:bodyPr", NS) if master_ph is not None else None):
+            if candidate is None:
+                continue
+            for child in candidate:
+                if child.tag in _AUTOFIT:
+                    return _AUTOFIT[child.tag]
+        return None
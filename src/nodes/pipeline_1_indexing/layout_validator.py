@@ -1,5 +1,10 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Literal, Optional, Dict, Any
+from src.core.geometry import SlotGeometry
+
+# Bump whenever the registry schema or the parser/registry_builder output changes, so
+# incremental indexing re-parses templates and layouts indexed by older code
+INDEXER_VERSION = 1
 
 class GeometryMetadata(BaseModel):
     """Normalized geometry for semantic reasoning (not used for injection).
@@ -87,4 +92,17 @@ class LayoutMetadata(BaseModel):
 class MasterRegistry(BaseModel):
     model_config = ConfigDict(extra='forbid')
     master_name: str
-    layouts: List[LayoutMetadata]
\ No newline at end of file
+    layouts: List[LayoutMetadata]
+    
+    # Incremental re-indexing: unchanged templates/layouts are not re-parsed
+    indexer_version: Optional[int] = Field(None, description="INDEXER_VERSION that built this registry")
+    template_hash: Optional[str] = Field(None, description="SHA-256 of the template file")
+    layout_fingerprints: Optional[Dict[str, str]] = Field(None, description="Layout index -> hash of layout + master XML and slide size")
+    slide_size: Optional[List[int]] = Field(None, description="[width, height] of the slides in EMU (for text fitting)")
+    
+    # Precomputed lookups for Pipeline 2 (see src/utils/registry_index.py)
+    indexes: Optional[Dict[str, Any]] = Field(None, description="Layout/slot lookup indexes (positions into layouts/slots)")
+    
+    def slot_geometry(self) -> SlotGeometry:
+        """Columnar geometry of every slot, in layouts/slots order (see src/core/geometry.py)."""
+        return SlotGeometry.from_layouts(self.model_dump(include={"layouts"})["layouts"], key="slots")
\ No newline at end of file
@@ -1,64 +1,158 @@
 # Node 1: Logic to extract PPTX shape IDs with normalized geometry
+import hashlib
+import zipfile
+from typing import List
+from lxml import etree
 from pptx import Presentation
 from src.core.state import Pipeline1State
-from src.utils.ppt_helper import get_placeholder_metadata, calculate_area
+from src.utils.ppt_helper import get_placeholder_metadata
+from src.core.geometry import SlotGeometry
+from src.nodes.pipeline_1_indexing.fast_parser import TemplatePackage
+from src.nodes.pipeline_1_indexing.layout_validator import INDEXER_VERSION
+from src.config import FAST_TEMPLATE_PARSER
 
-def parse_template_node(state: Pipeline1State):
+
+def hash_template_file(template_path: str) -> str:
+    """SHA-256 of the template file (registry 'template_hash')."""
+    digest = hashlib.sha256()
+    with open(template_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def layout_fingerprints(template_path: str, prs) -> List[str]:
     """
-    Extracts placeholder metadata with normalized geometry (0.0 to 1.0) for semantic analysis.
+    Content hash per layout: slide size + slide master XML + layout XML.
+    
+    The master is included because layout placeholders inherit geometry from it.
+    Hashes the raw part bytes from the package, so no XML is re-serialized.
+    """
+    size = f"{prs.slide_width}x{prs.slide_height}".encode("utf-8")
+    master_digests = {}
+    fingerprints = []
+    with zipfile.ZipFile(template_path) as zf:
+        for layout in prs.slide_layouts:
+            master_name = layout.slide_master.part.partname.lstrip("/")
+            if master_name not in master_digests:
+                master_digests[master_name] = hashlib.sha256(zf.read(master_name)).digest()
+            digest = hashlib.sha256(size)
+            digest.update(master_digests[master_name])
+            digest.update(zf.read(layout.part.partname.lstrip("/")))
+            fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+def _enrich_layouts(layouts_data, slide_width, slide_height):
     """
-    prs = Presentation(state['template_path'])
+    Add normalized geometry, area ratio and circle metadata to every placeholder dict (in place).
     
+    The whole template is normalized as one set of columns (see src/core/geometry.py).
+    """
+    geometry = SlotGeometry.from_emu(layouts_data, slide_width, slide_height)
+    columns = zip(
+        geometry.norm_left.tolist(), geometry.norm_top.tolist(),
+        geometry.norm_width.tolist(), geometry.norm_height.tolist(),
+        geometry.area_ratio.tolist(), geometry.area_score.tolist(),
+        geometry.is_circular.tolist(), geometry.radius().tolist(), geometry.is_ellipse().tolist(),
+    )
+    shapes = (shape for layout in layouts_data for shape in layout['shapes'])
+    for shape, (left, top, width, height, area_ratio, area_score, circular, radius, ellipse) in zip(shapes, columns):
+        # Normalized positions (0.0 to 1.0) and area ratio (percentage of slide)
+        shape['norm_left'] = left
+        shape['norm_top'] = top
+        shape['norm_width'] = width
+        shape['norm_height'] = height
+        shape['area_ratio'] = area_ratio
+        
+        # Keep legacy area score for backward compatibility
+        shape['area_score'] = area_score
+        
+        # Circular geometry metadata for oval shapes (radius from the minimum dimension)
+        shape['is_circular'] = circular
+        if circular:
+            shape['radius'] = radius
+            if ellipse:  # Not a perfect circle: store both axes
+                shape['ellipse_axes'] = (width / 2, height / 2)
+    return layouts_data
+
+
+def _parse_layouts_fast(template_path: str, known_fingerprints: set):
+    """lxml path: (layouts_data, fingerprints, reused_layouts, slide_size) without python-pptx proxies."""
+    package = TemplatePackage(template_path)
+    fingerprints = package.layout_fingerprints()
+    layouts_data = []
+    reused_layouts = []
+    
+    for i in range(len(package)):
+        if fingerprints[i] in known_fingerprints:
+            reused_layouts.append(i)
+            continue
+        layouts_data.append({
+            "index": i,
+            "name": package.layout_name(i),
+            "shapes": package.layout_shapes(i)
+        })
+    _enrich_layouts(layouts_data, package.slide_width, package.slide_height)
+    return layouts_data, fingerprints, reused_layouts, [package.slide_width, package.slide_height]
+
+
+def _parse_layouts(template_path: str, known_fingerprints: set):
+    """python-pptx path: (layouts_data, fingerprints, reused_layouts, slide_size)."""
+    prs = Presentation(template_path)
+    fingerprints = layout_fingerprints(template_path, prs)
     layouts_data = []
+    reused_layouts = []
     
     # Iterate over all layouts in the master
     for i, layout in enumerate(prs.slide_layouts):
-        # Get slide dimensions from the layout
-        slide_width = prs.slide_width
-        slide_height = prs.slide_height
+        if fingerprints[i] in known_fingerprints:
+            reused_layouts.append(i)
+            continue
         
         # Use the helper to get clean metadata for this layout
-        shapes = get_placeholder_metadata(layout)
-        
-        # Enrich with normalized geometry and area calculations
-        for shape in shapes:
-            width = shape.get('width') or 0
-            height = shape.get('height') or 0
-            left = shape.get('left') or 0
-            top = shape.get('top') or 0
-            shape_type = shape.get('shape_type', 'rectangle')
-            
-            # Calculate normalized positions (0.0 to 1.0)
-            shape['norm_left'] = left / slide_width if slide_width > 0 else 0
-            shape['norm_top'] = top / slide_height if slide_height > 0 else 0
-            shape['norm_width'] = width / slide_width if slide_width > 0 else 0
-            shape['norm_height'] = height / slide_height if slide_height > 0 else 0
-            
-            # Calculate area ratio (percentage of slide)
-            total_area = slide_width * slide_height
-            shape['area_ratio'] = (width * height) / total_area if total_area > 0 else 0
-            
-            # Keep legacy area score for backward compatibility
-            shape['area_score'] = calculate_area(width, height)
-            
-            # Add circular geometry metadata for oval shapes
-            if shape_type == 'oval':
-                # For ovals/circles, calculate radius (using minimum dimension for true circles)
-                norm_width = shape['norm_width']
-                norm_height = shape['norm_height']
-                shape['is_circular'] = True
-                shape['radius'] = min(norm_width, norm_height) / 2
-                
-                # For ellipses (different width/height), store both axes
-                if abs(norm_width - norm_height) > 0.01:  # Not a perfect circle
-                    shape['ellipse_axes'] = (norm_width / 2, norm_height / 2)
-            else:
-                shape['is_circular'] = False
-            
         layouts_data.append({
             "index": i,
             "name": layout.name,
-            "shapes": shapes
+            "shapes": get_placeholder_metadata(layout)
         })
-        
-    return {"raw_shape_data": layouts_data}
\ No newline at end of file
+    _enrich_layouts(layouts_data, prs.slide_width, prs.slide_height)
+    return layouts_data, fingerprints, reused_layouts, [prs.slide_width, prs.slide_height]
+
+
+def parse_template_node(state: Pipeline1State):
+    """
+    Extracts placeholder metadata with normalized geometry (0.0 to 1.0) for semantic analysis.
+    
+    With a previous_registry from the current INDEXER_VERSION in state, layouts
+    whose fingerprint is unchanged are not parsed; they are listed in reused_layouts for the registry builder to merge.
+    FAST_TEMPLATE_PARSER reads the layout XML directly with lxml (falls back to
+    python-pptx if the package cannot be read that way).
+    """
+    template_path = state['template_path']
+    template_hash = hash_template_file(template_path)
+    
+    previous = state.get('previous_registry') or {}
+    if previous.get('indexer_version') != INDEXER_VERSION:
+        previous = {}  # Built by other indexer code: nothing in it can be reused
+    known_fingerprints = set((previous.get('layout_fingerprints') or {}).values())
+    
+    if FAST_TEMPLATE_PARSER:
+        try:
+            layouts_data, fingerprints, reused_layouts, slide_size = _parse_layouts_fast(template_path, known_fingerprints)
+        except (KeyError, AttributeError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+            print(f"⚠️  Parser: fast path failed ({type(e).__name__}: {e}), using python-pptx")
+            layouts_data, fingerprints, reused_layouts, slide_size = _parse_layouts(template_path, known_fingerprints)
+    else:
+        layouts_data, fingerprints, reused_layouts, slide_size = _parse_layouts(template_path, known_fingerprints)
+    
+    if previous:
+        print(f"--- Parser: {len(layouts_data)} changed layouts, {len(reused_layouts)} unchanged ---")
+    
+    return {
+        "raw_shape_data": layouts_data,
+        "template_hash": template_hash,
+        "layout_fingerprints": {str(i): fp for i, fp in enumerate(fingerprints)},
+        "reused_layouts": reused_layouts,
+        "slide_size": slide_size,
+    }
\ No newline at end of file
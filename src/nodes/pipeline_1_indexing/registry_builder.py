@@ -5,6 +5,7 @@ Creates structured metadata (layout_map.json) for templates using LLM.
 
 from src.core.state import Pipeline1State
 from src.nodes.pipeline_1_indexing.layout_validator import (
+    INDEXER_VERSION,
     MasterRegistry, 
     LayoutMetadata, 
     SlotSchema,
@@ -12,9 +13,14 @@ from src.nodes.pipeline_1_indexing.layout_validator import (
 )
 from pydantic import BaseModel
 from typing import List
+import copy
 import os
+import numpy as np
+
+from src.core.geometry import SlotGeometry
 
 from src.utils.auth_helper import get_llm
+from src.utils.registry_index import build_registry_indexes
 
 # Lazy LLM initialization
 _llm_instance = None
@@ -31,6 +37,7 @@ def derive_role_hint(shape: dict) -> str:
     """
     Deterministic logic to assign semantic role_hint based on normalized geometry.
     NO LLM - Pure Python logic for consistency.
+    build_registry_node uses the vectorized SlotGeometry.role_hints() (same rules).
     """
     norm_top = shape.get('norm_top', 0)
     norm_height = shape.get('norm_height', 0)
@@ -60,6 +67,9 @@ def build_registry_node(state: Pipeline1State):
     Analyzes raw shape data for ALL layouts and generates enriched registry with:
     - Normalized geometry (for Writer reasoning)
     - Semantic role_hints (for content quality)
+    
+    Layouts the parser reported as unchanged (reused_layouts) are copied from
+    previous_registry by fingerprint instead of being rebuilt.
     """
     layouts_data = state['raw_shape_data'] # List of dicts {index, name, shapes}
     template_path = state['template_path']
@@ -69,7 +79,15 @@ def build_registry_node(state: Pipeline1State):
     
     print(f"--- Registry Builder: Analyzing {len(layouts_data)} layouts in {template_name} ---")
     
-    for layout_raw in layouts_data:
+    # Role hints, purpose and density for every layout at once (columnar geometry)
+    geometry = SlotGeometry.from_layouts(layouts_data, key="shapes")
+    role_hints = geometry.role_hints()
+    is_picture = np.array(
+        ['Picture' in s.get('name', '') for layout_raw in layouts_data for s in layout_raw['shapes']], dtype=bool
+    )
+    purposes, densities = geometry.classify_layouts(role_hints, is_picture)
+    
+    for pos, layout_raw in enumerate(layouts_data):
         idx = layout_raw['index']
         name = layout_raw['name']
         shapes = layout_raw['shapes']
@@ -79,38 +97,15 @@ def build_registry_node(state: Pipeline1State):
             continue
         
         # Enrich shapes with role_hint BEFORE sending to LLM
+        layout_hints = role_hints[geometry.rows(pos)].tolist()
         enriched_shapes = []
-        for shape in shapes:
+        for shape, role_hint in zip(shapes, layout_hints):
             enriched_shape = shape.copy()
-            enriched_shape['role_hint'] = derive_role_hint(shape)
+            enriched_shape['role_hint'] = role_hint
             enriched_shapes.append(enriched_shape)
         
-        # Analyze slot composition for better descriptions
         slot_count = len(enriched_shapes)
-        title_slots = sum(1 for s in enriched_shapes if s['role_hint'] == 'title')
-        body_slots = sum(1 for s in enriched_shapes if s['role_hint'] == 'body')
-        content_slots = sum(1 for s in enriched_shapes if s['role_hint'] == 'content')
-        image_slots = sum(1 for s in enriched_shapes if 'Picture' in s.get('name', ''))
-        
-        # Identify layout patterns and spatial characteristics
-        has_columns = content_slots >= 2
-        has_image = image_slots > 0
-        layout_type = "multi-column" if has_columns else "single-area" if body_slots > 0 else "title-focused"
-        
-        # Detect layout purpose based on composition
-        has_large_title = any(s.get('area_ratio', 0) > 0.05 and s['role_hint'] == 'title' for s in enriched_shapes)
-        has_only_title = title_slots >= 1 and body_slots == 0 and content_slots <= 1
-        
-        if has_only_title and has_large_title:
-            layout_purpose = "TITLE_SLIDE"
-        elif image_slots > 0:
-            layout_purpose = "VISUAL_SLIDE"
-        elif has_columns and content_slots >= 2:
-            layout_purpose = "COMPARISON_SLIDE"
-        elif body_slots >= 1:
-            layout_purpose = "CONTENT_SLIDE"
-        else:
-            layout_purpose = "GENERAL_CONTENT"
+        layout_purpose = purposes[pos]
             
         # === BUILD SLOTS DIRECTLY FROM PLACEHOLDER DATA (more reliable than LLM) ===
         slots = []
@@ -168,7 +163,11 @@ def build_registry_node(state: Pipeline1State):
                     "is_italic": shape.get('is_italic'),
                     "word_wrap": shape.get('word_wrap', True),
                     "auto_size": shape.get('auto_size'),
-                    "line_spacing": shape.get('line_spacing')
+                    "line_spacing": shape.get('line_spacing'),
+                    "margin_left": shape.get('margin_left'),
+                    "margin_right": shape.get('margin_right'),
+                    "margin_top": shape.get('margin_top'),
+                    "margin_bottom": shape.get('margin_bottom')
                 },
                 role_hint=shape['role_hint'],
                 content_priority="optional" if semantic_role == "footer" else "required"
@@ -250,7 +249,7 @@ def build_registry_node(state: Pipeline1State):
                 layout_role=None,  # Will be inferred by architect
                 supports_background_image=False,
                 has_image_slot=has_image_slot,  # NEW: For NO_IMAGE filtering
-                density="low" if slot_count <= 2 else "high" if slot_count >= 5 else "medium"
+                density=densities[pos]
             )
             
             # Slots are already fully enriched above, just append the layout
@@ -259,6 +258,42 @@ def build_registry_node(state: Pipeline1State):
         except Exception as e:
             print(f"  Failed to analyze layout {idx}: {e}")
             
-    registry = MasterRegistry(master_name=template_name, layouts=analyzed_layouts)
+    # Merge layouts unchanged since the previous registry (matched by fingerprint, so moves are fine)
+    fingerprints = state.get('layout_fingerprints') or {}
+    reused = state.get('reused_layouts') or []
+    if reused:
+        previous = state.get('previous_registry') or {}
+        previous_fingerprints = previous.get('layout_fingerprints') or {}
+        previous_by_fingerprint = {
+            previous_fingerprints.get(str(l['layout_index'])): l for l in previous.get('layouts', [])
+        }
+        for idx in reused:
+            previous_layout = previous_by_fingerprint.get(fingerprints.get(str(idx)))
+            if previous_layout is None:
+                continue  # Defensive: the parser only reuses fingerprints the previous registry kept
+            layout = copy.deepcopy(previous_layout)
+            layout['layout_index'] = idx
+            for slot in layout.get('slots', []):
+                slot['layout_index'] = idx
+            analyzed_layouts.append(LayoutMetadata(**layout))
+        analyzed_layouts.sort(key=lambda l: l.layout_index)
+        print(f"  Reused {len(reused)} unchanged layouts from the previous registry")
+    
+    # Only layouts that made it into the registry keep a fingerprint: skipped or failed
+    # layouts must not look "unchanged" next time, or they would never be rebuilt
+    kept_fingerprints = {
+        str(l.layout_index): fingerprints[str(l.layout_index)]
+        for l in analyzed_layouts if str(l.layout_index) in fingerprints
+    }
+    
+    registry = MasterRegistry(
+        master_name=template_name,
+        layouts=analyzed_layouts,
+        indexer_version=INDEXER_VERSION,
+        template_hash=state.get('template_hash'),
+        layout_fingerprints=kept_fingerprints or None,
+        slide_size=state.get('slide_size'),
+    )
+    registry.indexes = build_registry_indexes(registry.model_dump(include={"layouts"}))
     
     return {"json_description": registry.model_dump()}
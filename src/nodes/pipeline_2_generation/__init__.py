@@ -1,15 +1,19 @@
 from .extractor import extract_context_node
 from .architect import architect_slides_node
 from .writer import writer_node
+from .paginator import paginator_node
 from .image_director import image_director_node
 from .beautifier import beautifier_node
 from .injector import surgical_injection_node
+from .rerender import rerender_deck
 
 __all__ = [
     "extract_context_node", 
     "architect_slides_node", 
     "writer_node",
+    "paginator_node",
     "image_director_node", 
     "beautifier_node",
-    "surgical_injection_node"
+    "surgical_injection_node",
+    "rerender_deck"
 ]
@@ -8,6 +8,7 @@ from src.core.state import PPTState, ArchitecturePlan
 from pydantic import BaseModel, Field, ConfigDict
 import json
 from src.utils.auth_helper import get_llm
+from src.utils.llm_cache import with_response_validator
 
 # Slide role constants
 ROLE_TITLE = "TITLE"
@@ -28,7 +29,11 @@ def _get_llm():
     global _llm_instance
     if _llm_instance is None:
         llm_base = get_llm(deployment_name="gpt-4", temperature=0.2)
-        _llm_instance = llm_base.with_structured_output(ArchitecturePlan)
+        # Plans without slides are not cached, so a retry asks the model again
+        _llm_instance = with_response_validator(
+            llm_base.with_structured_output(ArchitecturePlan),
+            lambda plan: plan is not None and plan.slides,
+        )
     return _llm_instance
  
 def _map_purpose_to_role(purpose: str) -> str:
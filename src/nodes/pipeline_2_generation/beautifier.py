@@ -8,7 +8,9 @@ Now includes role-aware styling for improved presentation quality.
 import math
 from typing import List, Dict, Any, Optional
 from src.core.state import PPTState
-from src.config import FORCE_FONT_SIZE_LAYOUTS
+from src.config import FORCE_FONT_SIZE_LAYOUTS, TEXT_FIT_ENABLED
+from src.utils.registry_index import get_registry_index
+from src.utils.text_fit import fit_ellipse_font_size, fit_rect_font_size, paragraph_lengths, word_lengths
 
 # Slide role constants (must match architect.py and writer.py)
 ROLE_TITLE = "TITLE"
@@ -41,12 +43,19 @@ AREA_THRESHOLD_CONTENT = 0.15
 
 # --- Circular Text Fitting Constants ---
 TEXT_PADDING_RATIO = 0.1      # 10% padding inside circular shapes
-FONT_SIZE_RANGE = (8, 72)     # Min/max font sizes for binary search
-FIT_PRECISION = 0.5           # Binary search stops within 0.5pt
+FONT_SIZE_RANGE = (8, 72)     # Min/max font sizes (every whole size is evaluated)
 CHAR_WIDTH_RATIO = 0.6        # Average char width as ratio of font_size
 BOLD_WIDTH_MULTIPLIER = 1.1   # Bold text is ~10% wider
 LINE_HEIGHT_RATIO = 1.2       # Line height as ratio of font_size
 
+# Rectangular fitting (placeholders with registry font bounds)
+EMU_PER_PT = 12700
+DEFAULT_SLIDE_SIZE_EMU = (12192000, 6858000)             # 16:9, used when the registry has no slide_size
+DEFAULT_INSETS_EMU = (91440, 91440, 45720, 45720)        # left, right, top, bottom (PowerPoint defaults)
+BULLET_INDENT_PT = 27.0       # Hanging indent taken by the bullet character
+TEXT_FIT_POLICIES = ("shrink", "split_slide")
+MIN_FONT_SCALE = 25.0         # Lowest normAutofit fontScale written (percent)
+
 # --- Markdown Tokens ---
 MD_BOLD = "**"
 MD_ITALIC = "*"
@@ -232,82 +241,116 @@ def _estimate_text_dimensions(text: str, font_size: int, runs: List[Dict[str, An
     return (total_width, line_height)
 
 
-def _fit_text_in_circle(text: str, runs: List[Dict[str, Any]], radius: float, padding_ratio: float = TEXT_PADDING_RATIO) -> int:
+def _fit_text_in_circle(text: str, runs: List[Dict[str, Any]], radius: float, padding_ratio: float = TEXT_PADDING_RATIO,
+                        ellipse_axes: Optional[List[float]] = None) -> int:
     """
-    Binary search for largest font size that fits text inside a circle.
+    Largest font size that fits text inside a circle (or ellipse).
     
-    Uses chord-width constraints at each line's vertical position.
+    Uses chord-width constraints at each line's vertical position. Every whole
+    font size in FONT_SIZE_RANGE is evaluated at once (see src/utils/text_fit.py),
+    and results are cached per word-length sequence and geometry.
     
     Args:
         text: Full text content
         runs: Styled runs from markdown parsing
         radius: Circle radius (normalized 0.0-1.0)
         padding_ratio: Padding as ratio of radius
+        ellipse_axes: [rx, ry] semi-axes for non-circular ovals (overrides radius)
         
     Returns:
         Font size in points that fits, or minimum if none fit
     """
-    if not text or radius <= 0:
+    if ellipse_axes:
+        half_width, half_height = ellipse_axes
+    else:
+        half_width = half_height = radius
+    if not text or half_width <= 0 or half_height <= 0:
         return FONT_SIZE_RANGE[0]
     
     # Apply padding
-    effective_radius = radius * (1.0 - padding_ratio)
-    if effective_radius <= 0:
+    scale = 1.0 - padding_ratio
+    if scale <= 0:
         print(f"⚠️  [Beautifier Warning] Padding exceeds radius, using minimum font")
         return FONT_SIZE_RANGE[0]
     
-    min_font, max_font = FONT_SIZE_RANGE
-    best_fit = min_font
+    font_size = fit_ellipse_font_size(
+        word_lengths(text), half_width * scale, half_height * scale,
+        FONT_SIZE_RANGE, CHAR_WIDTH_RATIO, LINE_HEIGHT_RATIO
+    )
+    return FONT_SIZE_RANGE[0] if font_size is None else font_size
+
+
+def _fit_text_in_rect(paragraphs: List[str], slot: Dict[str, Any], slide_size: Optional[List[int]] = None,
+                      bulleted: bool = False) -> Optional[int]:
+    """
+    Largest font size within the slot's [min_font_pt, max_font_pt] at which the
+    paragraphs wrap inside the placeholder.
     
-    # Binary search for optimal font size
-    while max_font - min_font > FIT_PRECISION:
-        mid_font = (min_font + max_font) / 2.0
-        
-        # Estimate line height
-        line_height = (mid_font * LINE_HEIGHT_RATIO) / 720.0
-        
-        # Simple word wrapping with chord-width constraints
-        words = text.split()
-        lines = []
-        current_line = []
-        current_y = -effective_radius  # Start at top of circle
-        
-        fits = True
-        for word in words:
-            # Estimate word width
-            word_width = (len(word) + 1) * (mid_font * CHAR_WIDTH_RATIO) / 960.0  # +1 for space
-            
-            # Check if word fits on current line at current y-position
-            available_width = _calculate_chord_width(current_y + line_height/2, effective_radius)
-            
-            # Start new line if word doesn't fit
-            if current_line and sum(len(w) + 1 for w in current_line) * (mid_font * CHAR_WIDTH_RATIO) / 960.0 > available_width:
-                lines.append(" ".join(current_line))
-                current_line = [word]
-                current_y += line_height
-                
-                # Check if we've exceeded circle height
-                if current_y + line_height > effective_radius:
-                    fits = False
-                    break
-            else:
-                current_line.append(word)
-        
-        # Add final line
-        if current_line and fits:
-            lines.append(" ".join(current_line))
-            current_y += line_height
-            if current_y > effective_radius:
-                fits = False
+    The usable area is the slot geometry scaled to the slide size, minus the
+    text frame insets (and the bullet indent for bulleted text).
+    
+    Args:
+        paragraphs: One string per paragraph (or bullet)
+        slot: Slot metadata from the registry
+        slide_size: [width, height] of the slides in EMU (16:9 when unknown)
+        bulleted: Whether each paragraph carries a bullet
         
-        # Update binary search bounds
-        if fits:
-            best_fit = mid_font
-            min_font = mid_font
-        else:
-            max_font = mid_font
+    Returns:
+        Font size in points; min_font_pt if even that overflows; None when the
+        slot has no geometry or font bounds
+    """
+    geometry = slot.get('geometry') or {}
+    min_font, max_font = slot.get('min_font_pt'), slot.get('max_font_pt')
+    if not geometry.get('norm_width') or not geometry.get('norm_height') or not min_font or not max_font:
+        return None
     
-    return int(best_fit)
+    formatting = slot.get('template_formatting') or {}
+    slide_width, slide_height = slide_size or DEFAULT_SLIDE_SIZE_EMU
+    insets = [
+        default if formatting.get(key) is None else formatting[key]
+        for key, default in zip(("margin_left", "margin_right", "margin_top", "margin_bottom"), DEFAULT_INSETS_EMU)
+    ]
+    width_pt = (geometry['norm_width'] * slide_width - insets[0] - insets[1]) / EMU_PER_PT
+    height_pt = (geometry['norm_height'] * slide_height - insets[2] - insets[3]) / EMU_PER_PT
+    if bulleted:
+        width_pt -= BULLET_INDENT_PT
+    if width_pt <= 0 or height_pt <= 0:
+        return min_font
+    
+    font_size = fit_rect_font_size(
+        paragraph_lengths(paragraphs), round(width_pt, 2), round(height_pt, 2),
+        (min(min_font, max_font), max_font), CHAR_WIDTH_RATIO, LINE_HEIGHT_RATIO
+    )
+    return min_font if font_size is None else font_size
+
+
+def _autofit_for_slot(fitted: int, slot: Dict[str, Any], font_size: Optional[int]) -> tuple:
+    """
+    Turn a fitted size into (font_size, autofit) for the IR.
+    
+    Template sizes are kept and shrunk with normAutofit's fontScale, so the deck
+    opens already fitted and still follows the master. Without a known template
+    size the fitted size is written explicitly; forced sizes are only lowered.
+    
+    Returns:
+        (font_size, autofit) where autofit is None when the text fits as-is, else
+        {"fitted_font_pt": int, "font_scale": percent or None}
+    """
+    if font_size is not None:
+        if fitted >= font_size:
+            return font_size, None
+        return fitted, {"fitted_font_pt": fitted, "font_scale": None}
+    
+    reference = (slot.get('template_formatting') or {}).get('default_font_size_pt')
+    if reference:
+        if fitted >= reference:
+            return None, None
+        scale = max(MIN_FONT_SCALE, round(fitted / reference * 100, 1))
+        return None, {"fitted_font_pt": fitted, "font_scale": scale}
+    
+    if fitted >= slot.get('max_font_pt', fitted):
+        return None, None
+    return fitted, {"fitted_font_pt": fitted, "font_scale": None}
 
 
 def _determine_font_size(role_hint: str, area_ratio: float, slide_role: str = ROLE_CONTENT) -> int:
@@ -387,7 +430,8 @@ def _beautify_semantic_content(
     layout: dict,
     slide_role: str,
     slide_idx: int,
-    semantic_mapping: dict
+    semantic_mapping: dict,
+    slide_size: Optional[List[int]] = None
 ) -> dict:
     """
     Convert semantic content (title, bullets, body) into styled-run format.
@@ -400,6 +444,7 @@ def _beautify_semantic_content(
         slide_role: Slide role (TITLE, AGENDA, CONTENT, etc.)
         slide_idx: Slide index for logging
         semantic_mapping: Slot metadata by semantic role
+        slide_size: [width, height] of the slides in EMU (for text fitting)
         
     Returns:
         Dict in slot_id format with styled runs (same as legacy path output)
@@ -478,6 +523,23 @@ def _beautify_semantic_content(
                 "semantic_role": semantic_role
             }
         
+        # Fit the rendered text (markdown markers stripped) to the placeholder
+        # within the registry's font bounds
+        if TEXT_FIT_ENABLED and slot.get('overflow_policy') in TEXT_FIT_POLICIES:
+            formatting = slot.get('template_formatting') or {}
+            if 'SHAPE_TO_FIT_TEXT' not in str(formatting.get('auto_size')):
+                style = styled_content[str(slot_id)]
+                if "bullets" in style:
+                    paragraphs = ["".join(r["text"] for r in item["runs"]) for item in style["bullets"]]
+                else:
+                    paragraphs = "".join(r["text"] for r in style["runs"]).split("\n")
+                fitted = _fit_text_in_rect(paragraphs, slot, slide_size, bulleted="bullets" in style)
+                if fitted is not None:
+                    style["font_size"], autofit = _autofit_for_slot(fitted, slot, font_size)
+                    if autofit:
+                        style["autofit"] = autofit
+                        print(f"--- Text fit: Slot {slot_id} ({semantic_role}) → {fitted}pt")
+        
         # Add vertical anchor for title slides
         if slide_role == ROLE_TITLE and semantic_role == 'title':
             styled_content[str(slot_id)]["vertical_anchor"] = "MIDDLE"
@@ -518,15 +580,15 @@ def beautifier_node(state: PPTState) -> Dict[str, Any]:
     default_layout = layouts[0]
     beautified = []
     
-    # Build layout lookup for performance (O(1) access)
-    layout_by_idx = {l["layout_index"]: l for l in layouts}
+    # Precomputed layout/slot lookups (cached per registry, O(1) access)
+    registry_index = get_registry_index(registry)
     
     for slide_idx, slide in enumerate(manifest):
         layout_idx = slide.get("layout_index")
         slide_role = slide.get("slide_role", ROLE_CONTENT)  # Get slide role from manifest
         
         # Find layout with soft failure handling
-        layout = layout_by_idx.get(layout_idx)
+        layout = registry_index.layout(layout_idx)
         
         if layout is None:
             # Soft failure: fallback + audit trail
@@ -559,7 +621,8 @@ def beautifier_node(state: PPTState) -> Dict[str, Any]:
                 layout=layout,
                 slide_role=slide_role,
                 slide_idx=slide_idx,
-                semantic_mapping=slide.get("_semantic_mapping", {})
+                semantic_mapping=slide.get("_semantic_mapping", {}),
+                slide_size=registry.get("slide_size")
             )
             
             beautified.append({
@@ -572,18 +635,10 @@ def beautifier_node(state: PPTState) -> Dict[str, Any]:
             continue  # Skip to next slide
         
         # LEGACY SLOT_ID-BASED CONTENT: Apply styling as before
-        # Build slot metadata lookup for performance (O(1) access)
-        slots_meta = layout.get("slots", []) or []
-        slot_meta_by_id = {}
-        for sm in slots_meta:
-            sid = _safe_int(sm.get("slot_id"))
-            if sid is not None:
-                slot_meta_by_id[sid] = sm
-        
         for slot_key, raw_text in slide_content.items():
             # Normalize slot key to int for metadata lookup
             slot_id_int = _safe_int(slot_key)
-            slot_meta = slot_meta_by_id.get(slot_id_int)
+            slot_meta = registry_index.slot(layout_idx, slot_id_int)
             
             # Handle None text (convert to empty string, not "None")
             text_str = "" if raw_text is None else str(raw_text)
@@ -611,8 +666,10 @@ def beautifier_node(state: PPTState) -> Dict[str, Any]:
                 if is_circular:
                     radius = geometry.get("radius")
                     if radius and radius > 0:
-                        # Use circular text fitting with chord-width constraints
-                        font_size = _fit_text_in_circle(text_str, runs, radius)
+                        # Use circular/elliptical text fitting with chord-width constraints
+                        font_size = _fit_text_in_circle(
+                            text_str, runs, radius, ellipse_axes=geometry.get("ellipse_axes")
+                        )
                         print(
                             f"--- Circular fit: Slot {slot_key} → {font_size}pt "
                             f"(radius={radius:.3f})"
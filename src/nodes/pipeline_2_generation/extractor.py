@@ -4,10 +4,237 @@ Responsibility: Ingest any input format → produce raw semantic content
 Supports: .docx, .pptx, .txt, raw text
 """
 import os
+import re
+import hashlib
+import json
+import itertools
+import posixpath
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from lxml import etree
 from docx import Document
 from pptx import Presentation
 from src.utils.auth_helper import get_llm
 from src.core.state import PPTState
+from src.utils.llm_cache import SqliteCache, get_content_cache
+from src.config import (
+    EXTRACTOR_SINGLE_PASS_TOKENS,
+    EXTRACTOR_CHUNK_TOKENS,
+    EXTRACTOR_MAX_CONCURRENCY,
+    CONTENT_CACHE_ENABLED,
+    CONTENT_CACHE_MAX_TEXT_MB,
+)
+
+# Bump whenever the map or content-map prompts change so cached content maps are not reused
+EXTRACTOR_PROMPT_VERSION = "1"
+
+# Rough token estimate (≈4 characters per token for English prose)
+CHARS_PER_TOKEN = 4
+
+# Lines that look like headings: markdown/numbered headings or short lines without end punctuation
+HEADING_PATTERN = re.compile(r"^(#{1,6}\s|\d+(\.\d+)*[.)]?\s+[A-Z]|[A-Z][A-Z0-9 &/,-]{2,}$)")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+CONTENT_MAP_AREAS = """1. **Vision**: Overarching goals and mission
+2. **Problem**: Specific challenges and pain points being addressed
+3. **Solution**: Proposed approach and key features
+4. **Technical Details**: Architecture, specifications, implementation details
+5. **Milestones**: Roadmap, timeline, next steps"""
+
+
+# OOXML namespaces used by the streaming extractors
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Damaged packages: missing parts, bad zip entries, malformed XML
+_STREAM_ERRORS = (KeyError, zipfile.BadZipFile, zlib.error, etree.XMLSyntaxError)
+
+
+def _release(elem):
+    """Free a processed element and its already-processed siblings (bounded memory)."""
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _docx_run_text(run) -> str:
+    """Text of a w:r element, matching python-docx Run.text."""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == f"{{{W_NS}}}t":
+            parts.append(child.text or "")
+        elif tag in (f"{{{W_NS}}}tab", f"{{{W_NS}}}ptab"):
+            parts.append("\t")
+        elif tag == f"{{{W_NS}}}br":
+            if child.get(f"{{{W_NS}}}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == f"{{{W_NS}}}cr":
+            parts.append("\n")
+        elif tag == f"{{{W_NS}}}noBreakHyphen":
+            parts.append("-")
+    return "".join(parts)
+
+
+def _iter_docx_paragraphs(file_path: str) -> Iterator[str]:
+    """Stream body-level paragraph text from word/document.xml."""
+    body_tag = f"{{{W_NS}}}body"
+    run_tag = f"{{{W_NS}}}r"
+    hyperlink_tag = f"{{{W_NS}}}hyperlink"
+    
+    with zipfile.ZipFile(file_path) as zf, zf.open("word/document.xml") as xml:
+        for _, elem in etree.iterparse(xml, events=("end",), tag=(f"{{{W_NS}}}p", f"{{{W_NS}}}tbl")):
+            parent = elem.getparent()
+            if parent is None or parent.tag != body_tag:
+                continue  # Paragraphs inside tables are released with their table
+            if elem.tag == f"{{{W_NS}}}p":
+                parts = []
+                for child in elem:
+                    if child.tag == run_tag:
+                        parts.append(_docx_run_text(child))
+                    elif child.tag == hyperlink_tag:
+                        parts.extend(_docx_run_text(r) for r in child.iterchildren(run_tag))
+                text = "".join(parts)
+                if text.strip():
+                    yield text
+            _release(elem)
+
+
+def _pptx_slide_partnames(zf: zipfile.ZipFile) -> List[str]:
+    """Slide part names in presentation order (sldIdLst → presentation rels)."""
+    rels = etree.fromstring(zf.read("ppt/_rels/presentation.xml.rels"))
+    targets = {
+        rel.get("Id"): rel.get("Target")
+        for rel in rels.iterchildren(f"{{{PKG_REL_NS}}}Relationship")
+    }
+    presentation = etree.fromstring(zf.read("ppt/presentation.xml"))
+    partnames = []
+    for sld_id in presentation.iterfind(f"{{{P_NS}}}sldIdLst/{{{P_NS}}}sldId"):
+        target = targets.get(sld_id.get(f"{{{R_NS}}}id"))
+        if target:
+            partnames.append(target.lstrip("/") if target.startswith("/") else posixpath.normpath(f"ppt/{target}"))
+    return partnames
+
+
+def _pptx_paragraph_text(paragraph) -> str:
+    """Text of an a:p element, matching python-pptx _Paragraph.text."""
+    parts = []
+    for child in paragraph:
+        if child.tag in (f"{{{A_NS}}}r", f"{{{A_NS}}}fld"):
+            t = child.find(f"{{{A_NS}}}t")
+            parts.append(t.text or "" if t is not None else "")
+        elif child.tag == f"{{{A_NS}}}br":
+            parts.append("\v")
+    return "".join(parts)
+
+
+def _iter_slide_shape_text(zf: zipfile.ZipFile, partname: str) -> Iterator[str]:
+    """Stream top-level shape text from one slide part."""
+    sp_tree_tag = f"{{{P_NS}}}spTree"
+    tx_body_path = f"{{{P_NS}}}txBody"
+    
+    with zf.open(partname) as xml:
+        for _, elem in etree.iterparse(xml, events=("end",), tag=f"{{{P_NS}}}sp"):
+            parent = elem.getparent()
+            if parent is None or parent.tag != sp_tree_tag:
+                continue  # Grouped shapes have no .text in python-pptx either
+            tx_body = elem.find(tx_body_path)
+            if tx_body is not None:
+                text = "\n".join(
+                    _pptx_paragraph_text(p) for p in tx_body.iterchildren(f"{{{A_NS}}}p")
+                )
+                if text.strip():
+                    yield text
+            _release(elem)
+
+
+def _iter_pptx_shape_text(file_path: str) -> Iterator[str]:
+    """
+    Stream top-level shape text from ppt/slides/slide*.xml, in slide order.
+    
+    A damaged slide part is logged and skipped (text already read from it is kept),
+    so one bad slide does not lose the rest of the deck.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        for partname in _pptx_slide_partnames(zf):
+            try:
+                yield from _iter_slide_shape_text(zf, partname)
+            except _STREAM_ERRORS as e:
+                print(f"⚠️  Extractor: skipping unreadable slide {partname} ({type(e).__name__}: {e})")
+
+
+def _extract_text_object_model(file_path: str) -> str:
+    """
+    Object-model extraction via python-docx / python-pptx.
+    Fallback for packages the streaming parser cannot read.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    
+    if ext == ".docx":
+        doc = Document(file_path)
+        return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+    
+    prs = Presentation(file_path)
+    text = []
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and shape.text.strip():
+                text.append(shape.text)
+    return "\n".join(text)
+
+
+def iter_text_from_file(file_path: str) -> Iterator[str]:
+    """
+    Lazily yields text blocks (paragraphs / shape texts / lines) from a supported file.
+    
+    .docx and .pptx are streamed straight from the zip with lxml iterparse, so memory
+    stays bounded and downstream chunking can start before extraction finishes.
+    Packages the streaming parser cannot read fall back to python-docx/python-pptx;
+    if the stream breaks after yielding text, the text read so far is kept.
+    
+    Args:
+        file_path: Path to .docx, .pptx, or .txt file
+        
+    Yields:
+        Text blocks in document order (empty .docx/.pptx blocks are skipped)
+        
+    Raises:
+        ValueError: If file type is not supported
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    
+    if ext in (".docx", ".pptx"):
+        stream = _iter_docx_paragraphs(file_path) if ext == ".docx" else _iter_pptx_shape_text(file_path)
+        yielded = False
+        try:
+            for block in stream:
+                yielded = True
+                yield block
+        except _STREAM_ERRORS as e:
+            if yielded:
+                # Re-reading with the object model would repeat the blocks already yielded
+                print(f"⚠️  Extractor: streaming parse stopped early ({type(e).__name__}: {e}), keeping text read so far")
+                return
+            print(f"⚠️  Extractor: streaming parse failed ({e}), using object model")
+            text = _extract_text_object_model(file_path)
+            if text:
+                yield text
+        return
+    
+    if ext == ".txt":
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield line.rstrip("\n")
+        return
+    
+    raise ValueError(f"Unsupported file type: {ext}. Supported formats: .docx, .pptx, .txt")
 
 
 def extract_text_from_file(file_path: str) -> str:
@@ -25,24 +252,211 @@ def extract_text_from_file(file_path: str) -> str:
     """
     ext = os.path.splitext(file_path)[1].lower()
     
-    if ext == ".docx":
-        doc = Document(file_path)
-        return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-    
-    if ext == ".pptx":
-        prs = Presentation(file_path)
-        text = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    text.append(shape.text)
-        return "\n".join(text)
-    
     if ext == ".txt":
         with open(file_path, "r", encoding="utf-8") as f:
             return f.read()
     
-    raise ValueError(f"Unsupported file type: {ext}. Supported formats: .docx, .pptx, .txt")
+    return "\n".join(iter_text_from_file(file_path))
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for chunk budgeting (no tokenizer dependency)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _is_heading(paragraph: str) -> bool:
+    """Heuristic heading detection for chunk boundary preference."""
+    stripped = paragraph.strip()
+    if not stripped or len(stripped) > 80:
+        return False
+    return bool(HEADING_PATTERN.match(stripped)) or not stripped.endswith((".", ":", ";", ",", "!", "?"))
+
+
+def _split_oversized(paragraph: str, token_budget: int) -> List[str]:
+    """Split a single paragraph that exceeds the budget on sentence boundaries."""
+    pieces, current = [], ""
+    for sentence in SENTENCE_SPLIT.split(paragraph):
+        candidate = f"{current} {sentence}".strip() if current else sentence
+        if current and _estimate_tokens(candidate) > token_budget:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    # Sentence-free walls of text: hard split by characters
+    max_chars = token_budget * CHARS_PER_TOKEN
+    return [p[i:i + max_chars] for p in pieces for i in range(0, len(p), max_chars)]
+
+
+def chunk_paragraphs(paragraphs: Iterable[str], token_budget: int = EXTRACTOR_CHUNK_TOKENS) -> Iterator[str]:
+    """
+    Group paragraphs into chunks of at most token_budget tokens.
+    
+    Chunks break on paragraph boundaries and, once a chunk is at least half full,
+    preferentially right before a heading, so an edit to one section leaves the
+    boundaries (and cached summaries) of other sections intact.
+    
+    Args:
+        paragraphs: Iterable of paragraph strings (may be a lazy generator)
+        token_budget: Maximum estimated tokens per chunk
+        
+    Yields:
+        Chunk text with paragraphs joined by newlines
+    """
+    current: List[str] = []
+    current_tokens = 0
+    
+    for paragraph in paragraphs:
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        tokens = _estimate_tokens(paragraph)
+        
+        if tokens > token_budget:
+            if current:
+                yield "\n".join(current)
+                current, current_tokens = [], 0
+            yield from _split_oversized(paragraph, token_budget)
+            continue
+        
+        starts_section = _is_heading(paragraph) and current_tokens >= token_budget // 2
+        if current and (current_tokens + tokens > token_budget or starts_section):
+            yield "\n".join(current)
+            current, current_tokens = [], 0
+        
+        current.append(paragraph)
+        current_tokens += tokens
+    
+    if current:
+        yield "\n".join(current)
+
+
+def _summarize_chunk(chunk: str) -> str:
+    """
+    Map step: condense one chunk into notes for the content map areas.
+    The prompt is position-independent so an unchanged chunk hits the LLM cache.
+    """
+    llm = get_llm(deployment_name="gpt-4", temperature=0)
+    prompt = f"""
+Extract the key facts from this section of a longer document. Organize your notes under
+whichever of these areas the section covers (omit areas it does not mention):
+
+{CONTENT_MAP_AREAS}
+
+Keep concrete names, numbers, dates and decisions. Be concise; do not invent content.
+
+SECTION:
+{chunk}
+"""
+    return llm.invoke(prompt).content
+
+
+def _map_chunks(paragraphs: Iterable[str]) -> Tuple[str, int]:
+    """
+    One map level: chunk the paragraph stream and summarize chunks in parallel.
+    
+    Chunks are submitted as soon as they are cut, so summarizing overlaps with
+    reading a streamed file. Returns the joined notes and the input size in chars.
+    """
+    consumed = 0
+    
+    def counted(items):
+        nonlocal consumed
+        for item in items:
+            consumed += len(item) + 1
+            yield item
+    
+    with ThreadPoolExecutor(max_workers=max(1, EXTRACTOR_MAX_CONCURRENCY), thread_name_prefix="extractor") as pool:
+        futures = [
+            pool.submit(_summarize_chunk, chunk)
+            for chunk in chunk_paragraphs(counted(paragraphs), EXTRACTOR_CHUNK_TOKENS)
+        ]
+        summaries = [future.result() for future in futures]
+    return "\n\n".join(summaries), consumed
+
+
+def _summarize_long_text(paragraphs: Iterable[str]) -> str:
+    """
+    Map-reduce summarization for documents that do not fit a single prompt.
+    
+    Chunks are summarized in parallel; if the combined notes are still too long
+    they are chunked and summarized again until they fit one reduce prompt.
+    Accepts a lazy paragraph stream (see iter_text_from_file) or a string.
+    """
+    if isinstance(paragraphs, str):
+        paragraphs = paragraphs.split("\n")
+    level = 1
+    notes, consumed = _map_chunks(paragraphs)
+    print(f"--- Extractor: Map level {level}: {consumed} chars → {len(notes)} chars of notes ---")
+    while _estimate_tokens(notes) > EXTRACTOR_SINGLE_PASS_TOKENS and len(notes) < consumed:
+        level += 1
+        reduced, consumed = _map_chunks(notes.split("\n"))
+        print(f"--- Extractor: Map level {level}: {consumed} chars → {len(reduced)} chars of notes ---")
+        # Stop once summaries no longer shrink the notes instead of looping forever
+        notes = reduced
+    return notes
+
+
+class _TextRecorder:
+    """
+    Keeps a copy of streamed blocks for the text cache, up to max_chars.
+    
+    Past the limit the copy is dropped and recording stops, so a huge file never
+    sits in memory next to the map-reduce pipeline just to be cached.
+    """
+    
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.blocks: List[str] = []
+        self.chars = 0
+        self.overflowed = False
+    
+    def record(self, blocks: Iterable[str]) -> Iterator[str]:
+        """Pass blocks through while keeping a copy."""
+        for block in blocks:
+            if not self.overflowed:
+                self.chars += len(block) + 1
+                if self.chars > self.max_chars:
+                    self.overflowed = True
+                    self.blocks = []
+                else:
+                    self.blocks.append(block)
+            yield block
+    
+    def text(self) -> Optional[str]:
+        """The recorded text, or None if it outgrew max_chars."""
+        return None if self.overflowed else "\n".join(self.blocks)
+
+
+def _read_within_budget(blocks: Iterator[str], token_budget: int) -> Tuple[List[str], bool]:
+    """Pull blocks until the token budget is exceeded; returns (blocks read, exceeded)."""
+    head = []
+    tokens = 0
+    for block in blocks:
+        head.append(block)
+        tokens += _estimate_tokens(block) + 1
+        if tokens > token_budget:
+            return head, True
+    return head, False
+
+
+def _content_cache() -> Optional[SqliteCache]:
+    """Content-addressed cache of extracted text and content maps (None when disabled)."""
+    return get_content_cache() if CONTENT_CACHE_ENABLED else None
+
+
+def _source_digest(raw_input: str, is_file: bool) -> str:
+    """SHA-256 of the input file's bytes (plus extension) or of the raw text."""
+    digest = hashlib.sha256()
+    if is_file:
+        digest.update(os.path.splitext(raw_input)[1].lower().encode("utf-8") + b"\0")
+        with open(raw_input, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    else:
+        digest.update(b"text\0" + raw_input.encode("utf-8"))
+    return digest.hexdigest()
 
 
 def extract_context_node(state: PPTState):
@@ -57,17 +471,61 @@ def extract_context_node(state: PPTState):
     - Solution
     - Technical Details
     - Milestones
+    
+    Results are cached by input hash: a repeat input skips the LLM call, and a repeat
+    file after a prompt version bump still skips parsing.
     """
     raw_input = state["raw_docs"]
+    is_file = isinstance(raw_input, str) and os.path.exists(raw_input)
+    
+    cache = _content_cache()
+    digest = _source_digest(raw_input, is_file) if cache is not None else None
+    map_key = f"content_map:{EXTRACTOR_PROMPT_VERSION}:{digest}"
+    text_key = f"text:{digest}"
+    
+    if cache is not None:
+        cached = cache.get(map_key)
+        if cached is not None:
+            content_map = json.loads(cached)["content_map"]
+            print(f"--- Extractor: Content map served from cache ({len(content_map)} chars) ---")
+            return {"content_map": content_map}
+    
+    cached_text = cache.get(text_key) if cache is not None and is_file else None
     
     # Detect file path vs raw text
-    if isinstance(raw_input, str) and os.path.exists(raw_input):
-        print(f"--- Extractor: Reading file {os.path.basename(raw_input)} ---")
-        text = extract_text_from_file(raw_input)
-        print(f"--- Extractor: Extracted {len(text)} characters from file ---")
+    if is_file and cached_text is None:
+        print(f"--- Extractor: Streaming file {os.path.basename(raw_input)} ---")
+        blocks = iter_text_from_file(raw_input)
+        recorder = None
+        if cache is not None:
+            recorder = _TextRecorder(int(CONTENT_CACHE_MAX_TEXT_MB * 1024 * 1024))
+            blocks = recorder.record(blocks)
+        head, exceeded = _read_within_budget(blocks, EXTRACTOR_SINGLE_PASS_TOKENS)
+        if exceeded:
+            # Long file: chunk summaries start while the rest is still being read
+            text = _summarize_long_text(itertools.chain(head, blocks))
+            print(f"--- Extractor: Reduced long document to {len(text)} chars of notes ---")
+        else:
+            text = "\n".join(head)
+            print(f"--- Extractor: Extracted {len(text)} characters from file ---")
+        if recorder is not None:
+            recorded = recorder.text()
+            if recorded is None:
+                print(f"--- Extractor: Text over {CONTENT_CACHE_MAX_TEXT_MB:g} MB, not text-cached ---")
+            else:
+                cache.set(text_key, recorded.encode("utf-8"))
     else:
-        text = raw_input
-        print(f"--- Extractor: Processing raw text input ({len(text)} chars) ---")
+        if cached_text is not None:
+            text = cached_text.decode("utf-8")
+            print(f"--- Extractor: Extracted text served from cache ({len(text)} chars) ---")
+        else:
+            text = raw_input
+            print(f"--- Extractor: Processing raw text input ({len(text)} chars) ---")
+        
+        # Long documents: map-reduce into section notes first (latency ~ slowest chunk)
+        if _estimate_tokens(text) > EXTRACTOR_SINGLE_PASS_TOKENS:
+            text = _summarize_long_text(text)
+            print(f"--- Extractor: Reduced long document to {len(text)} chars of notes ---")
     
     llm = get_llm(deployment_name="gpt-4", temperature=0)
     
@@ -75,11 +533,7 @@ def extract_context_node(state: PPTState):
 Analyze the following documentation and produce a structured content map.
 
 Your analysis should cover these key areas:
-1. **Vision**: Overarching goals and mission
-2. **Problem**: Specific challenges and pain points being addressed
-3. **Solution**: Proposed approach and key features
-4. **Technical Details**: Architecture, specifications, implementation details
-5. **Milestones**: Roadmap, timeline, next steps
+{CONTENT_MAP_AREAS}
 
 DOCUMENTATION:
 {text}
@@ -91,4 +545,7 @@ from vision through technical execution. This will be used to generate presentat
     response = llm.invoke(prompt)
     print(f"--- Extractor: Generated content map ({len(response.content)} chars) ---")
     
+    if cache is not None:
+        cache.set(map_key, json.dumps({"content_map": response.content}).encode("utf-8"))
+    
     return {"content_map": response.content}
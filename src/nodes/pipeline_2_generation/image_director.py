@@ -5,6 +5,7 @@ Does NOT retrieve actual images, only creates specifications
 """
 from src.core.state import PPTState, BackgroundImageSpec
 from typing import Dict, Any
+from src.utils.registry_index import get_registry_index
 
 # Slide role constants (must match architect.py, writer.py, beautifier.py)
 ROLE_TITLE = "TITLE"
@@ -151,9 +152,8 @@ def image_director_node(state: PPTState) -> Dict[str, Any]:
     slide_plans = state.get("slide_plans", [])
     registry = state.get("registry", {})
     
-    # Build layout lookup to check supports_background_image
-    layouts = registry.get("layouts", [])
-    layout_by_idx = {l["layout_index"]: l for l in layouts}
+    # Precomputed layout lookup to check supports_background_image
+    registry_index = get_registry_index(registry)
     
     enriched_manifest = []
     
@@ -166,7 +166,7 @@ def image_director_node(state: PPTState) -> Dict[str, Any]:
         slide_intent = slide_plan.get("slide_intent", "")
         
         # Check if layout supports background images
-        layout = layout_by_idx.get(layout_idx, {})
+        layout = registry_index.layout(layout_idx) or {}
         layout_supports = layout.get("supports_background_image", False)
         
         # Determine if this slide should have a background
@@ -15,8 +15,15 @@ from pptx.enum.shapes import MSO_SHAPE
 from typing import Optional, Any, Dict, List
 from pptx.dml.color import RGBColor
 from src.core.state import PPTState, BackgroundImageSpec
-from src.utils.ppt_helper import find_placeholder_by_id
-from src.config import ENABLE_AUTOFIT_ROLES
+from src.utils.ppt_helper import find_placeholder_by_id, PlaceholderIndex, set_norm_autofit
+from src.utils.template_pool import TemplatePool
+from src.utils.slide_compiler import SlideCompiler, fill_text_body, has_text_content
+from src.utils.deck_writer import save_presentation
+from src.utils.deck_slimmer import slim_presentation
+from src.config import (
+    ENABLE_AUTOFIT_ROLES, COMPILED_SLIDE_RENDERER, PASSTHROUGH_DECK_WRITER, DECK_COMPRESSLEVEL, SLIM_OUTPUT_DECKS
+)
+import io
 import os
 import re
 
@@ -161,7 +168,8 @@ Future: Replace with actual image using keywords above
     print(f"  ✓ Background applied: {slide_role} gradient with {overlay_opacity:.0%} overlay")
 
 
-def find_placeholder_by_semantic_role(slide, semantic_role: str, slot_metadata: List[Dict]) -> Optional[Any]:
+def find_placeholder_by_semantic_role(slide, semantic_role: str, slot_metadata: List[Dict],
+                                     index: Optional[PlaceholderIndex] = None) -> Optional[Any]:
     """
     Find placeholder using semantic role with 3-tier fallback strategy.
     
@@ -177,6 +185,7 @@ def find_placeholder_by_semantic_role(slide, semantic_role: str, slot_metadata:
         slide: The slide object to search
         semantic_role: The semantic role to find (title, bullets, body, image_query, footer)
         slot_metadata: List of slot dicts with stable identity fields
+        index: PlaceholderIndex for the slide (built here if not supplied)
         
     Returns:
         Placeholder shape or None if not found
@@ -190,201 +199,181 @@ def find_placeholder_by_semantic_role(slide, semantic_role: str, slot_metadata:
     # Use the first matching slot (most layouts have one of each semantic role)
     target_slot = matching_slots[0]
     
+    if index is None:
+        index = PlaceholderIndex(slide)
+    
     # Tier 1: Try placeholder_idx (most reliable)
     placeholder_idx = target_slot.get('placeholder_idx')
     if placeholder_idx is not None:
-        try:
-            for shape in slide.placeholders:
-                if hasattr(shape, 'placeholder_format'):
-                    if shape.placeholder_format.idx == placeholder_idx:
-                        return shape
-        except Exception:
-            pass
+        shape = index.get(placeholder_idx)
+        if shape is not None:
+            return shape
     
     # Tier 2: Try placeholder_type (e.g., "TITLE (1)", "BODY (2)")
     placeholder_type = target_slot.get('placeholder_type', '')
     if placeholder_type:
         # Extract the type name (e.g., "TITLE" from "TITLE (1)")
         type_name = placeholder_type.split('(')[0].strip() if '(' in placeholder_type else placeholder_type
-        try:
-            for shape in slide.placeholders:
-                if hasattr(shape, 'placeholder_format'):
-                    shape_type_str = str(shape.placeholder_format.type)
-                    if type_name in shape_type_str:
-                        return shape
-        except Exception:
-            pass
+        shape = index.by_type(type_name)
+        if shape is not None:
+            return shape
     
     # Tier 3: Try placeholder_name ("Title 1", "Content Placeholder 2", etc.)
     placeholder_name = target_slot.get('placeholder_name')
     if placeholder_name:
-        try:
-            for shape in slide.placeholders:
-                if hasattr(shape, 'name') and shape.name == placeholder_name:
-                    return shape
-        except Exception:
-            pass
+        return index.named(placeholder_name)
     
     return None
 
 
-def surgical_injection_node(state: PPTState):
+def _save_deck(prs, file, primary_master_path: str):
+    """Save prs to a path or binary stream (passthrough writer when enabled)."""
+    if PASSTHROUGH_DECK_WRITER:
+        # Unchanged master parts (media, layouts, theme) are copied without recompressing
+        saved = save_presentation(prs, file, TemplatePool.archive(primary_master_path), DECK_COMPRESSLEVEL)
+        print(f"  Deck writer: {saved['copied']} master entries copied, {saved['written']} written")
+    else:
+        prs.save(file)
+
+
+def render_slide(prs, slide_def: Dict[str, Any], i: int, compiler: Optional[SlideCompiler] = None):
     """
-    Pipeline 2 – Final Node
-    Deterministic PPTX renderer with SEMANTIC MAPPING.
+    Append one manifest entry to prs as a new slide and fill its placeholders.
     
-    Maps semantic content (title, bullets, body, image_query) to placeholders
-    using stable identity (placeholder_idx, type, name) instead of arbitrary slot IDs.
-    
-    This prevents overlap bugs caused by LLM-generated slot IDs not matching
-    PowerPoint's actual placeholder indices.
+    Args:
+        prs: Presentation to add the slide to
+        slide_def: Beautified manifest entry (layout_index, content, background_image, ...)
+        i: Position of the slide in the manifest (for logs)
+        compiler: SlideCompiler for prs when the compiled renderer is enabled
     
-    Features:
-    - Semantic-to-placeholder mapping with 3-tier fallback
-    - Renders role-based background gradients for enabled slides
-    - Filters template header text intelligently  
-    - Applies white text on backgrounds for readability
+    Returns:
+        The new python-pptx Slide
     """
-    primary_master_path = state["primary_master_path"]
-    manifest = state["manifest"]
-    
-    prs = Presentation(primary_master_path)
-    print(f"--- Injector: Rendering {len(manifest)} slides ---")
-    
-    for i, slide_def in enumerate(manifest):
-        layout_idx = slide_def["layout_index"]
-        semantic_content = slide_def["content"]  # Now contains semantic fields, not slot_id-based
-        background_spec = slide_def.get("background_image", {})
-        slide_role = slide_def.get("slide_role", "CONTENT")
-        semantic_mapping = slide_def.get("_semantic_mapping", {})  # Slot metadata from Writer
-        
-        # Add slide with specified layout
+    layout_idx = slide_def["layout_index"]
+    semantic_content = slide_def["content"]  # Now contains semantic fields, not slot_id-based
+    background_spec = slide_def.get("background_image", {})
+    slide_role = slide_def.get("slide_role", "CONTENT")
+    semantic_mapping = slide_def.get("_semantic_mapping", {})  # Slot metadata from Writer
+    
+    # Add slide with specified layout
+    if compiler is not None:
+        compiled = compiler.add_slide(layout_idx)
+        slide = compiled.slide
+    else:
+        compiled = None
         layout = prs.slide_layouts[layout_idx]
         slide = prs.slides.add_slide(layout)
+    
+    # One scan; every slot lookup below is O(1) (compiled semantic slides bind slots directly)
+    if compiled is not None and slide_def.get("_is_semantic", False):
+        placeholders = None
+    else:
+        placeholders = PlaceholderIndex(slide)
+    
+    # Apply background gradient FIRST (before content, so it's behind everything)
+    has_background = background_spec.get("enabled", False)
+    if has_background:
+        _add_background_gradient(slide, background_spec, slide_role)
+    
+    # Track which semantic fields were successfully rendered
+    rendered_fields = []
+    
+    # Check if content is semantic (new) or slot_id-based (legacy for Beautifier)
+    # Semantic content NOW has styled runs from Beautifier (not raw text)
+    is_semantic = slide_def.get("_is_semantic", False)
+    
+    if is_semantic:
+        # NEW SEMANTIC MAPPING APPROACH (with styled runs from Beautifier)
+        # Beautifier now provides styled runs in slot_id format
         
-        # Apply background gradient FIRST (before content, so it's behind everything)
-        has_background = background_spec.get("enabled", False)
-        if has_background:
-            _add_background_gradient(slide, background_spec, slide_role)
-        
-        # Track which semantic fields were successfully rendered
-        rendered_fields = []
-        
-        # Check if content is semantic (new) or slot_id-based (legacy for Beautifier)
-        # Semantic content NOW has styled runs from Beautifier (not raw text)
-        is_semantic = slide_def.get("_is_semantic", False)
+        # Log content count for debugging empty slides
+        print(f"  Slide {i+1}: Processing {len(semantic_content)} semantic slots")
         
-        if is_semantic:
-            # NEW SEMANTIC MAPPING APPROACH (with styled runs from Beautifier)
-            # Beautifier now provides styled runs in slot_id format
+        for slot_id, style in semantic_content.items():
+            semantic_role = style.get("semantic_role")
             
-            # Log content count for debugging empty slides
-            print(f"  Slide {i+1}: Processing {len(semantic_content)} semantic slots")
+            # DEFENSIVE: Skip image_query if somehow present
+            if semantic_role == 'image_query':
+                print(f"  ⊘ Skipping image_query placeholder (NO_IMAGE mode)")
+                continue
             
-            for slot_id, style in semantic_content.items():
-                semantic_role = style.get("semantic_role")
-                
-                # DEFENSIVE: Skip image_query if somehow present
-                if semantic_role == 'image_query':
-                    print(f"  ⊘ Skipping image_query placeholder (NO_IMAGE mode)")
-                    continue
-                
-                try:
-                    # Find placeholder using slot_id (Beautifier provides slot_id-based output)
-                    shape = find_placeholder_by_id(slide, int(slot_id))
-                    
-                    if not shape or not hasattr(shape, "text_frame"):
+            try:
+                if compiled is not None:
+                    txBody = compiled.text_body(int(slot_id))
+                    if txBody is None:
                         print(f"  ⊘ Skipped slot {slot_id} on slide {i+1}: placeholder not found")
                         continue
-                    
-                    # Get text frame and existing content
-                    tf = shape.text_frame
-                    existing_text = (tf.text or "").strip()
-                    
-                    # Filter template headers and instruction blocks (copy pattern from legacy path)
-                    placeholder_type = None
-                    if hasattr(shape, "placeholder_format"):
-                        try:
-                            placeholder_type = shape.placeholder_format.type
-                        except Exception:
-                            pass
-                    
-                    if _is_template_header(existing_text, placeholder_type):
-                        print(f"  ⊘ Filtered template header/instruction in slot {slot_id} on slide {i+1}")
-                        # Proceed with clearing and injection
-                    
-                    # CRITICAL: Validate content exists BEFORE clearing (prevents blank slides)
-                    runs = style.get("runs") or []
-                    bullets = style.get("bullets") or []
-                    
-                    has_runs = any((r.get("text") or "").strip() for r in runs)
-                    has_bullets = bool(bullets)
-                    
-                    if not (has_runs or has_bullets):
+                    if not has_text_content(style):
                         print(f"  ⊘ Skipped slot {slot_id} on slide {i+1}: no content to inject")
-                        continue  # Preserve template placeholder, don't create blank slide
-                    
-                    # Now safe to clear - we have content to inject
-                    tf.clear()
-                    
-                    # Apply vertical anchor if specified (title slides)
-                    if style.get("vertical_anchor") == "MIDDLE":
-                        tf.vertical_anchor = MSO_ANCHOR.MIDDLE
-                    
-                    # Get alignment from Beautifier (None means respect Master Slide default)
-                    alignment_str = style.get("alignment")
-                    if alignment_str == "CENTER":
-                        target_alignment = PP_ALIGN.CENTER
-                    elif alignment_str == "RIGHT":
-                        target_alignment = PP_ALIGN.RIGHT
-                    elif alignment_str == "LEFT":
-                        target_alignment = PP_ALIGN.LEFT
-                    else:
-                        target_alignment = None  # Preserve Master Slide default
+                        continue
+                    fill_text_body(txBody, style, white=has_background,
+                                   autofit=style.get("semantic_role", "") in ENABLE_AUTOFIT_ROLES)
+                    rendered_fields.append(slot_id)
+                    print(f"  ✓ Rendered slot {slot_id} ({semantic_role}) on slide {i+1}")
+                    continue
+                
+                # Find placeholder using slot_id (Beautifier provides slot_id-based output)
+                shape = find_placeholder_by_id(slide, int(slot_id), placeholders)
+                
+                if not shape or not hasattr(shape, "text_frame"):
+                    print(f"  ⊘ Skipped slot {slot_id} on slide {i+1}: placeholder not found")
+                    continue
+                
+                # Get text frame and existing content
+                tf = shape.text_frame
+                existing_text = (tf.text or "").strip()
+                
+                # Filter template headers and instruction blocks (copy pattern from legacy path)
+                placeholder_type = None
+                if hasattr(shape, "placeholder_format"):
+                    try:
+                        placeholder_type = shape.placeholder_format.type
+                    except Exception:
+                        pass
+                
+                if _is_template_header(existing_text, placeholder_type):
+                    print(f"  ⊘ Filtered template header/instruction in slot {slot_id} on slide {i+1}")
+                    # Proceed with clearing and injection
+                
+                # CRITICAL: Validate content exists BEFORE clearing (prevents blank slides)
+                if not has_text_content(style):
+                    print(f"  ⊘ Skipped slot {slot_id} on slide {i+1}: no content to inject")
+                    continue  # Preserve template placeholder, don't create blank slide
+                
+                # Now safe to clear - we have content to inject
+                tf.clear()
+                
+                # Apply vertical anchor if specified (title slides)
+                if style.get("vertical_anchor") == "MIDDLE":
+                    tf.vertical_anchor = MSO_ANCHOR.MIDDLE
+                
+                # Get alignment from Beautifier (None means respect Master Slide default)
+                alignment_str = style.get("alignment")
+                if alignment_str == "CENTER":
+                    target_alignment = PP_ALIGN.CENTER
+                elif alignment_str == "RIGHT":
+                    target_alignment = PP_ALIGN.RIGHT
+                elif alignment_str == "LEFT":
+                    target_alignment = PP_ALIGN.LEFT
+                else:
+                    target_alignment = None  # Preserve Master Slide default
+                
+                # Render content based on structure
+                if "bullets" in style:
+                    # BULLETS: One paragraph per bullet item
+                    bullet_items = style.get("bullets", [])
                     
-                    # Render content based on structure
-                    if "bullets" in style:
-                        # BULLETS: One paragraph per bullet item
-                        bullet_items = style.get("bullets", [])
-                        
-                        for bullet_idx, bullet_item in enumerate(bullet_items):
-                            if bullet_idx == 0:
-                                # DEFENSIVE: Ensure paragraph exists after clear()
-                                p = tf.paragraphs[0] if tf.paragraphs else tf.add_paragraph()
-                            else:
-                                p = tf.add_paragraph()
-                            
-                            p.level = 0  # Bullet level
-                            
-                            # Render styled runs for this bullet
-                            for run_data in bullet_item.get("runs", []):
-                                run_text = run_data.get("text", "")
-                                if run_text:
-                                    r = p.add_run()
-                                    r.text = run_text
-                                    r.font.bold = run_data.get("bold", False)
-                                    r.font.italic = run_data.get("italic", False)
-                                    
-                                    # Only apply font size if explicitly provided (not None)
-                                    font_size = style.get("font_size")
-                                    if font_size is not None:
-                                        r.font.size = Pt(font_size)
-                                    
-                                    if has_background:
-                                        r.font.color.rgb = RGBColor(255, 255, 255)
+                    for bullet_idx, bullet_item in enumerate(bullet_items):
+                        if bullet_idx == 0:
+                            # DEFENSIVE: Ensure paragraph exists after clear()
+                            p = tf.paragraphs[0] if tf.paragraphs else tf.add_paragraph()
+                        else:
+                            p = tf.add_paragraph()
                         
-                        # Apply alignment only if explicitly set (prevents overriding Master defaults)
-                        if target_alignment is not None:
-                            for p in tf.paragraphs:
-                                p.alignment = target_alignment
-                    
-                    elif "runs" in style:
-                        # SINGLE TEXT FIELD (title, body, footer)
-                        # DEFENSIVE: Ensure paragraph exists after clear()
-                        p = tf.paragraphs[0] if tf.paragraphs else tf.add_paragraph()
+                        p.level = 0  # Bullet level
                         
-                        # Render styled runs
-                        for run_data in style.get("runs", []):
+                        # Render styled runs for this bullet
+                        for run_data in bullet_item.get("runs", []):
                             run_text = run_data.get("text", "")
                             if run_text:
                                 r = p.add_run()
@@ -399,92 +388,21 @@ def surgical_injection_node(state: PPTState):
                                 
                                 if has_background:
                                     r.font.color.rgb = RGBColor(255, 255, 255)
-                        
-                        # Apply alignment only if explicitly set (prevents overriding Master defaults)
-                        if target_alignment is not None:
-                            p.alignment = target_alignment
-                    
-                    # Optional: Enable autofit for specific roles (caption, circular_text)
-                    semantic_role = style.get("semantic_role", "")
-                    if semantic_role in ENABLE_AUTOFIT_ROLES:
-                        try:
-                            tf.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
-                        except Exception:
-                            pass  # Silently fail if not supported
-                    
-                    rendered_fields.append(slot_id)
-                    print(f"  ✓ Rendered slot {slot_id} ({semantic_role}) on slide {i+1}")
                     
-                except Exception as e:
-                    print(f"  ⚠️  Failed to render slot {slot_id} on slide {i+1}: {e}")
-            
-            # Warn if no slots were rendered (helps debug empty slides)
-            if not rendered_fields:
-                print(f"  ⚠️  Warning: No content rendered on slide {i+1} (slide may appear empty)")
-        else:
-            # LEGACY SLOT_ID-BASED APPROACH (for backward compatibility with Beautifier)
-            for slot_id, style in semantic_content.items():
-                try:
-                    # Find placeholder by numeric ID
-                    shape = find_placeholder_by_id(slide, int(slot_id))
-                    
-                    if not shape or not hasattr(shape, "text_frame"):
-                        continue
-                    
-                    # Get text frame and clear existing content
-                    tf = shape.text_frame  # type: ignore - hasattr check above ensures this exists
-                    
-                    # Check for template header text in existing placeholder
-                    existing_text = tf.text if hasattr(tf, 'text') else ""
-                    
-                    # Determine placeholder type for smarter filtering
-                    placeholder_type = None
-                    if hasattr(shape, 'placeholder_format'):
-                        try:
-                            placeholder_type = str(shape.placeholder_format.type)
-                        except:
-                            pass
-                    
-                    if _is_template_header(existing_text, placeholder_type):
-                        # Clear the template header
-                        print(f"  ⊘ Filtered template header in slot {slot_id}")
-                        tf.clear()
-                        # Check if we have actual content to render
-                        runs_to_render = style.get("runs", [])
-                        if not runs_to_render or all(not r.get("text", "").strip() for r in runs_to_render):
-                            # No content to render, leave it empty
-                            continue
-                    else:
-                        # Normal case: clear and populate
-                        tf.clear()
-                    
-                    # Get or create paragraph (ensure at least one exists after clear)
-                    if not tf.paragraphs:
-                        p = tf.add_paragraph()
-                    else:
-                        p = tf.paragraphs[0]
-                    
-                    # Set alignment from style spec (None means respect Master default)
-                    alignment_str = style.get("alignment")
-                    if alignment_str == "CENTER":
-                        target_alignment = PP_ALIGN.CENTER
-                    elif alignment_str == "RIGHT":
-                        target_alignment = PP_ALIGN.RIGHT
-                    elif alignment_str == "LEFT":
-                        target_alignment = PP_ALIGN.LEFT
-                    else:
-                        target_alignment = None
+                    # Apply alignment only if explicitly set (prevents overriding Master defaults)
+                    if target_alignment is not None:
+                        for p in tf.paragraphs:
+                            p.alignment = target_alignment
+                
+                elif "runs" in style:
+                    # SINGLE TEXT FIELD (title, body, footer)
+                    # DEFENSIVE: Ensure paragraph exists after clear()
+                    p = tf.paragraphs[0] if tf.paragraphs else tf.add_paragraph()
                     
-                    # Render each styled run
-                    has_content = False
+                    # Render styled runs
                     for run_data in style.get("runs", []):
                         run_text = run_data.get("text", "")
-                        
-                        # Skip if this run matches a header pattern
-                        if _is_template_header(run_text, None):
-                            continue
-                        
-                        if run_text:  # Only add non-empty runs
+                        if run_text:
                             r = p.add_run()
                             r.text = run_text
                             r.font.bold = run_data.get("bold", False)
@@ -495,37 +413,188 @@ def surgical_injection_node(state: PPTState):
                             if font_size is not None:
                                 r.font.size = Pt(font_size)
                             
-                            # Use white text on backgrounds for readability
                             if has_background:
                                 r.font.color.rgb = RGBColor(255, 255, 255)
-                            
-                            has_content = True
                     
-                    # Apply alignment only if explicitly set
+                    # Apply alignment only if explicitly set (prevents overriding Master defaults)
                     if target_alignment is not None:
                         p.alignment = target_alignment
+                
+                # Optional: Enable autofit for specific roles (caption, circular_text)
+                semantic_role = style.get("semantic_role", "")
+                if semantic_role in ENABLE_AUTOFIT_ROLES:
+                    try:
+                        tf.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+                    except Exception:
+                        pass  # Silently fail if not supported
+                
+                # Fitted by the beautifier: write normAutofit with its fontScale
+                autofit = style.get("autofit")
+                if autofit:
+                    set_norm_autofit(tf, autofit.get("font_scale"))
+                
+                rendered_fields.append(slot_id)
+                print(f"  ✓ Rendered slot {slot_id} ({semantic_role}) on slide {i+1}")
+                
+            except Exception as e:
+                print(f"  ⚠️  Failed to render slot {slot_id} on slide {i+1}: {e}")
+        
+        # Warn if no slots were rendered (helps debug empty slides)
+        if not rendered_fields:
+            print(f"  ⚠️  Warning: No content rendered on slide {i+1} (slide may appear empty)")
+    else:
+        # LEGACY SLOT_ID-BASED APPROACH (for backward compatibility with Beautifier)
+        for slot_id, style in semantic_content.items():
+            try:
+                # Find placeholder by numeric ID
+                shape = find_placeholder_by_id(slide, int(slot_id), placeholders)
+                
+                if not shape or not hasattr(shape, "text_frame"):
+                    continue
+                
+                # Get text frame and clear existing content
+                tf = shape.text_frame  # type: ignore - hasattr check above ensures this exists
+                
+                # Check for template header text in existing placeholder
+                existing_text = tf.text if hasattr(tf, 'text') else ""
+                
+                # Determine placeholder type for smarter filtering
+                placeholder_type = None
+                if hasattr(shape, 'placeholder_format'):
+                    try:
+                        placeholder_type = str(shape.placeholder_format.type)
+                    except:
+                        pass
+                
+                if _is_template_header(existing_text, placeholder_type):
+                    # Clear the template header
+                    print(f"  ⊘ Filtered template header in slot {slot_id}")
+                    tf.clear()
+                    # Check if we have actual content to render
+                    runs_to_render = style.get("runs", [])
+                    if not runs_to_render or all(not r.get("text", "").strip() for r in runs_to_render):
+                        # No content to render, leave it empty
+                        continue
+                else:
+                    # Normal case: clear and populate
+                    tf.clear()
+                
+                # Get or create paragraph (ensure at least one exists after clear)
+                if not tf.paragraphs:
+                    p = tf.add_paragraph()
+                else:
+                    p = tf.paragraphs[0]
+                
+                # Set alignment from style spec (None means respect Master default)
+                alignment_str = style.get("alignment")
+                if alignment_str == "CENTER":
+                    target_alignment = PP_ALIGN.CENTER
+                elif alignment_str == "RIGHT":
+                    target_alignment = PP_ALIGN.RIGHT
+                elif alignment_str == "LEFT":
+                    target_alignment = PP_ALIGN.LEFT
+                else:
+                    target_alignment = None
+                
+                # Render each styled run
+                has_content = False
+                for run_data in style.get("runs", []):
+                    run_text = run_data.get("text", "")
                     
-                    if has_content:
-                        rendered_fields.append(slot_id)
+                    # Skip if this run matches a header pattern
+                    if _is_template_header(run_text, None):
+                        continue
                     
-                except (ValueError, TypeError) as e:
-                    print(f"  ⚠️  Warning: Failed to render slot {slot_id} on slide {i+1}: {e}")
-        
-        # Log rendering summary
-        bg_status = "with gradient background" if has_background else "no background"
-        render_type = "semantic" if is_semantic else "slot_id"
-        print(f"  ✓ Slide {i + 1} ({slide_role}): {len(rendered_fields)} {render_type} fields filled, {bg_status}")
+                    if run_text:  # Only add non-empty runs
+                        r = p.add_run()
+                        r.text = run_text
+                        r.font.bold = run_data.get("bold", False)
+                        r.font.italic = run_data.get("italic", False)
+                        
+                        # Only apply font size if explicitly provided (not None)
+                        font_size = style.get("font_size")
+                        if font_size is not None:
+                            r.font.size = Pt(font_size)
+                        
+                        # Use white text on backgrounds for readability
+                        if has_background:
+                            r.font.color.rgb = RGBColor(255, 255, 255)
+                        
+                        has_content = True
+                
+                # Apply alignment only if explicitly set
+                if target_alignment is not None:
+                    p.alignment = target_alignment
+                
+                if has_content:
+                    rendered_fields.append(slot_id)
+                
+            except (ValueError, TypeError) as e:
+                print(f"  ⚠️  Warning: Failed to render slot {slot_id} on slide {i+1}: {e}")
+    
+    # Log rendering summary
+    bg_status = "with gradient background" if has_background else "no background"
+    render_type = "semantic" if is_semantic else "slot_id"
+    print(f"  ✓ Slide {i + 1} ({slide_role}): {len(rendered_fields)} {render_type} fields filled, {bg_status}")
+    
+    return slide
+
+
+def surgical_injection_node(state: PPTState):
+    """
+    Pipeline 2 – Final Node
+    Deterministic PPTX renderer with SEMANTIC MAPPING.
+    
+    Maps semantic content (title, bullets, body, image_query) to placeholders
+    using stable identity (placeholder_idx, type, name) instead of arbitrary slot IDs.
+    
+    This prevents overlap bugs caused by LLM-generated slot IDs not matching
+    PowerPoint's actual placeholder indices.
+    
+    Features:
+    - Semantic-to-placeholder mapping with 3-tier fallback
+    - Renders role-based background gradients for enabled slides
+    - Filters template header text intelligently  
+    - Applies white text on backgrounds for readability
+    """
+    primary_master_path = state["primary_master_path"]
+    manifest = state["manifest"]
+    
+    # Cheap clone of the pooled, pre-parsed master (no zip/XML re-parse per deck)
+    prs = TemplatePool.checkout(primary_master_path)
+    print(f"--- Injector: Rendering {len(manifest)} slides ---")
+    
+    # Optional compiled renderer: slides stamped from per-layout XML skeletons,
+    # semantic slots written as a:p/a:r directly (same XML as the python-pptx path)
+    compiler = SlideCompiler(prs) if COMPILED_SLIDE_RENDERER else None
+    
+    for i, slide_def in enumerate(manifest):
+        render_slide(prs, slide_def, i, compiler)
+    
+    if SLIM_OUTPUT_DECKS:
+        # Drop template layouts/masters (and their media) that no slide uses
+        slimmed = slim_presentation(prs, TemplatePool.archive(primary_master_path))
+        print(f"  Slimming: removed {slimmed['layouts_removed']} layouts, {slimmed['masters_removed']} masters, "
+              f"{slimmed['parts_removed']} parts ({slimmed['bytes_saved'] / 1024:.1f} KB saved)")
     
     # Save output - use the path from state if provided, otherwise use default
     output_path = state.get("final_file_path") or "data/outputs/final_deck.pptx"
     
+    if state.get("render_to_memory"):
+        # Caller streams the bytes and decides whether (and when) to persist them
+        buffer = io.BytesIO()
+        _save_deck(prs, buffer, primary_master_path)
+        print(f"--- Injector: Rendered presentation in memory ({buffer.tell() / 1024:.1f} KB) ---")
+        return {"final_file_path": output_path, "final_file_bytes": buffer.getvalue()}
+    
     # Ensure the output directory exists
     output_dir = os.path.dirname(output_path)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
     
-    prs.save(output_path)
+    _save_deck(prs, output_path, primary_master_path)
     
     print(f"--- Injector: Saved presentation to {output_path} ---")
     
-    return {"final_file_path": output_path}
\ No newline at end of file
+    return {"final_file_path": output_path}
+
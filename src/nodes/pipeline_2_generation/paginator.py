@@ -0,0 +1,142 @@
+"""
+Pipeline 2 Node: Paginator
+Responsibility: Enforce the split_slide overflow policy (deterministic, no LLM calls)
+
+Bullet lists that exceed their slot's max_bullets are split across continuation
+slides that reuse the layout, with the title suffixed "(cont.)". A bullet longer
+than max_chars_per_bullet counts as the number of bullet lines it wraps to.
+"""
+import math
+from typing import Any, Dict, List
+from src.core.state import PPTState
+from src.config import SPLIT_SLIDE_ENABLED
+
+CONTINUATION_SUFFIX = " (cont.)"
+
+# Fields copied onto continuation slides (plus their page of bullets); every other field stays on the first slide only
+CONTINUATION_FIELDS = ("title", "footer")
+
+
+def _bullet_units(bullet: Any, max_chars: int) -> int:
+    """Bullet lines a bullet takes: 1, or more when it exceeds max_chars_per_bullet."""
+    if not max_chars:
+        return 1
+    return max(1, math.ceil(len(str(bullet)) / max_chars))
+
+
+def split_bullets(bullets: List[Any], max_bullets: int, max_chars: int = None) -> List[List[Any]]:
+    """
+    Split bullets into pages of at most max_bullets bullet lines, in order.
+
+    A bullet that alone exceeds the page gets a page of its own (never dropped).
+
+    Args:
+        bullets: Bullet texts
+        max_bullets: Bullet lines per slide
+        max_chars: Characters per bullet line (None = every bullet is one line)
+
+    Returns:
+        List of pages (a single page when nothing overflows)
+    """
+    if not max_bullets or max_bullets < 1:
+        return [list(bullets)]
+
+    pages, page, used = [], [], 0
+    for bullet in bullets:
+        units = _bullet_units(bullet, max_chars)
+        if page and used + units > max_bullets:
+            pages.append(page)
+            page, used = [], 0
+        page.append(bullet)
+        used += units
+    pages.append(page)
+    return pages
+
+
+def _continuation_title(title: Any) -> Any:
+    """Title for a continuation slide ("(cont.)" is not repeated)."""
+    if not title:
+        return title
+    title = str(title)
+    return title if title.endswith(CONTINUATION_SUFFIX.strip()) else title + CONTINUATION_SUFFIX
+
+
+def paginate_slide(slide: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Split one manifest entry on its bullets slot's split_slide policy.
+
+    Returns:
+        [slide] unchanged when nothing overflows, else the first slide followed by
+        its continuation slides
+    """
+    content = slide.get("content") or {}
+    bullets = content.get("bullets") if isinstance(content, dict) else None
+    if not isinstance(bullets, list):
+        return [slide]
+
+    slots = (slide.get("_semantic_mapping") or {}).get("bullets") or []
+    slot = slots[0] if slots else {}
+    if slot.get("overflow_policy") != "split_slide":
+        return [slide]
+
+    pages = split_bullets(bullets, slot.get("max_bullets"), slot.get("max_chars_per_bullet"))
+    if len(pages) == 1:
+        return [slide]
+
+    first = dict(slide)
+    first["content"] = {**content, "bullets": pages[0]}
+    paginated = [first]
+    for page in pages[1:]:
+        continuation = dict(slide)
+        continuation["content"] = {
+            key: content[key] for key in CONTINUATION_FIELDS if key in content
+        }
+        if "title" in continuation["content"]:
+            continuation["content"]["title"] = _continuation_title(content["title"])
+        continuation["content"]["bullets"] = page
+        continuation["_continuation"] = True
+        paginated.append(continuation)
+    return paginated
+
+
+def paginator_node(state: PPTState) -> Dict[str, Any]:
+    """
+    Pipeline 2 – Node between Writer and Image Director.
+    Splits overflowing bullet lists into continuation slides.
+
+    Slide order is stable: continuations follow the slide they continue, and
+    slide_plans gets a matching copy of the plan so downstream nodes that pair
+    manifest[i] with slide_plans[i] stay aligned.
+
+    Args:
+        state: Current pipeline state with manifest and slide_plans
+
+    Returns:
+        Updated manifest and slide_plans (unchanged when nothing overflows)
+    """
+    manifest = state.get("manifest", [])
+    if not SPLIT_SLIDE_ENABLED or not manifest:
+        return {}
+
+    slide_plans = state.get("slide_plans", [])
+    paginated_manifest, paginated_plans = [], []
+    added = 0
+
+    for idx, slide in enumerate(manifest):
+        pages = paginate_slide(slide)
+        paginated_manifest.extend(pages)
+        if idx < len(slide_plans):
+            paginated_plans.append(slide_plans[idx])
+            paginated_plans.extend(dict(slide_plans[idx]) for _ in pages[1:])
+        if len(pages) > 1:
+            added += len(pages) - 1
+            print(f"--- Paginator: Slide {idx + 1} bullets split across {len(pages)} slides")
+
+    if not added:
+        return {}
+
+    print(f"--- Paginator: Added {added} continuation slides ({len(paginated_manifest)} total) ---")
+    update = {"manifest": paginated_manifest}
+    if slide_plans:
+        update["slide_plans"] = paginated_plans + list(slide_plans[len(manifest):])
+    return update
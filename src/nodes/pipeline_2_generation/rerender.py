@@ -0,0 +1,128 @@
+"""
+Pipeline 2: Incremental re-render
+Responsibility: Apply an edited beautified manifest to a deck the injector already rendered
+
+The previous and new manifests are diffed slide by slide. Slides whose entry is
+unchanged are kept as they are (their XML is not touched); changed and inserted
+entries are rendered with the injector's render_slide, and slides whose entry
+went away are removed. On save, every unchanged zip entry of the previous deck
+(kept slides, layouts, media) is copied without recompressing, so both render
+and save work scale with the edit rather than the deck.
+
+Decks saved with SLIM_OUTPUT_DECKS no longer have the master's full layout list:
+manifest layout indices are mapped onto the layouts they kept (recorded by the
+slimmer), and an edit that needs a layout slimming removed is rejected; re-render
+those from scratch.
+"""
+import difflib
+import io
+import json
+from typing import IO, Any, Dict, List, Union
+
+from pptx import Presentation
+from src.utils.deck_writer import DeckArchive, save_presentation
+from src.utils.deck_slimmer import slimmed_layout_indices
+from src.utils.deck_output import write_atomic
+from src.config import PASSTHROUGH_DECK_WRITER, DECK_COMPRESSLEVEL
+from .injector import render_slide
+
+
+def _fingerprint(slide_def: Dict[str, Any]) -> str:
+    """Canonical form of a manifest entry for diffing."""
+    return json.dumps(slide_def, sort_keys=True, default=str)
+
+
+def _remove_slide(prs, sldId) -> None:
+    """Detach a slide: its p:sldId entry and the presentation's relationship to it."""
+    prs.part._element.sldIdLst.remove(sldId)
+    prs.part.rels.pop(sldId.rId)  # Its notes slide and media go with it if nothing else uses them
+
+
+def rerender_deck(previous_deck: Union[str, bytes], previous_manifest: List[Dict[str, Any]],
+                  new_manifest: List[Dict[str, Any]], output: Union[str, IO[bytes]]) -> Dict[str, int]:
+    """
+    Re-render only the slides that changed between two beautified manifests.
+
+    Args:
+        previous_deck: Path or bytes of the deck rendered from previous_manifest
+        previous_manifest: Manifest the previous deck was rendered from (one entry per slide)
+        new_manifest: Edited manifest
+        output: Path or writable binary stream for the updated deck (may be the previous path;
+                paths are replaced atomically, so a failed save leaves the previous deck intact)
+
+    Returns:
+        Counters: slides kept, rendered and removed
+
+    Raises:
+        ValueError: previous_deck does not have one slide per previous_manifest entry,
+                    or a slide to render uses a layout the (slimmed) previous deck no longer has
+    """
+    if isinstance(previous_deck, str):
+        with open(previous_deck, "rb") as f:
+            previous_deck = f.read()
+    prs = Presentation(io.BytesIO(previous_deck))
+    sldIdLst = prs.part._element.get_or_add_sldIdLst()
+    old_ids = list(sldIdLst.sldId_lst)
+    if len(old_ids) != len(previous_manifest):
+        raise ValueError(
+            f"Previous deck has {len(old_ids)} slides but previous manifest has {len(previous_manifest)} entries"
+        )
+
+    old = [_fingerprint(slide_def) for slide_def in previous_manifest]
+    new = [_fingerprint(slide_def) for slide_def in new_manifest]
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    opcodes = matcher.get_opcodes()
+    print(f"--- Incremental render: {len(old)} -> {len(new)} slides ---")
+
+    # Slimmed decks: manifest layout index -> position in prs.slide_layouts (checked before any edit)
+    kept_layouts = slimmed_layout_indices(prs)
+    layout_positions = None
+    if kept_layouts is not None:
+        layout_positions = {index: pos for pos, index in enumerate(kept_layouts)}
+        missing = sorted({
+            new_manifest[j]["layout_index"]
+            for tag, _, _, j1, j2 in opcodes if tag != "equal"
+            for j in range(j1, j2)
+            if new_manifest[j]["layout_index"] not in layout_positions
+        })
+        if missing:
+            raise ValueError(
+                f"Previous deck was slimmed and no longer has layout(s) {missing}; render the new manifest from scratch"
+            )
+
+    order = []  # Final p:sldId order
+    stats = {"kept": 0, "rendered": 0, "removed": 0}
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            order.extend(old_ids[i1:i2])
+            stats["kept"] += i2 - i1
+            continue
+        for sldId in old_ids[i1:i2]:
+            _remove_slide(prs, sldId)
+        stats["removed"] += i2 - i1
+        for j in range(j1, j2):
+            slide_def = new_manifest[j]
+            if layout_positions is not None:
+                slide_def = dict(slide_def, layout_index=layout_positions[slide_def["layout_index"]])
+            render_slide(prs, slide_def, j)
+            order.append(sldIdLst.sldId_lst[-1])
+        stats["rendered"] += j2 - j1
+
+    for sldId in order:
+        sldIdLst.append(sldId)  # Moves each entry to the end: final order
+    # slideN.xml partnames follow the new positions (as python-pptx does on every prs.slides)
+    prs.part.rename_slide_parts([sldId.rId for sldId in sldIdLst.sldId_lst])
+
+    # Never open the output path for writing directly: it may be the previous deck
+    target = io.BytesIO() if isinstance(output, str) else output
+    if PASSTHROUGH_DECK_WRITER:
+        saved = save_presentation(prs, target, DeckArchive(previous_deck), DECK_COMPRESSLEVEL)
+        print(f"  Deck writer: {saved['copied']} entries copied, {saved['written']} written")
+    else:
+        prs.save(target)
+    if target is not output:
+        write_atomic(output, target.getvalue())
+
+    print(f"--- Incremental render: {stats['kept']} kept, {stats['rendered']} rendered, "
+          f"{stats['removed']} removed ---")
+    return stats
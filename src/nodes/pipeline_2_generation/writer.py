@@ -1,8 +1,12 @@
 # src/nodes/pipeline_2_generation/writer.py
 from src.core.state import PPTState, ManifestEntry, BackgroundImageSpec
 from src.utils.auth_helper import get_llm
+from src.utils.llm_cache import with_response_validator
+from src.utils.registry_index import get_registry_index
 from pydantic import BaseModel, Field
 from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from src.config import WRITER_MAX_CONCURRENCY
 import json
 
 # Slide role constants (must match architect.py)
@@ -17,11 +21,26 @@ ROLE_CLOSING = "CLOSING"
 _llm_instance = None
 
 def _get_llm():
-    """Lazy load LLM instance."""
+    """Lazy load LLM instance (only replies that parse as JSON are cached)."""
     global _llm_instance
     if _llm_instance is None:
-        _llm_instance = get_llm(deployment_name="gpt-4", temperature=0.7)
+        _llm_instance = with_response_validator(
+            get_llm(deployment_name="gpt-4", temperature=0.7),
+            lambda response: _parse_response_json(response.content),
+        )
     return _llm_instance
+
+
+def _parse_response_json(response_text: str) -> Any:
+    """Parse the writer's JSON reply, tolerating a markdown code fence around it."""
+    response_text = response_text.strip()
+    if response_text.startswith("```"):
+        # Remove markdown code fences
+        response_text = response_text.split("```")[1]
+        if response_text.startswith("json"):
+            response_text = response_text[4:]
+        response_text = response_text.strip()
+    return json.loads(response_text)
  
 def _get_role_specific_rules(slide_role: str) -> str:
     """Return role-specific writing guidelines for the LLM."""
@@ -81,86 +100,71 @@ def _get_role_specific_rules(slide_role: str) -> str:
     return rules.get(slide_role, rules[ROLE_CONTENT])
 
 
-def writer_node(state: PPTState):
+def _write_slide(idx: int, plan: Dict[str, Any], content_map: str, registry: Dict[str, Any]) -> ManifestEntry:
     """
-    Generates content for each slide using SEMANTIC FIELDS (title, bullets, body, image_query).
-    This eliminates the need for arbitrary slot_id addressing, preventing overlap bugs.
+    Generate the manifest entry for a single slide plan (one LLM call).
+    Falls back to role-based default content if the LLM response cannot be used.
     """
-    slide_plans = state.get("slide_plans", [])
-    content_map = state.get("content_map", "")
-    registry = state.get("registry", {})
-    final_manifest: List[ManifestEntry] = []
+    l_idx = plan['layout_index']
+    slide_role = plan.get('slide_role', ROLE_CONTENT)
+    registry_index = get_registry_index(registry)
+    layout_schema = registry_index.layout(l_idx) or {}
     
-    for idx, plan in enumerate(slide_plans):
-        l_idx = plan['layout_index']
-        slide_role = plan.get('slide_role', ROLE_CONTENT)
-        layout_schema = next((l for l in registry.get('layouts', []) if l['layout_index'] == l_idx), {})
-        
-        # Extract slot information
-        slots_info = layout_schema.get('slots', [])
-        
-        # Identify available semantic roles in this layout
-        available_roles = {}
-        if slots_info:
-            for s in slots_info:
-                semantic_role = s.get('semantic_role', 'body')
-                # Track which semantic roles are available
-                if semantic_role not in available_roles:
-                    available_roles[semantic_role] = []
-                available_roles[semantic_role].append(s)
-        
-        # DEFENSIVE: If no slots found, create fallback based on slide role
-        if not available_roles:
-            print(f"  ⚠️  Slide {idx + 1}: No slots in layout {l_idx} - using role-based fallback for {slide_role}")
-            # Provide sensible defaults based on slide role
-            if slide_role == ROLE_TITLE:
-                available_roles = {'title': [{'semantic_role': 'title', 'max_chars': 100}]}
-            elif slide_role == ROLE_AGENDA:
-                available_roles = {'title': [{'semantic_role': 'title', 'max_chars': 50}], 
-                                   'bullets': [{'semantic_role': 'bullets', 'max_bullets': 5, 'max_chars_per_bullet': 50}]}
-            elif slide_role in [ROLE_CONTENT, ROLE_DIAGRAM, ROLE_TIMELINE]:
-                available_roles = {'title': [{'semantic_role': 'title', 'max_chars': 80}],
-                                   'bullets': [{'semantic_role': 'bullets', 'max_bullets': 5, 'max_chars_per_bullet': 100}]}
-            else:  # CLOSING or unknown
-                available_roles = {'title': [{'semantic_role': 'title', 'max_chars': 80}],
-                                   'body': [{'semantic_role': 'body', 'max_chars': 300}]}
-        
-        # Log detected semantic roles for debugging
-        print(f"  → Slide {idx + 1} ({slide_role}): Semantic roles = {list(available_roles.keys())}")
-        
-        # Get role-specific writing rules
-        role_rules = _get_role_specific_rules(slide_role)
-        
-        # Build semantic layout description
-        semantic_desc = []
-        for role, slots in available_roles.items():
-            if role == 'title':
-                semantic_desc.append(f"  - TITLE: Main headline (6-10 words max)")
-            elif role == 'bullets':
-                max_bullets = slots[0].get('max_bullets', 5)
-                max_chars = slots[0].get('max_chars_per_bullet', 100)
-                semantic_desc.append(f"  - BULLETS: Up to {max_bullets} points, {max_chars} chars each")
-            elif role == 'body':
-                max_chars = slots[0].get('max_chars', 500)
-                semantic_desc.append(f"  - BODY: Text content ({max_chars} chars max)")
-            elif role == 'image_query':
-                semantic_desc.append(f"  - IMAGE_QUERY: Brief image description (50 words max)")
-            elif role == 'footer':
-                semantic_desc.append(f"  - FOOTER: Metadata (optional)")
-        
-        semantic_layout = "\n".join(semantic_desc)
-        
-        # Create example output based on available roles
-        example_dict = {}
-        if 'title' in available_roles:
-            example_dict['title'] = 'Compelling Slide Title Here'
-        if 'bullets' in available_roles:
-            example_dict['bullets'] = ['First key point', 'Second key point', 'Third key point']
-        if 'body' in available_roles:
-            example_dict['body'] = 'Supporting text content here'
-        # NOTE: image_query intentionally EXCLUDED (NO_IMAGE mode)
-        
-        prompt = f"""
+    # Available semantic roles in this layout (precomputed grouping of its slots)
+    available_roles = dict(registry_index.slots_by_role(l_idx))
+    
+    # DEFENSIVE: If no slots found, create fallback based on slide role
+    if not available_roles:
+        print(f"  ⚠️  Slide {idx + 1}: No slots in layout {l_idx} - using role-based fallback for {slide_role}")
+        # Provide sensible defaults based on slide role
+        if slide_role == ROLE_TITLE:
+            available_roles = {'title': [{'semantic_role': 'title', 'max_chars': 100}]}
+        elif slide_role == ROLE_AGENDA:
+            available_roles = {'title': [{'semantic_role': 'title', 'max_chars': 50}], 
+                               'bullets': [{'semantic_role': 'bullets', 'max_bullets': 5, 'max_chars_per_bullet': 50}]}
+        elif slide_role in [ROLE_CONTENT, ROLE_DIAGRAM, ROLE_TIMELINE]:
+            available_roles = {'title': [{'semantic_role': 'title', 'max_chars': 80}],
+                               'bullets': [{'semantic_role': 'bullets', 'max_bullets': 5, 'max_chars_per_bullet': 100}]}
+        else:  # CLOSING or unknown
+            available_roles = {'title': [{'semantic_role': 'title', 'max_chars': 80}],
+                               'body': [{'semantic_role': 'body', 'max_chars': 300}]}
+    
+    # Log detected semantic roles for debugging
+    print(f"  → Slide {idx + 1} ({slide_role}): Semantic roles = {list(available_roles.keys())}")
+    
+    # Get role-specific writing rules
+    role_rules = _get_role_specific_rules(slide_role)
+    
+    # Build semantic layout description
+    semantic_desc = []
+    for role, slots in available_roles.items():
+        if role == 'title':
+            semantic_desc.append(f"  - TITLE: Main headline (6-10 words max)")
+        elif role == 'bullets':
+            max_bullets = slots[0].get('max_bullets', 5)
+            max_chars = slots[0].get('max_chars_per_bullet', 100)
+            semantic_desc.append(f"  - BULLETS: Up to {max_bullets} points, {max_chars} chars each")
+        elif role == 'body':
+            max_chars = slots[0].get('max_chars', 500)
+            semantic_desc.append(f"  - BODY: Text content ({max_chars} chars max)")
+        elif role == 'image_query':
+            semantic_desc.append(f"  - IMAGE_QUERY: Brief image description (50 words max)")
+        elif role == 'footer':
+            semantic_desc.append(f"  - FOOTER: Metadata (optional)")
+    
+    semantic_layout = "\n".join(semantic_desc)
+    
+    # Create example output based on available roles
+    example_dict = {}
+    if 'title' in available_roles:
+        example_dict['title'] = 'Compelling Slide Title Here'
+    if 'bullets' in available_roles:
+        example_dict['bullets'] = ['First key point', 'Second key point', 'Third key point']
+    if 'body' in available_roles:
+        example_dict['body'] = 'Supporting text content here'
+    # NOTE: image_query intentionally EXCLUDED (NO_IMAGE mode)
+    
+    prompt = f"""
 You are a Professional Content Writer creating PowerPoint slide content.
 
 PROJECT CONTEXT:
@@ -207,11 +211,11 @@ AVAILABLE SEMANTIC FIELDS:
 **OUTPUT FORMAT (JSON only, no markdown code blocks)**:
 {{
   "content": {{
-    "title": "string",
-    "bullets": ["string", "string", ...],
-    "body": "string",
-    "image_query": "string",
-    "footer": "string"
+"title": "string",
+"bullets": ["string", "string", ...],
+"body": "string",
+"image_query": "string",
+"footer": "string"
   }}
 }}
 
@@ -227,151 +231,168 @@ Example for THIS layout:
 - Keep content concise and slide-native (not document prose)
 
 Generate the JSON now:
-        """
+    """
+    
+    try:
+        response = _get_llm().invoke(prompt)
         
-        try:
-            response = _get_llm().invoke(prompt)
-            response_text = response.content.strip()
-            
-            # Try to parse JSON, handling markdown code blocks if present
-            if response_text.startswith("```"):
-                # Remove markdown code fences
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-            
-            # Parse the JSON
-            parsed = json.loads(response_text)
-            
-            # Extract the content dictionary
-            if "content" in parsed:
-                content_dict = parsed["content"]
-            else:
-                content_dict = parsed
-            
-            # CRITICAL: Filter content to ONLY include fields that exist in available_roles
-            # (Prevents LLM from generating unmappable content)
-            valid_content = {}
-            for field in ['title', 'bullets', 'body', 'footer', 'image_query']:
-                if field in content_dict and field in available_roles:
-                    valid_content[field] = content_dict[field]
-                elif field in content_dict and field not in available_roles:
-                    print(f"  ⚠️  Removed '{field}' from LLM output (not in layout: {list(available_roles.keys())})")
-            
-            content_dict = valid_content
-            
-            # DEFENSIVE: If filtering left us with no valid content, populate available roles
-            if not content_dict:
-                print(f"  ⚠️  All LLM content filtered out - generating content for available roles: {list(available_roles.keys())}")
-                if 'title' in available_roles:
-                    content_dict['title'] = plan.get('slide_intent', f"Slide {idx + 1}")
-                if 'bullets' in available_roles:
-                    content_dict['bullets'] = ["Key point 1", "Key point 2", "Key point 3"]
-                if 'body' in available_roles:
-                    # Use slide_intent or extract from content_map
-                    content_dict['body'] = f"{plan.get('slide_intent', 'Content')}. {content_map[:200]}..."
-                if 'footer' in available_roles:
-                    content_dict['footer'] = "© EY 2026"
-            
-            # CRITICAL: Strip image_query if LLM generated it anyway (NO_IMAGE mode)
-            if 'image_query' in content_dict:
-                print(f"  ⚠️  Removed image_query from LLM output (NO_IMAGE mode)")
-                del content_dict['image_query']
-            
-            # Defensive: Remove image prompt phrases from bullets
-            if 'bullets' in content_dict:
-                # DEFENSIVE: Ensure bullets is a list (LLM sometimes returns string)
-                if isinstance(content_dict['bullets'], str):
-                    # Try to split by newlines or convert to single-item list
-                    if '\n' in content_dict['bullets']:
-                        content_dict['bullets'] = [line.strip() for line in content_dict['bullets'].split('\n') if line.strip()]
-                    else:
-                        content_dict['bullets'] = [content_dict['bullets']]
-                
-                if isinstance(content_dict['bullets'], list):
-                    sanitized_bullets = []
-                    for bullet in content_dict['bullets']:
-                        # Skip bullets that are image descriptions
-                        if any(phrase in str(bullet).lower() for phrase in ['image:', 'photo of', 'diagram showing', 'timeline diagram', 'visual of', 'illustration of']):
-                            print(f"  ⚠️  Filtered image prompt bullet: {str(bullet)[:50]}...")
-                            continue
-                        sanitized_bullets.append(bullet)
-                    content_dict['bullets'] = sanitized_bullets
-                else:
-                    # Last resort: remove invalid bullets field
-                    print(f"  ⚠️  Invalid bullets format (not list or string), removing field")
-                    del content_dict['bullets']
-            
-            # Create default background image spec (will be populated by image_director)
-            background_spec: BackgroundImageSpec = {
-                "enabled": False,
-                "keywords": "",
-                "mood": "",
-                "composition": "",
-                "overlay_opacity": 0.0
-            }
-            
-            final_manifest.append({
-                "layout_index": l_idx,
-                "content": content_dict,
-                "slide_role": slide_role,
-                "background_image": background_spec,
-                "_semantic_mapping": available_roles  # Store slot metadata for Injector
-            })
-            
-            # Log content summary for debugging
-            content_fields = [k for k, v in content_dict.items() if v]  # Non-empty fields
-            print(f"  ✓ Slide {idx + 1}: Generated {len(content_fields)} fields: {content_fields}")
-            
-        except (json.JSONDecodeError, Exception) as e:
-            print(f"  ⚠️  Error parsing LLM response for slide {idx + 1}: {e}")
-            if 'response_text' in locals():
-                print(f"  Response preview: {response_text[:150]}...")
-            elif 'response' in locals():
-                print(f"  Response preview: {response.content[:150]}...")
-            
-            # Create role-based default semantic content as fallback
-            default_content = {}
+        # Parse the JSON, handling markdown code blocks if present
+        parsed = _parse_response_json(response.content)
+        
+        # Extract the content dictionary
+        if "content" in parsed:
+            content_dict = parsed["content"]
+        else:
+            content_dict = parsed
+        
+        # CRITICAL: Filter content to ONLY include fields that exist in available_roles
+        # (Prevents LLM from generating unmappable content)
+        valid_content = {}
+        for field in ['title', 'bullets', 'body', 'footer', 'image_query']:
+            if field in content_dict and field in available_roles:
+                valid_content[field] = content_dict[field]
+            elif field in content_dict and field not in available_roles:
+                print(f"  ⚠️  Removed '{field}' from LLM output (not in layout: {list(available_roles.keys())})")
+        
+        content_dict = valid_content
+        
+        # DEFENSIVE: If filtering left us with no valid content, populate available roles
+        if not content_dict:
+            print(f"  ⚠️  All LLM content filtered out - generating content for available roles: {list(available_roles.keys())}")
             if 'title' in available_roles:
-                # Generate role-appropriate title
-                if slide_role == ROLE_TITLE:
-                    default_content['title'] = plan.get('slide_intent', f"Presentation Slide {idx + 1}")
-                elif slide_role == ROLE_AGENDA:
-                    default_content['title'] = "Agenda"
-                else:
-                    default_content['title'] = plan.get('slide_intent', f"Content Slide {idx + 1}")
-            
+                content_dict['title'] = plan.get('slide_intent', f"Slide {idx + 1}")
             if 'bullets' in available_roles:
-                # Generate role-appropriate bullets
-                if slide_role == ROLE_AGENDA:
-                    default_content['bullets'] = ["Overview", "Key Topics", "Next Steps"]
-                else:
-                    default_content['bullets'] = [
-                        "Key point from project documentation",
-                        "Supporting detail or evidence",
-                        "Actionable insight or takeaway"
-                    ]
-            
+                content_dict['bullets'] = ["Key point 1", "Key point 2", "Key point 3"]
             if 'body' in available_roles:
-                default_content['body'] = f"Content for {slide_role} slide based on: {plan.get('slide_intent', 'project context')}"
-            
-            print(f"  → Using fallback content with fields: {list(default_content.keys())}")
+                # Use slide_intent or extract from content_map
+                content_dict['body'] = f"{plan.get('slide_intent', 'Content')}. {content_map[:200]}..."
+            if 'footer' in available_roles:
+                content_dict['footer'] = "© EY 2026"
+        
+        # CRITICAL: Strip image_query if LLM generated it anyway (NO_IMAGE mode)
+        if 'image_query' in content_dict:
+            print(f"  ⚠️  Removed image_query from LLM output (NO_IMAGE mode)")
+            del content_dict['image_query']
+        
+        # Defensive: Remove image prompt phrases from bullets
+        if 'bullets' in content_dict:
+            # DEFENSIVE: Ensure bullets is a list (LLM sometimes returns string)
+            if isinstance(content_dict['bullets'], str):
+                # Try to split by newlines or convert to single-item list
+                if '\n' in content_dict['bullets']:
+                    content_dict['bullets'] = [line.strip() for line in content_dict['bullets'].split('\n') if line.strip()]
+                else:
+                    content_dict['bullets'] = [content_dict['bullets']]
             
-            background_spec: BackgroundImageSpec = {
-                "enabled": False,
-                "keywords": "",
-                "mood": "",
-                "composition": "",
-                "overlay_opacity": 0.0
-            }
-            final_manifest.append({
-                "layout_index": l_idx,
-                "content": default_content,
-                "slide_role": slide_role,
-                "background_image": background_spec,
-                "_semantic_mapping": available_roles  # Store for Injector
-            })
+            if isinstance(content_dict['bullets'], list):
+                sanitized_bullets = []
+                for bullet in content_dict['bullets']:
+                    # Skip bullets that are image descriptions
+                    if any(phrase in str(bullet).lower() for phrase in ['image:', 'photo of', 'diagram showing', 'timeline diagram', 'visual of', 'illustration of']):
+                        print(f"  ⚠️  Filtered image prompt bullet: {str(bullet)[:50]}...")
+                        continue
+                    sanitized_bullets.append(bullet)
+                content_dict['bullets'] = sanitized_bullets
+            else:
+                # Last resort: remove invalid bullets field
+                print(f"  ⚠️  Invalid bullets format (not list or string), removing field")
+                del content_dict['bullets']
+        
+        # Create default background image spec (will be populated by image_director)
+        background_spec: BackgroundImageSpec = {
+            "enabled": False,
+            "keywords": "",
+            "mood": "",
+            "composition": "",
+            "overlay_opacity": 0.0
+        }
+        
+        # Log content summary for debugging
+        content_fields = [k for k, v in content_dict.items() if v]  # Non-empty fields
+        print(f"  ✓ Slide {idx + 1}: Generated {len(content_fields)} fields: {content_fields}")
+        
+        return {
+            "layout_index": l_idx,
+            "content": content_dict,
+            "slide_role": slide_role,
+            "background_image": background_spec,
+            "_semantic_mapping": available_roles  # Store slot metadata for Injector
+        }
+        
+    except (json.JSONDecodeError, Exception) as e:
+        print(f"  ⚠️  Error parsing LLM response for slide {idx + 1}: {e}")
+        if 'response' in locals():
+            print(f"  Response preview: {response.content[:150]}...")
+        
+        # Create role-based default semantic content as fallback
+        default_content = {}
+        if 'title' in available_roles:
+            # Generate role-appropriate title
+            if slide_role == ROLE_TITLE:
+                default_content['title'] = plan.get('slide_intent', f"Presentation Slide {idx + 1}")
+            elif slide_role == ROLE_AGENDA:
+                default_content['title'] = "Agenda"
+            else:
+                default_content['title'] = plan.get('slide_intent', f"Content Slide {idx + 1}")
+        
+        if 'bullets' in available_roles:
+            # Generate role-appropriate bullets
+            if slide_role == ROLE_AGENDA:
+                default_content['bullets'] = ["Overview", "Key Topics", "Next Steps"]
+            else:
+                default_content['bullets'] = [
+                    "Key point from project documentation",
+                    "Supporting detail or evidence",
+                    "Actionable insight or takeaway"
+                ]
+        
+        if 'body' in available_roles:
+            default_content['body'] = f"Content for {slide_role} slide based on: {plan.get('slide_intent', 'project context')}"
+        
+        print(f"  → Using fallback content with fields: {list(default_content.keys())}")
+        
+        background_spec: BackgroundImageSpec = {
+            "enabled": False,
+            "keywords": "",
+            "mood": "",
+            "composition": "",
+            "overlay_opacity": 0.0
+        }
+        return {
+            "layout_index": l_idx,
+            "content": default_content,
+            "slide_role": slide_role,
+            "background_image": background_spec,
+            "_semantic_mapping": available_roles  # Store for Injector
+        }
+
+
+def writer_node(state: PPTState):
+    """
+    Generates content for each slide using SEMANTIC FIELDS (title, bullets, body, image_query).
+    This eliminates the need for arbitrary slot_id addressing, preventing overlap bugs.
+    
+    Slides are written concurrently (bounded by WRITER_MAX_CONCURRENCY); the manifest
+    is reassembled in plan order.
+    """
+    slide_plans = state.get("slide_plans", [])
+    content_map = state.get("content_map", "")
+    registry = state.get("registry", {})
+    
+    if WRITER_MAX_CONCURRENCY <= 1 or len(slide_plans) <= 1:
+        final_manifest: List[ManifestEntry] = [
+            _write_slide(idx, plan, content_map, registry)
+            for idx, plan in enumerate(slide_plans)
+        ]
+    else:
+        workers = min(WRITER_MAX_CONCURRENCY, len(slide_plans))
+        print(f"--- Writer: Writing {len(slide_plans)} slides with {workers} concurrent LLM calls ---")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="writer") as pool:
+            # map() yields results in submission order, so the manifest keeps plan order
+            final_manifest = list(pool.map(
+                lambda item: _write_slide(item[0], item[1], content_map, registry),
+                enumerate(slide_plans)
+            ))
         
     print(f"--- Writer: Generated manifest for {len(final_manifest)} slides ---")
     return {"manifest": final_manifest}
\ No newline at end of file
@@ -6,41 +6,54 @@ from langchain_openai import AzureChatOpenAI, ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 from src.utils.vault_client import VaultClient
+from src.utils.llm_cache import CachedLLM, get_llm_cache
+from src.config import LLM_CACHE_ENABLED
+
+
+def _with_cache(llm, provider: str, model: str, temperature: float):
+    """Wrap llm with the persistent response cache when LLM_CACHE_ENABLED."""
+    if not LLM_CACHE_ENABLED:
+        return llm
+    return CachedLLM(llm, get_llm_cache(), provider=provider, model=model, temperature=temperature)
 
 @lru_cache(maxsize=4)
 def get_llm(deployment_name="gpt-4-turbo", temperature=0):
     """
     Get LLM instance based on available environment variables.
     Supports: OpenAI, Azure OpenAI, Anthropic Claude, Google Gemini
+    Responses are served from the persistent LLM cache when it is enabled.
     """
     # Check for different LLM providers in order of preference
     
     # 1. Try OpenAI (direct API)
     if os.getenv("OPENAI_API_KEY"):
         print("🤖 Using OpenAI API")
-        return ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
+        model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+        return _with_cache(ChatOpenAI(
+            model=model,
             temperature=temperature,
             api_key=os.getenv("OPENAI_API_KEY")
-        )
+        ), "openai", model, temperature)
     
     # 2. Try Anthropic Claude
     if os.getenv("ANTHROPIC_API_KEY"):
         print("🤖 Using Anthropic Claude")
-        return ChatAnthropic(
-            model=os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022"),
+        model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
+        return _with_cache(ChatAnthropic(
+            model=model,
             temperature=temperature,
             api_key=os.getenv("ANTHROPIC_API_KEY")
-        )
+        ), "anthropic", model, temperature)
     
     # 3. Try Google Gemini
     if os.getenv("GOOGLE_API_KEY"):
         print("🤖 Using Google Gemini")
-        return ChatGoogleGenerativeAI(
-            model=os.getenv("GOOGLE_MODEL", "gemini-pro"),
+        model = os.getenv("GOOGLE_MODEL", "gemini-pro")
+        return _with_cache(ChatGoogleGenerativeAI(
+            model=model,
             temperature=temperature,
             google_api_key=os.getenv("GOOGLE_API_KEY")
-        )
+        ), "google", model, temperature)
     
     # 4. Try Azure OpenAI (with cached vault key)
     if os.getenv("KEYVAULTURL"):
@@ -56,13 +69,13 @@ def get_llm(deployment_name="gpt-4-turbo", temperature=0):
         if not endpoint:
             raise ValueError("❌ Missing APIBASE_o in .env")
 
-        return AzureChatOpenAI(
+        return _with_cache(AzureChatOpenAI(
             azure_deployment=real_deployment,
             api_version=api_version,
             azure_endpoint=endpoint,
             api_key=api_key,
             temperature=temperature
-        )
+        ), "azure", real_deployment, temperature)
     
     # No API keys found
     raise ValueError(
@@ -0,0 +1,96 @@
+"""
+Delivery of rendered decks: chunked streaming of in-memory .pptx bytes and
+asynchronous persistence to data/outputs.
+
+Decks rendered with render_to_memory never wait on disk I/O before the
+response. DeckPersister writes them on a background thread (temp file +
+os.replace, so /api/history and /api/download never see a partial file) and
+keeps each deck in memory until its write has finished, so a download issued
+right after generation is served from memory instead of a 404.
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, Optional
+
+PPTX_MIMETYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+def iter_chunks(data: bytes, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield data in chunk_size slices (memoryview: no copy of the whole deck)."""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write data to path via a temp file in the same directory and os.replace."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class DeckPersister:
+    """Background writer for rendered decks; pending decks stay readable from memory."""
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deck-persist")
+        self._pending: Dict[str, bytes] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, data: bytes) -> Future:
+        """Queue data to be written to path; returns the write's Future."""
+        key = os.path.abspath(path)
+        with self._lock:
+            self._pending[key] = data
+            future = self._executor.submit(self._write, key, data)
+            self._futures[key] = future
+        return future
+
+    def _write(self, key: str, data: bytes) -> None:
+        try:
+            write_atomic(key, data)
+        except Exception as e:
+            print(f"⚠️ Deck persister: failed to write {key}: {e}")
+        finally:
+            with self._lock:
+                # A newer submit for the same path keeps its own pending bytes
+                if self._pending.get(key) is data:
+                    del self._pending[key]
+                    del self._futures[key]
+
+    def pending(self, path: str) -> Optional[bytes]:
+        """Bytes of a deck queued for path whose write has not finished yet, else None."""
+        with self._lock:
+            return self._pending.get(os.path.abspath(path))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued writes; True when all finished within timeout."""
+        with self._lock:
+            futures = list(self._futures.values())
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+
+_default_persister: Optional[DeckPersister] = None
+_default_persister_lock = threading.Lock()
+
+
+def get_deck_persister() -> DeckPersister:
+    """Process-wide deck persister."""
+    global _default_persister
+    if _default_persister is None:
+        with _default_persister_lock:
+            if _default_persister is None:
+                _default_persister = DeckPersister()
+    return _default_persister
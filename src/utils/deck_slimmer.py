@@ -0,0 +1,153 @@
+"""
+Output slimming: drop the master-template parts a rendered deck never uses.
+
+A .pptx keeps every layout of every master (and whatever media, themes and
+custom XML those pull in) even when the deck uses a handful of them. Parts
+are saved by walking relationships from the package root, so slimming only
+has to cut relationships: layouts no slide uses, masters left without a used
+layout, and custom XML. Whatever is no longer reachable (their media, themes,
+tags, ...) is simply not written on save.
+
+Slimming shifts layout positions, so a slimmed deck records which of its first
+master's layouts it kept (original indices) in a custom document property;
+see slimmed_layout_indices.
+"""
+from typing import Dict, List, Optional, Set
+
+from lxml import etree
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.opc.packuri import PackURI
+
+# Custom document property listing the original indices of the first master's kept layouts
+SLIMMED_LAYOUTS_PROPERTY = "SlimmedLayoutIndices"
+
+_CUSTOM_PROPS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/custom-properties"
+_VT_NS = "http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes"
+_CUSTOM_PROPS_FMTID = "{D5CDD505-2E9C-101B-9397-08002B2CF9AE}"  # Fixed fmtid for user-defined properties
+
+
+def _drop_list_entries(id_lst, rIds: Set[str]) -> None:
+    """Remove p:sldLayoutId / p:sldMasterId entries pointing at dropped relationships."""
+    if id_lst is None:
+        return
+    for entry in list(id_lst):
+        if entry.rId in rIds:
+            id_lst.remove(entry)
+
+
+def _drop_rels(rels, reltype: str, keep: Optional[Set] = None) -> Set[str]:
+    """Pop relationships of reltype whose target is not in keep; returns their rIds."""
+    dropped = {rId for rId, rel in rels.items()
+               if rel.reltype == reltype and not rel.is_external
+               and (keep is None or rel.target_part not in keep)}
+    for rId in dropped:
+        rels.pop(rId)
+    return dropped
+
+
+def slim_presentation(prs, archive=None) -> Dict[str, int]:
+    """
+    Remove unused layouts, masters and custom XML (and everything only they reference) from prs.
+
+    Decks without slides are left alone, so there is always a master and a layout.
+
+    Args:
+        prs: Rendered Presentation (mutated in place)
+        archive: TemplateArchive of the master, used to size removed parts by
+                 their compressed entries (uncompressed part size otherwise)
+
+    Returns:
+        Counters: layouts/masters/parts removed and bytes_saved (approximate zip bytes)
+    """
+    stats = {"layouts_removed": 0, "masters_removed": 0, "parts_removed": 0, "bytes_saved": 0}
+    prs_part = prs.part
+    package = prs_part.package
+    slide_parts = [rel.target_part for rel in prs_part.rels.values() if rel.reltype == RT.SLIDE]
+    if not slide_parts:
+        return stats
+
+    before = set(package.iter_parts())
+    used_layouts = {slide_part.part_related_by(RT.SLIDE_LAYOUT) for slide_part in slide_parts}
+    kept_indices = [i for i, layout in enumerate(prs.slide_layouts) if layout.part in used_layouts]
+    used_masters = {layout.part_related_by(RT.SLIDE_MASTER) for layout in used_layouts}
+
+    for rel in list(prs_part.rels.values()):
+        if rel.reltype == RT.SLIDE_MASTER and rel.target_part in used_masters:
+            master = rel.target_part
+            _drop_list_entries(master._element.sldLayoutIdLst, _drop_rels(master.rels, RT.SLIDE_LAYOUT, used_layouts))
+    # Unused masters take all of their layouts with them
+    _drop_list_entries(prs_part._element.sldMasterIdLst, _drop_rels(prs_part.rels, RT.SLIDE_MASTER, used_masters))
+    _drop_rels(prs_part.rels, RT.CUSTOM_XML)
+    _drop_rels(package._rels, RT.CUSTOM_XML)
+    _set_custom_property(package, SLIMMED_LAYOUTS_PROPERTY, ",".join(str(i) for i in kept_indices))
+
+    removed = before - set(package.iter_parts())
+    stats["layouts_removed"] = sum(1 for part in removed if part.content_type == CT.PML_SLIDE_LAYOUT)
+    stats["masters_removed"] = sum(1 for part in removed if part.content_type == CT.PML_SLIDE_MASTER)
+    stats["parts_removed"] = len(removed)
+    stats["bytes_saved"] = sum(_stored_size(part, archive) for part in removed)
+    return stats
+
+
+def _stored_size(part, archive) -> int:
+    """Bytes a part (and its .rels) would take in the saved zip."""
+    names = [part.partname.membername]
+    if part._rels:
+        names.append(part.partname.rels_uri.membername)
+    size = 0
+    for name in names:
+        info = archive.infos.get(name) if archive is not None else None
+        if info is not None:
+            size += info.compress_size
+        elif name == names[0]:
+            size += len(part.blob)
+    return size
+
+
+def _custom_properties(package, create: bool = False) -> Optional[Part]:
+    """The package's docProps/custom.xml part (added empty when create and missing)."""
+    for rel in package._rels.values():
+        if rel.reltype == RT.CUSTOM_PROPERTIES and not rel.is_external:
+            return rel.target_part
+    if not create:
+        return None
+    blob = etree.tostring(etree.Element(f"{{{_CUSTOM_PROPS_NS}}}Properties", nsmap={None: _CUSTOM_PROPS_NS, "vt": _VT_NS}),
+                          xml_declaration=True, encoding="UTF-8", standalone=True)
+    part = Part(PackURI("/docProps/custom.xml"), CT.OFC_CUSTOM_PROPERTIES, package, blob)
+    package.relate_to(part, RT.CUSTOM_PROPERTIES)
+    return part
+
+
+def _set_custom_property(package, name: str, value: str) -> None:
+    """Add or replace a string custom document property."""
+    part = _custom_properties(package, create=True)
+    root = etree.fromstring(part.blob)
+    properties = root.findall(f"{{{_CUSTOM_PROPS_NS}}}property")
+    for prop in properties:
+        if prop.get("name") == name:
+            root.remove(prop)
+    pid = max((int(p.get("pid", 1)) for p in properties), default=1) + 1  # pids start at 2
+    prop = etree.SubElement(root, f"{{{_CUSTOM_PROPS_NS}}}property",
+                            fmtid=_CUSTOM_PROPS_FMTID, pid=str(pid), name=name)
+    etree.SubElement(prop, f"{{{_VT_NS}}}lpwstr").text = value
+    part._blob = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def slimmed_layout_indices(prs) -> Optional[List[int]]:
+    """
+    Original indices of the layouts a slimmed deck kept, in prs.slide_layouts order.
+
+    prs.slide_layouts[k] of a slimmed deck is the master's layout at index
+    result[k]. Returns None for decks that were not slimmed.
+    """
+    part = _custom_properties(prs.part.package)
+    if part is None:
+        return None
+    root = etree.fromstring(part.blob)
+    for prop in root.iterfind(f"{{{_CUSTOM_PROPS_NS}}}property"):
+        if prop.get("name") == SLIMMED_LAYOUTS_PROPERTY:
+            value = prop.findtext(f"{{{_VT_NS}}}lpwstr") or ""
+            return [int(i) for i in value.split(",") if i]
+    return None
@@ -0,0 +1,183 @@
+"""
+Passthrough deck writer: saves a Presentation built from a pooled master by
+copying every unchanged template zip entry byte-for-byte (no inflate/deflate)
+and compressing only the parts that are new or differ from the master.
+
+A part counts as unchanged when python-pptx would serialize it exactly as it
+serializes the pristine master's part of the same name; the master's original
+compressed entry is then copied as-is. Entry order and content types match
+python-pptx's PackageWriter.
+
+DeckArchive does the same against a previously saved deck (incremental
+re-render), comparing entry content instead of a pristine serialization.
+"""
+import copy
+import io
+import struct
+import zipfile
+import zlib
+from typing import IO, Dict, Optional, Union
+
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.serialized import _ContentTypesItem
+
+_DATA_DESCRIPTOR = 0x08       # General purpose flag bit 3: sizes/CRC follow the data
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+# Private ZipFile state copy_raw writes through (present in CPython 3.8-3.13)
+_RAW_COPY_ATTRS = ("fp", "start_dir", "filelist", "NameToInfo", "_didModify")
+
+
+def _content_types_xml(parts) -> bytes:
+    return serialize_part_xml(_ContentTypesItem.xml_for(parts))
+
+
+class _ZipArchive:
+    """Raw entries of a zip held in memory, read without inflating."""
+
+    def __init__(self, blob: bytes):
+        self._blob = blob
+        self._zip = zipfile.ZipFile(io.BytesIO(blob))
+        self.infos = {info.filename: info for info in self._zip.infolist()}
+
+    def _copyable(self, name: str) -> Optional[zipfile.ZipInfo]:
+        info = self.infos.get(name)
+        if info is None or info.compress_size >= zipfile.ZIP64_LIMIT or info.file_size >= zipfile.ZIP64_LIMIT:
+            return None  # Zip64 entries are rewritten: their headers carry extra size fields
+        return info
+
+    def raw_entry(self, name: str):
+        """(ZipInfo, compressed bytes) of an entry, read without inflating."""
+        info = self.infos[name]
+        fields = _LOCAL_HEADER.unpack_from(self._blob, info.header_offset)
+        name_length, extra_length = fields[-2], fields[-1]
+        start = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+        return info, memoryview(self._blob)[start:start + info.compress_size]
+
+
+class TemplateArchive(_ZipArchive):
+    """
+    A master's raw zip entries plus python-pptx's serialization of each of its
+    parts, used to recognize unchanged parts in a deck built from that master.
+    """
+
+    def __init__(self, blob: bytes, pristine_prs):
+        super().__init__(blob)
+        package = pristine_prs.part.package
+        parts = tuple(package.iter_parts())
+        self.serialized: Dict[str, bytes] = {
+            CONTENT_TYPES_URI.membername: _content_types_xml(parts),
+            PACKAGE_URI.rels_uri.membername: package._rels.xml,
+        }
+        for part in parts:
+            self.serialized[part.partname.membername] = part.blob
+            if part._rels:
+                self.serialized[part.partname.rels_uri.membername] = part.rels.xml
+
+    def unchanged(self, name: str, blob: bytes) -> bool:
+        """Whether the template entry `name` can stand in for `blob`."""
+        return self._copyable(name) is not None and self.serialized.get(name) == blob
+
+
+class DeckArchive(_ZipArchive):
+    """
+    A previously saved deck; an entry is unchanged when its content equals the
+    new part's bytes (size and CRC first, so most changed parts are never inflated).
+    """
+
+    def unchanged(self, name: str, blob: bytes) -> bool:
+        """Whether the deck entry `name` holds exactly `blob`."""
+        info = self._copyable(name)
+        if info is None or info.file_size != len(blob) or info.CRC != zlib.crc32(blob):
+            return False
+        return self._zip.read(info) == blob
+
+
+class _PassthroughZip:
+    """
+    zipfile.ZipFile writer that can also append pre-compressed template entries.
+
+    Raw copies go through ZipFile's private state; if a zipfile version lacks any of
+    it (or the output cannot seek), can_copy_raw is False and callers write instead.
+    """
+
+    def __init__(self, file: Union[str, IO[bytes]], compresslevel: Optional[int]):
+        self.zf = zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED,
+                                  compresslevel=compresslevel, strict_timestamps=False)
+        self.can_copy_raw = (
+            all(hasattr(self.zf, attr) for attr in _RAW_COPY_ATTRS)
+            and hasattr(self.zf.fp, "seek")
+        )
+        if not self.can_copy_raw:
+            print("⚠️  Deck writer: zipfile internals not available, recompressing every entry")
+        self.copied = self.written = 0
+        self.copied_bytes = self.written_bytes = 0
+
+    def write(self, name: str, blob: bytes) -> None:
+        self.zf.writestr(name, blob)
+        self.written += 1
+        self.written_bytes += len(blob)
+
+    def copy_raw(self, info: zipfile.ZipInfo, data) -> None:
+        """Append a compressed entry as-is (sizes and CRC taken from the central directory)."""
+        zf = self.zf
+        zinfo = copy.copy(info)
+        # Sizes go in the local header we write, so no trailing data descriptor
+        zinfo.flag_bits &= ~_DATA_DESCRIPTOR
+        zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.start_dir
+        zf.fp.write(zinfo.FileHeader())
+        zf.fp.write(data)
+        # Leaves fp at start_dir, so the next writestr appends here whether or not it seeks
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf._didModify = True
+        self.copied += 1
+        self.copied_bytes += info.file_size
+
+    def close(self) -> None:
+        self.zf.close()
+
+
+def save_presentation(prs, file: Union[str, IO[bytes]], archive: Optional[TemplateArchive] = None,
+                      compresslevel: Optional[int] = None) -> Dict[str, int]:
+    """
+    Save prs like prs.save(file), copying unchanged entries from archive.
+
+    Args:
+        prs: Presentation to save
+        file: Output path or writable binary stream
+        archive: TemplateArchive of the master prs was cloned from, or DeckArchive of
+                 the deck prs was loaded from (None = write every part)
+        compresslevel: zlib level (0-9) for the parts that are written; None = zlib default
+
+    Returns:
+        Counters: copied/written entries and their uncompressed bytes
+    """
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+    writer = _PassthroughZip(file, compresslevel)
+
+    def emit(name: str, blob: bytes) -> None:
+        if archive is not None and writer.can_copy_raw and archive.unchanged(name, blob):
+            writer.copy_raw(*archive.raw_entry(name))
+        else:
+            writer.write(name, blob)
+
+    try:
+        emit(CONTENT_TYPES_URI.membername, _content_types_xml(parts))
+        emit(PACKAGE_URI.rels_uri.membername, package._rels.xml)
+        for part in parts:
+            emit(part.partname.membername, part.blob)
+            if part._rels:
+                emit(part.partname.rels_uri.membername, part.rels.xml)
+    finally:
+        writer.close()
+
+    return {
+        "copied": writer.copied,
+        "written": writer.written,
+        "copied_bytes": writer.copied_bytes,
+        "written_bytes": writer.written_bytes,
+    }
@@ -0,0 +1,341 @@
+"""
+Persistent LLM response cache shared by extractor, architect and writer, plus the
+content-addressed extractor cache (source text and content maps).
+Backed by SQLite (WAL mode), so several worker processes can share one cache file.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from langchain_core.messages import AIMessage
+
+
+class SqliteCache:
+    """
+    Key/value store with TTL expiry, a total-size cap with LRU eviction and hit/miss counters.
+
+    Values are bytes. Connections are per-thread; SQLite's own locking makes the
+    store safe across processes. The total size is kept in a one-row table by
+    triggers (same transaction as each write), so eviction never scans the cache.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+        conn.execute("BEGIN IMMEDIATE")  # One process seeds the total for caches created before it was kept
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_total ("
+                " id INTEGER PRIMARY KEY CHECK (id = 0),"
+                " bytes INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO cache_total (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM cache")
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_total_insert AFTER INSERT ON cache"
+                " BEGIN UPDATE cache_total SET bytes = bytes + NEW.size WHERE id = 0; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_total_delete AFTER DELETE ON cache"
+                " BEGIN UPDATE cache_total SET bytes = bytes - OLD.size WHERE id = 0; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_total_update AFTER UPDATE OF size ON cache"
+                " BEGIN UPDATE cache_total SET bytes = bytes + NEW.size - OLD.size WHERE id = 0; END"
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hit: bool):
+        with self._counter_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value, or None on miss/expiry."""
+        conn = self._conn()
+        row = conn.execute("SELECT value, created FROM cache WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+
+        if row is None:
+            self._count(hit=False)
+            return None
+
+        value, created = row
+        if self.ttl_seconds is not None and now - created > self.ttl_seconds:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._count(hit=False)
+            return None
+
+        conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        self._count(hit=True)
+        return value
+
+    def set(self, key: str, value: bytes):
+        """Store value and evict least recently used entries beyond max_bytes."""
+        now = time.time()
+        conn = self._conn()
+        # Upsert rather than INSERT OR REPLACE: REPLACE's implicit delete does not fire triggers
+        conn.execute(
+            "INSERT INTO cache (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size,"
+            " created = excluded.created, accessed = excluded.accessed",
+            (key, value, len(value), now, now),
+        )
+        self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT bytes FROM cache_total WHERE id = 0").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        overflow = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed ASC"):
+            victims.append((key,))
+            freed += size
+            if freed >= overflow:
+                break
+        conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+
+    def delete(self, key: str):
+        """Drop one entry (no-op if absent)."""
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        """Delete every entry and reset counters."""
+        self._conn().execute("DELETE FROM cache")
+        with self._counter_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus current entry count/size, for health/debug endpoints."""
+        conn = self._conn()
+        entries = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        size = conn.execute("SELECT bytes FROM cache_total WHERE id = 0").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def _prompt_text(prompt: Any) -> str:
+    """Stable text form of a prompt (plain string or message list)."""
+    if isinstance(prompt, str):
+        return prompt
+    return json.dumps(prompt, default=str, sort_keys=True)
+
+
+def _schema_fingerprint(schema: Any) -> str:
+    """Identify a structured-output schema by name and JSON schema."""
+    if schema is None:
+        return "-"
+    if hasattr(schema, "model_json_schema"):
+        body = json.dumps(schema.model_json_schema(), sort_keys=True)
+        name = schema.__name__
+    else:
+        body = json.dumps(schema, sort_keys=True, default=str)
+        name = type(schema).__name__
+    return f"{name}:{hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]}"
+
+
+class CachedLLM:
+    """
+    Wraps a LangChain chat model so invoke()/ainvoke() are served from a SqliteCache.
+
+    Cache key = provider, model, temperature, structured-output schema and prompt hash.
+    Anything not overridden here is delegated to the wrapped model.
+
+    With a validate callable, only responses it accepts are stored (and cached
+    entries it rejects are dropped and re-requested), so a reply the caller cannot
+    parse is not replayed to every retry for the cache's TTL.
+    """
+
+    def __init__(self, llm, cache: SqliteCache, provider: str, model: str, temperature: float,
+                 schema: Any = None, structured_kwargs: Optional[Dict[str, Any]] = None,
+                 validate: Optional[Callable[[Any], Any]] = None):
+        self._llm = llm
+        self._cache = cache
+        self._provider = provider
+        self._model = model
+        self._temperature = temperature
+        self._schema = schema
+        self._structured_kwargs = structured_kwargs or {}
+        self._validate = validate
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._llm, name)
+
+    def _key(self, prompt: Any) -> str:
+        prompt_hash = hashlib.sha256(_prompt_text(prompt).encode("utf-8")).hexdigest()
+        options = json.dumps(self._structured_kwargs, sort_keys=True, default=str)
+        return "|".join([
+            self._provider,
+            self._model,
+            str(self._temperature),
+            _schema_fingerprint(self._schema),
+            options,
+            prompt_hash,
+        ])
+
+    def _encode(self, response: Any) -> bytes:
+        if self._schema is None:
+            return json.dumps({"content": response.content}).encode("utf-8")
+        if hasattr(response, "model_dump_json"):
+            return response.model_dump_json().encode("utf-8")
+        return json.dumps(response, default=str).encode("utf-8")
+
+    def _decode(self, blob: bytes) -> Any:
+        if self._schema is None:
+            return AIMessage(content=json.loads(blob)["content"])
+        if hasattr(self._schema, "model_validate_json"):
+            return self._schema.model_validate_json(blob)
+        return json.loads(blob)
+
+    def _accepted(self, response: Any) -> bool:
+        """Whether validate accepts response (falsy results and exceptions reject it)."""
+        if self._validate is None:
+            return True
+        try:
+            return bool(self._validate(response))
+        except Exception:
+            return False
+
+    def _lookup(self, key: str) -> Any:
+        """Cached response for key, or None (rejected entries are dropped)."""
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        response = self._decode(cached)
+        if self._accepted(response):
+            return response
+        self._cache.delete(key)
+        return None
+
+    def _store(self, key: str, response: Any):
+        if self._accepted(response):
+            self._cache.set(key, self._encode(response))
+
+    def invoke(self, prompt: Any, *args, **kwargs):
+        key = self._key(prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self._llm.invoke(prompt, *args, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def ainvoke(self, prompt: Any, *args, **kwargs):
+        key = self._key(prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self._llm.ainvoke(prompt, *args, **kwargs)
+        self._store(key, response)
+        return response
+
+    def with_validator(self, validate: Callable[[Any], Any]) -> "CachedLLM":
+        """Same cache and key, storing only responses validate accepts (truthy, no exception)."""
+        return CachedLLM(
+            self._llm,
+            self._cache,
+            self._provider,
+            self._model,
+            self._temperature,
+            schema=self._schema,
+            structured_kwargs=self._structured_kwargs,
+            validate=validate,
+        )
+
+    def with_structured_output(self, schema: Any, **kwargs):
+        """Structured variant; responses round-trip through the schema's JSON form."""
+        return CachedLLM(
+            self._llm.with_structured_output(schema, **kwargs),
+            self._cache,
+            self._provider,
+            self._model,
+            self._temperature,
+            schema=schema,
+            structured_kwargs=kwargs,
+        )
+
+
+def with_response_validator(llm, validate: Callable[[Any], Any]):
+    """llm storing only responses validate accepts; uncached models are returned unchanged."""
+    if isinstance(llm, CachedLLM):
+        return llm.with_validator(validate)
+    return llm
+
+
+_default_cache: Optional[SqliteCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> SqliteCache:
+    """Process-wide response cache configured from src.config."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                from src.config import LLM_CACHE_PATH, LLM_CACHE_MAX_MB, LLM_CACHE_TTL_SECONDS
+                _default_cache = SqliteCache(
+                    LLM_CACHE_PATH,
+                    max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+                    ttl_seconds=LLM_CACHE_TTL_SECONDS or None,
+                )
+    return _default_cache
+
+
+_content_cache: Optional[SqliteCache] = None
+
+
+def get_content_cache() -> SqliteCache:
+    """Process-wide content-addressed extractor cache (no TTL: keys are content hashes)."""
+    global _content_cache
+    if _content_cache is None:
+        with _default_cache_lock:
+            if _content_cache is None:
+                from src.config import CONTENT_CACHE_PATH, CONTENT_CACHE_MAX_MB
+                _content_cache = SqliteCache(CONTENT_CACHE_PATH, max_bytes=CONTENT_CACHE_MAX_MB * 1024 * 1024)
+    return _content_cache
@@ -1,13 +1,61 @@
 # src/utils/ppt_helper.py
 from pptx.util import Pt
-from pptx.enum.text import PP_ALIGN
+from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 import re
+
+
+class PlaceholderIndex:
+    """
+    Placeholder lookup table for one slide, built with a single pass over
+    slide.placeholders right after add_slide.
+    
+    Keys: placeholder idx, placeholder type string (e.g. "TITLE (1)") and shape name.
+    When several shapes share a key the first one in slide order wins, matching
+    the linear scans this replaces.
+    """
+    
+    def __init__(self, slide):
+        self.by_idx = {}
+        self.by_name = {}
+        self._types = []  # (type string, shape) in slide order
+        self._type_matches = {}
+        
+        for shape in slide.placeholders:
+            try:
+                fmt = shape.placeholder_format
+                self.by_idx.setdefault(fmt.idx, shape)
+                self._types.append((str(fmt.type), shape))
+            except Exception:
+                pass
+            name = getattr(shape, 'name', None)
+            if name is not None:
+                self.by_name.setdefault(name, shape)
+    
+    def get(self, idx):
+        """Placeholder with the given idx, or None."""
+        return self.by_idx.get(idx)
+    
+    def by_type(self, type_name):
+        """First placeholder whose type string contains type_name (e.g. "BODY"), or None."""
+        if type_name not in self._type_matches:
+            self._type_matches[type_name] = next(
+                (shape for type_str, shape in self._types if type_name in type_str), None
+            )
+        return self._type_matches[type_name]
+    
+    def named(self, name):
+        """Placeholder with the given shape name, or None."""
+        return self.by_name.get(name)
+
  
-def find_placeholder_by_id(slide, idx):
+def find_placeholder_by_id(slide, idx, index=None):
     """
     Finds a specific placeholder on a given slide by its unique idx.
+    Pass a PlaceholderIndex for the slide to avoid rescanning its placeholders.
     """
+    if index is not None:
+        return index.get(idx)
     for shape in slide.placeholders:
         if shape.placeholder_format.idx == idx:
             return shape
@@ -247,4 +295,20 @@ def format_text_in_placeholder(shape, content, geometry_meta):
     
     # Set text frame properties for better fitting
     text_frame.word_wrap = True
-    text_frame.auto_size = None  # Don't auto-resize
\ No newline at end of file
+    text_frame.auto_size = None  # Don't auto-resize
+
+
+def set_norm_autofit(text_frame, font_scale=None):
+    """
+    Switch a text frame to shrink-on-overflow (<a:normAutofit>) with an explicit
+    fontScale, so PowerPoint opens the slide already fitted instead of
+    recomputing the scale on first edit.
+    
+    Args:
+        text_frame: python-pptx TextFrame
+        font_scale: Percentage (1.0-100.0) applied to the text's font sizes; None
+            writes a bare <a:normAutofit/>
+    """
+    text_frame.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+    if font_scale is not None and font_scale < 100:
+        text_frame._txBody.bodyPr.normAutofit.fontScale = max(1.0, float(font_scale))
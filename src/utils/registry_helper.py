@@ -3,14 +3,23 @@ Search Engine for Template Registry
 Helps the system "load the menu" before the Slide Architect starts working.
 """
 import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 def load_all_registries(registry_dir: str = "data/registry/") -> Dict[str, Any]:
     """
     Scans the registry folder and combines all JSON metadata 
     into a single searchable dictionary.
     
+    Prefer RegistryStore on request paths; this eagerly parses every registry.
+    
     Returns:
         Dict[str, Any]: A dictionary where keys are template filenames (without extension)
                         and values are the layout metadata.
@@ -28,12 +37,298 @@ def load_all_registries(registry_dir: str = "data/registry/") -> Dict[str, Any]:
     
     for json_file in found_files:
         try:
-            with open(json_file, "r") as f:
-                data = json.load(f)
-                # We key it by the filename so the Architect knows which master it belongs to
-                # json_file.stem gives us 'brand_guide' from 'brand_guide.json'
-                combined[json_file.stem] = data
+            data = load_registry(json_file)
+            # We key it by the filename so the Architect knows which master it belongs to
+            # json_file.stem gives us 'brand_guide' from 'brand_guide.json'
+            combined[json_file.stem] = data
         except Exception as e:
             print(f"Error loading {json_file}: {e}")
             
     return combined
+
+
+# Binary snapshot written next to each registry JSON (<stem>.pkl); bump on format change
+SNAPSHOT_SUFFIX = ".pkl"
+SNAPSHOT_VERSION = 1
+
+
+def _intern_strings(obj):
+    """Return obj with every dict key and string value interned (shared on load)."""
+    if isinstance(obj, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: _intern_strings(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_strings(v) for v in obj]
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    return obj
+
+
+# Process umask, read once (os.umask can only be queried by setting it, which is not thread-safe)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _atomic_write_bytes(path: Path, payload: bytes):
+    """
+    Write payload to path via a temp file + os.replace, so readers never see a partial file.
+
+    The result keeps the mode of the file it replaces (or the umask default for a new
+    file) rather than mkstemp's owner-only 0600.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def snapshot_path(json_path) -> Path:
+    """Location of the binary snapshot for a registry JSON file."""
+    return Path(json_path).with_suffix(SNAPSHOT_SUFFIX)
+
+
+def write_registry_snapshot(json_path, data: Optional[Dict[str, Any]] = None,
+                            stat: Optional[os.stat_result] = None) -> Path:
+    """
+    Write a pickle-protocol-5 snapshot of a registry next to its JSON.
+
+    Strings are interned before pickling, so repeated keys/values ("semantic_role",
+    "TITLE (1)", ...) are stored once and shared in memory after loading. The
+    snapshot records the JSON's mtime/size; load_registry ignores it once the JSON
+    changes. Snapshots are trusted local cache files, never user uploads.
+
+    When passing data, pass the os.stat taken before that data was read: the stamp
+    must never be newer than the content, or a JSON replaced in between would be
+    served from the old snapshot as fresh.
+    """
+    json_path = Path(json_path)
+    if data is None:
+        stat = os.stat(json_path)  # Before reading: a concurrent replace only makes the snapshot stale
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    elif stat is None:
+        stat = os.stat(json_path)
+    payload = pickle.dumps(
+        {
+            "version": SNAPSHOT_VERSION,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "source_size": stat.st_size,
+            "data": _intern_strings(data),
+        },
+        protocol=5,
+    )
+    target = snapshot_path(json_path)
+    _atomic_write_bytes(target, payload)
+    return target
+
+
+def _read_snapshot(json_path: Path, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Snapshot contents if it exists and matches the JSON, else None."""
+    try:
+        with open(snapshot_path(json_path), "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("version") != SNAPSHOT_VERSION
+        or snapshot.get("source_mtime_ns") != stat.st_mtime_ns
+        or snapshot.get("source_size") != stat.st_size
+    ):
+        return None
+    return snapshot["data"]
+
+
+def write_registry(json_path, data) -> Path:
+    """
+    Atomically write a registry JSON (indent=4) plus its binary snapshot.
+
+    data may be a dict or an already-serialized JSON string. A crash mid-write
+    leaves the previous registry in place, never a half-written file.
+    """
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    text = data if isinstance(data, str) else json.dumps(data, indent=4)
+    _atomic_write_bytes(json_path, text.encode("utf-8"))
+    write_registry_snapshot(json_path)
+    return json_path
+
+
+def load_registry(json_path, refresh_snapshot: bool = True) -> Dict[str, Any]:
+    """
+    Load one registry, preferring its binary snapshot.
+
+    Falls back to the JSON when the snapshot is missing or stale; with
+    refresh_snapshot the snapshot is then rewritten (best effort) for the next load.
+    """
+    json_path = Path(json_path)
+    stat = os.stat(json_path)
+    data = _read_snapshot(json_path, stat)
+    if data is not None:
+        return data
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if refresh_snapshot:
+        try:
+            write_registry_snapshot(json_path, data, stat)
+        except OSError as e:
+            print(f"⚠️  Registry Helper: could not write snapshot for {json_path.name}: {e}")
+    return data
+
+
+class RegistryStore:
+    """
+    Lazy, in-memory registry cache with mtime revalidation and LRU eviction.
+
+    - get(key) parses a registry on first use only; later calls cost one os.stat
+    - catalog() lists available registries; the directory is re-scanned only
+      when the directory's own mtime changes (file added/removed/replaced)
+
+    Returned registries are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, registry_dir: str = "data/registry/", max_entries: int = 8):
+        self.registry_dir = Path(registry_dir)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (mtime_ns, size, data)
+        self._catalog: Optional[Dict[str, Dict[str, Any]]] = None
+        self._catalog_mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path_for(self, template_key: str) -> Path:
+        return self.registry_dir / f"{template_key}.json"
+
+    def get(self, template_key: str) -> Optional[Dict[str, Any]]:
+        """Return the registry for template_key, or None if it does not exist."""
+        path = self._path_for(template_key)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(template_key, None)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(template_key)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._entries.move_to_end(template_key)
+                self.hits += 1
+                return entry[2]
+
+        # Load outside the lock so one large registry doesn't block other lookups
+        data = load_registry(path)
+        print(f"--- Registry Store: Loaded {path.name} ---")
+
+        with self._lock:
+            self.misses += 1
+            self._entries[template_key] = (stat.st_mtime_ns, stat.st_size, data)
+            self._entries.move_to_end(template_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def catalog(self) -> Dict[str, Dict[str, Any]]:
+        """List available registries (key -> {path, mtime, size}) without parsing them."""
+        try:
+            dir_mtime = os.stat(self.registry_dir).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+
+        with self._lock:
+            if self._catalog is not None and self._catalog_mtime_ns == dir_mtime:
+                return self._catalog
+
+        catalog = {}
+        for entry in os.scandir(self.registry_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                catalog[entry.name[:-len(".json")]] = {
+                    "path": entry.path,
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                }
+
+        with self._lock:
+            self._catalog = catalog
+            self._catalog_mtime_ns = dir_mtime
+        return catalog
+
+    def has(self, template_key: str) -> bool:
+        """True if a registry exists for template_key (catalog lookup, no parsing)."""
+        return template_key in self.catalog()
+
+    def publish(self, template_key: str, data: Dict[str, Any]):
+        """
+        Swap in a freshly written registry without waiting for the next get() to reload it.
+
+        The entry is stamped with the file's current stat, so readers keep getting the
+        old registry until this call and the new one (with no reload) after it.
+        """
+        stat = os.stat(self._path_for(template_key))
+        with self._lock:
+            self._entries[template_key] = (stat.st_mtime_ns, stat.st_size, data)
+            self._entries.move_to_end(template_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._catalog = None
+            self._catalog_mtime_ns = None
+
+    def invalidate(self, template_key: Optional[str] = None):
+        """Drop one cached registry (or everything, including the catalog)."""
+        with self._lock:
+            if template_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(template_key, None)
+            self._catalog = None
+            self._catalog_mtime_ns = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for health/debug endpoints."""
+        with self._lock:
+            return {
+                "cached": list(self._entries.keys()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+@lru_cache(maxsize=None)
+def get_registry_store(registry_dir: str = "data/registry/") -> RegistryStore:
+    """Process-wide RegistryStore for a registry directory."""
+    return RegistryStore(registry_dir)
+
+
+# Template folder listings, keyed by directory -> (dir mtime_ns, files)
+_template_listing_cache: Dict[str, tuple] = {}
+
+
+def list_template_files(templates_dir: str = "data/templates") -> List[str]:
+    """
+    List .pptx filenames in templates_dir, re-scanning only when the directory mtime changes.
+
+    Returns:
+        Sorted list of template filenames (e.g. ['template2.pptx'])
+    """
+    dir_mtime = os.stat(templates_dir).st_mtime_ns
+    cached = _template_listing_cache.get(templates_dir)
+    if cached is not None and cached[0] == dir_mtime:
+        return cached[1]
+
+    files = sorted(name for name in os.listdir(templates_dir) if name.endswith(".pptx"))
+    _template_listing_cache[templates_dir] = (dir_mtime, files)
+    return files
@@ -0,0 +1,182 @@
+"""
+Precomputed registry lookups shared by the Pipeline 2 nodes.
+
+build_registry_node embeds the indexes in the registry JSON ("indexes" key) as
+positions into the layouts/slots lists; RegistryIndex resolves them once per
+registry object, so nodes never rescan layouts or regroup slots per slide.
+Registries written before the indexes existed are indexed on first use.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.core.geometry import SlotGeometry
+
+INDEX_VERSION = 1
+
+
+def _slot_id(slot: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(slot.get("slot_id"))
+    except (TypeError, ValueError):
+        return None
+
+
+def stable_key(layout_index: int, slot: Dict[str, Any]) -> str:
+    """Same format as SlotSchema.stable_key."""
+    return f"{layout_index}:{slot.get('placeholder_type')}:{slot.get('placeholder_idx')}"
+
+
+def build_registry_indexes(registry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the JSON-serializable lookup indexes for a registry dict.
+
+    All values are positions ([layout position] or [layout position, slot position])
+    so the indexes stay small and never duplicate slot data. Keys are strings (JSON).
+    """
+    layout_positions = {}
+    slots_by_role = {}
+    slots_by_id = {}
+    stable_keys = {}
+
+    for l_pos, layout in enumerate(registry.get("layouts", [])):
+        l_key = str(layout["layout_index"])
+        layout_positions.setdefault(l_key, l_pos)
+        roles = {}
+        ids = {}
+        for s_pos, slot in enumerate(layout.get("slots", []) or []):
+            roles.setdefault(slot.get("semantic_role", "body"), []).append(s_pos)
+            sid = _slot_id(slot)
+            if sid is not None:
+                ids.setdefault(str(sid), s_pos)
+            stable_keys.setdefault(stable_key(layout["layout_index"], slot), [l_pos, s_pos])
+        slots_by_role.setdefault(l_key, roles)
+        slots_by_id.setdefault(l_key, ids)
+
+    return {
+        "version": INDEX_VERSION,
+        "layout_positions": layout_positions,
+        "slots_by_role": slots_by_role,
+        "slots_by_id": slots_by_id,
+        "stable_keys": stable_keys,
+    }
+
+
+def _embedded_indexes_valid(indexes: Any, layouts: List[Dict[str, Any]]) -> bool:
+    """
+    Consistency check so stale or hand-edited indexes fall back to recomputing.
+
+    Every layout and slot position must point inside the registry's lists; positions
+    are not otherwise cross-checked against slot contents.
+    """
+    if not isinstance(indexes, dict) or indexes.get("version") != INDEX_VERSION:
+        return False
+    positions = indexes.get("layout_positions")
+    if not isinstance(positions, dict) or len(positions) != len({l.get("layout_index") for l in layouts}):
+        return False
+    try:
+        for key, pos in positions.items():
+            if str(layouts[pos]["layout_index"]) != key:
+                return False
+            slot_count = len(layouts[pos].get("slots", []) or [])
+            roles = indexes["slots_by_role"].get(key, {})
+            # Every slot is filed under exactly one role, so the role lists cover all slots
+            if sum(len(role_positions) for role_positions in roles.values()) != slot_count:
+                return False
+            slot_positions = [s_pos for role_positions in roles.values() for s_pos in role_positions]
+            slot_positions.extend(indexes["slots_by_id"].get(key, {}).values())
+            if not all(0 <= s_pos < slot_count for s_pos in slot_positions):
+                return False
+        return all(
+            0 <= l_pos < len(layouts) and 0 <= s_pos < len(layouts[l_pos].get("slots", []) or [])
+            for l_pos, s_pos in indexes["stable_keys"].values()
+        )
+    except (IndexError, KeyError, TypeError, ValueError, AttributeError):
+        return False
+
+
+class RegistryIndex:
+    """
+    Read-only lookup views over one registry dict.
+
+    Returned layouts and slots are the registry's own dicts; callers must not mutate
+    the returned containers.
+    """
+
+    def __init__(self, registry: Dict[str, Any]):
+        layouts = registry.get("layouts", []) or []
+        indexes = registry.get("indexes")
+        if not _embedded_indexes_valid(indexes, layouts):
+            indexes = build_registry_indexes(registry)
+
+        self._layouts: Dict[int, Dict[str, Any]] = {}
+        self._roles: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+        self._slots: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self._stable: Dict[str, Dict[str, Any]] = {}
+        self._registry = registry
+        self._geometry = None
+
+        for key, l_pos in indexes["layout_positions"].items():
+            layout = layouts[l_pos]
+            slots = layout.get("slots", []) or []
+            layout_index = int(key)
+            self._layouts[layout_index] = layout
+            self._roles[layout_index] = {
+                role: [slots[s_pos] for s_pos in positions]
+                for role, positions in indexes["slots_by_role"].get(key, {}).items()
+            }
+            self._slots[layout_index] = {
+                int(sid): slots[s_pos] for sid, s_pos in indexes["slots_by_id"].get(key, {}).items()
+            }
+        for key, (l_pos, s_pos) in indexes["stable_keys"].items():
+            self._stable[key] = layouts[l_pos]["slots"][s_pos]
+
+    def layout(self, layout_index: Any) -> Optional[Dict[str, Any]]:
+        """Layout dict for a layout_index, or None."""
+        return self._layouts.get(layout_index)
+
+    def slots_by_role(self, layout_index: Any) -> Dict[str, List[Dict[str, Any]]]:
+        """Slots of a layout grouped by semantic_role (registry order), or {}."""
+        return self._roles.get(layout_index, {})
+
+    def slot(self, layout_index: Any, slot_id: Any) -> Optional[Dict[str, Any]]:
+        """Slot dict for a layout's slot_id, or None."""
+        return self._slots.get(layout_index, {}).get(slot_id)
+
+    def by_stable_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """Slot dict for a "layout_index:placeholder_type:placeholder_idx" key, or None."""
+        return self._stable.get(key)
+
+    def geometry(self) -> SlotGeometry:
+        """Columnar geometry of every slot (rows follow the registry's layouts/slots order), built once."""
+        if self._geometry is None:
+            self._geometry = SlotGeometry.from_registry(self._registry)
+        return self._geometry
+
+
+_MAX_CACHED_INDEXES = 32
+_index_cache: "OrderedDict[int, tuple]" = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def get_registry_index(registry: Dict[str, Any]) -> RegistryIndex:
+    """
+    RegistryIndex for a registry dict, cached per registry object.
+
+    The cache holds a reference to the registry, so an id() is never reused while
+    its entry is alive; least recently used entries are dropped beyond a small bound.
+    """
+    key = id(registry)
+    with _index_lock:
+        entry = _index_cache.get(key)
+        if entry is not None and entry[0] is registry:
+            _index_cache.move_to_end(key)
+            return entry[1]
+
+    index = RegistryIndex(registry)
+    with _index_lock:
+        _index_cache[key] = (registry, index)
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > _MAX_CACHED_INDEXES:
+            _index_cache.popitem(last=False)
+    return index
@@ -0,0 +1,198 @@
+"""
+Compiled slide rendering: each layout is cloned into a slide-XML skeleton once,
+and slides are stamped from it with runs emitted straight from the beautifier IR.
+
+python-pptx's add_slide walks the layout's placeholders through proxy objects for
+every slide, scans all presentation relationships for a matching target and all
+p:sldId ids for the next id, and renames every slide part on each `prs.slides`
+access. Text then goes through a proxy per paragraph, run and font property.
+
+Here the skeleton is deep-copied, ids come from counters, and runs are copied
+from per-style templates built once with python-pptx's own oxml setters, so the
+resulting parts are byte-for-byte what the python-pptx path produces.
+"""
+import copy
+from typing import Any, Dict
+
+from pptx.dml.color import RGBColor
+from pptx.enum.text import MSO_ANCHOR, MSO_AUTO_SIZE, PP_ALIGN
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.oxml.text import CT_RegularTextRun
+from pptx.parts.slide import SlidePart
+from pptx.text.text import _Run
+from pptx.util import Pt
+
+ALIGNMENTS = {"CENTER": PP_ALIGN.CENTER, "RIGHT": PP_ALIGN.RIGHT, "LEFT": PP_ALIGN.LEFT}
+WHITE = RGBColor(255, 255, 255)
+
+_run_templates: Dict[tuple, Any] = {}
+
+
+def _run_template(bold, italic, font_size, white: bool):
+    """`a:r` with the given character properties, set through python-pptx once per style."""
+    key = (bold, italic, font_size, white)
+    template = _run_templates.get(key)
+    if template is None:
+        template = parse_xml("<a:r %s><a:t/></a:r>" % nsdecls("a"))
+        font = _Run(template, None).font
+        font.bold = bold
+        font.italic = italic
+        if font_size is not None:
+            font.size = Pt(font_size)
+        if white:
+            font.color.rgb = WHITE
+        _run_templates[key] = template
+    return template
+
+
+def _append_runs(p, runs, font_size, white: bool) -> int:
+    """Append one `a:r` per non-empty run to paragraph `p`; returns the count."""
+    added = 0
+    for run_data in runs:
+        text = run_data.get("text", "")
+        if not text:
+            continue
+        r = copy.deepcopy(_run_template(run_data.get("bold", False), run_data.get("italic", False), font_size, white))
+        r.t.text = CT_RegularTextRun._escape_ctrl_chars(text)
+        p._insert_r(r)
+        added += 1
+    return added
+
+
+def has_text_content(style: Dict[str, Any]) -> bool:
+    """Whether a beautifier slot style has anything to inject (non-blank runs or bullets)."""
+    runs = style.get("runs") or []
+    return any((r.get("text") or "").strip() for r in runs) or bool(style.get("bullets"))
+
+
+def fill_text_body(txBody, style: Dict[str, Any], white: bool = False, autofit: bool = False) -> None:
+    """
+    Replace the text of a `p:txBody` with a beautifier slot style.
+
+    Mirrors the injector's python-pptx semantic path: clear, vertical anchor,
+    one paragraph per bullet (level 0) or one paragraph of runs, explicit
+    alignment only, then autofit.
+
+    Args:
+        txBody: `p:txBody` element of the placeholder
+        style: Beautifier IR for the slot ("runs" or "bullets", font_size, alignment, ...)
+        white: Force white text (slides with a background)
+        autofit: Enable shrink-on-overflow (ENABLE_AUTOFIT_ROLES)
+    """
+    # TextFrame.clear(): keep the first paragraph (and its pPr), drop its runs
+    paragraphs = txBody.p_lst
+    for extra in paragraphs[1:]:
+        txBody.remove(extra)
+    first = paragraphs[0] if paragraphs else txBody.add_p()
+    for child in first.content_children:
+        first.remove(child)
+
+    if style.get("vertical_anchor") == "MIDDLE":
+        txBody.bodyPr.anchor = MSO_ANCHOR.MIDDLE
+
+    alignment = ALIGNMENTS.get(style.get("alignment"))
+    font_size = style.get("font_size")
+    if "bullets" in style:
+        for bullet_idx, bullet_item in enumerate(style.get("bullets", [])):
+            p = first if bullet_idx == 0 else txBody.add_p()
+            p.get_or_add_pPr().lvl = 0
+            _append_runs(p, bullet_item.get("runs", []), font_size, white)
+        if alignment is not None:
+            for p in txBody.p_lst:
+                p.get_or_add_pPr().algn = alignment
+    elif "runs" in style:
+        _append_runs(first, style.get("runs", []), font_size, white)
+        if alignment is not None:
+            first.get_or_add_pPr().algn = alignment
+
+    if autofit:
+        txBody.bodyPr.autofit = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+    fitted = style.get("autofit")
+    if fitted:
+        txBody.bodyPr.autofit = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+        font_scale = fitted.get("font_scale")
+        if font_scale is not None and font_scale < 100:
+            txBody.bodyPr.normAutofit.fontScale = max(1.0, float(font_scale))
+
+
+class CompiledLayout:
+    """A layout's slide skeleton (placeholders cloned once) and its slot positions."""
+
+    def __init__(self, slide_layout, package):
+        scratch = SlidePart.new(PackURI("/ppt/slides/compiled.xml"), package, slide_layout.part)
+        scratch.slide.shapes.clone_layout_placeholders(slide_layout)
+        self.layout_part = slide_layout.part
+        self.skeleton = scratch._element
+
+        # placeholder idx -> position in spTree (first shape wins, as in PlaceholderIndex)
+        self.slot_positions = {}
+        for position, shape in enumerate(self.skeleton.cSld.spTree):
+            if getattr(shape, "has_ph_elm", False):
+                self.slot_positions.setdefault(shape.ph_idx, position)
+
+
+class CompiledSlide:
+    """A stamped slide: its part, python-pptx proxy and placeholder lookup by idx."""
+
+    def __init__(self, part: SlidePart, layout: CompiledLayout):
+        self.part = part
+        # Bind shapes now: backgrounds are inserted at the back of spTree later
+        spTree = part._element.cSld.spTree
+        self._slots = {idx: spTree[position] for idx, position in layout.slot_positions.items()}
+
+    @property
+    def slide(self):
+        """python-pptx Slide for the operations not compiled here (backgrounds, legacy slots)."""
+        return self.part.slide
+
+    def text_body(self, idx: int):
+        """`p:txBody` of the placeholder with idx (added if missing, like shape.text_frame), or None."""
+        sp = self._slots.get(idx)
+        return None if sp is None else sp.get_or_add_txBody()
+
+
+class SlideCompiler:
+    """
+    Adds slides to one Presentation from compiled layout skeletons.
+
+    Slide ids, relationship ids and partnames are assigned exactly as
+    python-pptx would for the same sequence of add_slide calls.
+    """
+
+    def __init__(self, prs):
+        self._prs = prs
+        self._part = prs.part
+        self._package = prs.part.package
+        self._sldIdLst = prs.part._element.get_or_add_sldIdLst()
+        self._layouts: Dict[int, CompiledLayout] = {}
+        self._slide_layouts = prs.slide_layouts
+        used_ids = [int(sldId.id) for sldId in self._sldIdLst.sldId_lst]
+        self._next_slide_id = max([255] + used_ids) + 1
+        self._slide_count = len(used_ids)
+
+    def layout(self, layout_idx: int) -> CompiledLayout:
+        """Compiled skeleton for a layout index (built on first use)."""
+        compiled = self._layouts.get(layout_idx)
+        if compiled is None:
+            compiled = CompiledLayout(self._slide_layouts[layout_idx], self._package)
+            self._layouts[layout_idx] = compiled
+        return compiled
+
+    def add_slide(self, layout_idx: int) -> CompiledSlide:
+        """Append a slide stamped from the layout's skeleton."""
+        layout = self.layout(layout_idx)
+        self._slide_count += 1
+        part = SlidePart(
+            PackURI("/ppt/slides/slide%d.xml" % self._slide_count), CT.PML_SLIDE, self._package,
+            copy.deepcopy(layout.skeleton),
+        )
+        part.relate_to(layout.layout_part, RT.SLIDE_LAYOUT)
+        # A new part cannot match an existing relationship: skip get_or_add's scan
+        rId = self._part.rels._add_relationship(RT.SLIDE, part)
+        self._sldIdLst._add_sldId(id=self._next_slide_id, rId=rId)
+        self._next_slide_id += 1
+        return CompiledSlide(part, layout)
@@ -0,0 +1,118 @@
+"""
+Process-wide pool of pre-parsed master templates.
+Each master is parsed once; every render gets an independent deep copy.
+"""
+import copy
+import hashlib
+import io
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+from pptx import Presentation
+from src.utils.deck_writer import TemplateArchive
+
+
+@dataclass
+class _PoolEntry:
+    """Pristine parsed master plus the stamps used to invalidate it."""
+    presentation: object
+    sha256: str
+    mtime_ns: int
+    size: int
+    blob: bytes = b""
+    archive: Optional[TemplateArchive] = None  # Built on first archive() call
+
+
+class TemplatePool:
+    """Thread-safe singleton cache of parsed master templates.
+
+    Invalidation is two-staged: a cheap ``os.stat`` on every checkout, and a
+    SHA-256 of the file bytes only when mtime/size changed (so a ``touch``
+    without content changes does not trigger a re-parse).
+    """
+
+    _entries: Dict[str, _PoolEntry] = {}
+    _lock = threading.Lock()
+    _parse_count = 0  # For testing/debugging
+    _hit_count = 0
+
+    @classmethod
+    def checkout(cls, template_path: str):
+        """Return an independent ``Presentation`` clone of the master at template_path."""
+        key = os.path.abspath(template_path)
+        stat = os.stat(key)
+
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                entry = cls._refresh(key, stat, entry)
+            else:
+                cls._hit_count += 1
+        # Clone outside the lock so concurrent renders do not serialize on the copy.
+        # The pristine entry is never mutated (a refresh replaces it), so this is a read-only walk.
+        return copy.deepcopy(entry.presentation)
+
+    @classmethod
+    def archive(cls, template_path: str) -> Optional[TemplateArchive]:
+        """Raw zip entries of a pooled master for the passthrough deck writer (None if not pooled)."""
+        with cls._lock:
+            entry = cls._entries.get(os.path.abspath(template_path))
+            if entry is None:
+                return None
+            if entry.archive is None:
+                entry.archive = TemplateArchive(entry.blob, entry.presentation)
+            return entry.archive
+
+    @classmethod
+    def _refresh(cls, key: str, stat: os.stat_result, entry: Optional[_PoolEntry]) -> _PoolEntry:
+        """(Re)load the master when its stat stamp changed. Caller holds the lock."""
+        with open(key, "rb") as f:
+            blob = f.read()
+        digest = hashlib.sha256(blob).hexdigest()
+
+        if entry is not None and entry.sha256 == digest:
+            # Touched but unchanged: keep the parsed copy, update the stamps
+            entry.mtime_ns = stat.st_mtime_ns
+            entry.size = stat.st_size
+            cls._hit_count += 1
+            return entry
+
+        print(f"📦 Template pool: parsing {os.path.basename(key)}")
+        entry = _PoolEntry(
+            presentation=Presentation(io.BytesIO(blob)),
+            sha256=digest,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            blob=blob,
+        )
+        cls._entries[key] = entry
+        cls._parse_count += 1
+        return entry
+
+    @classmethod
+    def invalidate(cls, template_path: Optional[str] = None):
+        """Drop one master (or all masters) from the pool."""
+        with cls._lock:
+            if template_path is None:
+                cls._entries.clear()
+            else:
+                cls._entries.pop(os.path.abspath(template_path), None)
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Pool counters for health/debug endpoints."""
+        with cls._lock:
+            return {
+                "templates": len(cls._entries),
+                "parses": cls._parse_count,
+                "hits": cls._hit_count,
+            }
+
+    @classmethod
+    def reset(cls):
+        """Reset pool (for testing only)."""
+        with cls._lock:
+            cls._entries = {}
+            cls._parse_count = 0
+            cls._hit_count = 0
@@ -0,0 +1,221 @@
+"""
+Watch-mode indexing: keeps registries in sync with data/templates/.
+
+File events come from watchdog (inotify on Linux) when it is installed, otherwise
+from a polling thread. Events are debounced per file, changed templates are
+re-indexed on a background thread, and each new registry is published to the
+process's RegistryStore. Other processes pick it up through mtime revalidation;
+registries are written with os.replace, so readers never see a partial file.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.registry_helper import get_registry_store, load_registry
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+
+def _is_template(path: str) -> bool:
+    name = os.path.basename(path)
+    return name.endswith(".pptx") and not name.startswith(("~$", "."))  # Skip Office lock/temp files
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forwards watchdog create/modify/move events for .pptx files to the watcher."""
+
+    def __init__(self, watcher: "TemplateWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.dest_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory and _is_template(event.src_path):
+            print(f"--- Template Watcher: {os.path.basename(event.src_path)} removed (registry kept) ---")
+
+
+class TemplateWatcher:
+    """
+    Debounced background re-indexer for a templates directory.
+
+    Args:
+        indexer: Callable(template_path, registry_dir) -> result dict, as returned by
+                 index_templates.index_template (keys: ok, skipped, registry, error)
+        debounce_seconds: Quiet period after the last event before a file is indexed
+                          (covers editors and copies that write a file in several steps)
+        poll_seconds: Scan interval for the polling backend
+        backend: "auto" (watchdog if installed), "watchdog" or "poll"
+        max_results: Most recent indexer results kept in ``results`` (oldest dropped first)
+    """
+
+    def __init__(self, indexer: Callable[[str, str], dict], templates_dir: str = "data/templates",
+                 registry_dir: str = "data/registry/", debounce_seconds: float = 2.0,
+                 poll_seconds: float = 2.0, backend: str = "auto", max_results: int = 100):
+        if backend == "auto":
+            backend = "watchdog" if WATCHDOG_AVAILABLE else "poll"
+        if backend == "watchdog" and not WATCHDOG_AVAILABLE:
+            raise ValueError("watchdog is not installed; use backend='poll'")
+
+        self.indexer = indexer
+        self.templates_dir = templates_dir
+        self.registry_dir = registry_dir
+        self.debounce_seconds = debounce_seconds
+        self.poll_seconds = poll_seconds
+        self.backend = backend
+        self.results: "deque[dict]" = deque(maxlen=max_results)  # Bounded: watchers live as long as the server
+
+        self._pending: Dict[str, float] = {}  # path -> monotonic time of last event
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._observer = None
+        self._idle = threading.Event()
+        self._idle.set()
+
+    # --- Events ---
+
+    def notify(self, path: str):
+        """Record a change to path; it is indexed once no event arrived for debounce_seconds."""
+        if not _is_template(path):
+            return
+        with self._lock:
+            self._pending[os.path.abspath(path)] = time.monotonic()
+            self._idle.clear()
+        self._wake.set()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        try:
+            entries = list(os.scandir(self.templates_dir))
+        except FileNotFoundError:
+            return snapshot
+        for entry in entries:
+            if entry.is_file() and _is_template(entry.name):
+                stat = entry.stat()
+                snapshot[os.path.abspath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll_loop(self):
+        previous = self._scan()
+        while not self._stop.wait(self.poll_seconds):
+            current = self._scan()
+            for path, signature in current.items():
+                if previous.get(path) != signature:
+                    self.notify(path)
+            for path in previous.keys() - current.keys():
+                print(f"--- Template Watcher: {os.path.basename(path)} removed (registry kept) ---")
+            previous = current
+
+    # --- Indexing ---
+
+    def _due(self) -> Tuple[List[str], Optional[float]]:
+        """Paths whose quiet period has elapsed, and seconds until the next one is due."""
+        now = time.monotonic()
+        due, wait = [], None
+        with self._lock:
+            for path, last_event in list(self._pending.items()):
+                remaining = last_event + self.debounce_seconds - now
+                if remaining <= 0:
+                    due.append(path)
+                    del self._pending[path]
+                else:
+                    wait = remaining if wait is None else min(wait, remaining)
+        return due, wait
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            due, wait = self._due()
+            for path in due:
+                self._reindex(path)
+            with self._lock:
+                if not self._pending:
+                    self._idle.set()
+            if not due:
+                self._wake.wait(timeout=wait)
+                self._wake.clear()
+
+    def _reindex(self, path: str):
+        if not os.path.exists(path):
+            return
+        name = os.path.basename(path)
+        try:
+            result = self.indexer(path, self.registry_dir)
+        except Exception as e:
+            # Keep the watcher alive; the current registry stays published
+            result = {"template": name, "ok": False, "skipped": False, "registry": None,
+                      "error": f"{type(e).__name__}: {e}"}
+        self.results.append(result)
+
+        if result.get("skipped"):
+            print(f"--- Template Watcher: {name} unchanged ---")
+        elif result.get("ok"):
+            self.publish(result["registry"])
+            print(f"--- Template Watcher: Re-indexed {name} → {result['registry']} ---")
+        else:
+            # Usually a half-copied file; the next write event triggers another attempt
+            print(f"⚠️  Template Watcher: indexing {name} failed: {result.get('error')}")
+
+    def publish(self, registry_path: str):
+        """Swap the new registry into this process's RegistryStore."""
+        key = os.path.splitext(os.path.basename(registry_path))[0]
+        get_registry_store(self.registry_dir).publish(key, load_registry(registry_path))
+
+    # --- Lifecycle ---
+
+    def start(self, initial_scan: bool = True) -> "TemplateWatcher":
+        """Start watching (and queue every existing template, so the registry dir catches up)."""
+        os.makedirs(self.templates_dir, exist_ok=True)
+        if initial_scan:
+            for path in self._scan():
+                self.notify(path)
+
+        worker = threading.Thread(target=self._worker_loop, name="template-indexer", daemon=True)
+        worker.start()
+        self._threads.append(worker)
+
+        if self.backend == "watchdog":
+            self._observer = Observer()
+            self._observer.schedule(_EventHandler(self), self.templates_dir, recursive=False)
+            self._observer.start()
+        else:
+            poller = threading.Thread(target=self._poll_loop, name="template-poller", daemon=True)
+            poller.start()
+            self._threads.append(poller)
+
+        print(f"--- Template Watcher: Watching {self.templates_dir} ({self.backend}) ---")
+        return self
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no events are pending (True) or timeout (False)."""
+        return self._idle.wait(timeout)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
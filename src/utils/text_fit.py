@@ -0,0 +1,239 @@
+"""
+Vectorized text fitting: evaluates every candidate font size at once with NumPy.
+
+Words are reduced to cumulative widths once per text; each wrapping step then
+advances all font sizes by one line with a single searchsorted, so fitting cost
+grows with the number of lines rather than (sizes x words x probes).
+
+Units follow beautifier.py's estimates: for ellipses, widths are normalized by
+960pt, line heights by 720pt, and shape extents are normalized slide units.
+Rectangles (placeholders) are fitted in points, inside the text frame insets.
+"""
+import math
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+WIDTH_SCALE_PT = 960.0
+HEIGHT_SCALE_PT = 720.0
+
+
+def word_lengths(text: str) -> Tuple[int, ...]:
+    """Character count per whitespace-separated word (the only text property fitting uses)."""
+    return tuple(map(len, text.split()))
+
+
+def paragraph_lengths(paragraphs: Iterable[str]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Word lengths per paragraph. An empty paragraph becomes one zero-length word so
+    it still occupies a line.
+    """
+    return tuple(word_lengths(paragraph) or (0,) for paragraph in paragraphs)
+
+
+@lru_cache(maxsize=256)
+def _ellipse_bands(half_width: float, half_height: float, font_sizes: Tuple[float, ...],
+                   char_width_ratio: float, line_height_ratio: float):
+    """
+    Per-geometry tables shared by every text fitted into the same shape.
+
+    Returns:
+        (line_height, max_lines, capacity) where capacity[k, f] is how many character
+        cells line k holds at font_sizes[f] (chord width at the middle of the line's band)
+    """
+    fonts = np.asarray(font_sizes, dtype=np.float64)
+    char_width = fonts * char_width_ratio / WIDTH_SCALE_PT
+    line_height = fonts * line_height_ratio / HEIGHT_SCALE_PT
+    max_lines = np.floor(2 * half_height / line_height).astype(np.int64)
+
+    bands = np.arange(max(int(max_lines.max()), 0))[:, None]
+    band_y = -half_height + (bands + 0.5) * line_height
+    inside = np.clip(1.0 - (band_y / half_height) ** 2, 0.0, None)
+    capacity = 2.0 * half_width * np.sqrt(inside) / char_width
+    return line_height, max_lines, capacity
+
+
+def ellipse_fits(lengths: Sequence[int], half_width: float, half_height: float, font_sizes: Sequence[float],
+                 char_width_ratio: float, line_height_ratio: float) -> np.ndarray:
+    """
+    For each font size: do the words wrap inside the ellipse?
+
+    Same greedy rule as the original circle fitter: lines are stacked from the top,
+    a line's width is the chord at the middle of its band, and a word joins the line
+    while the words already on it are no wider than the chord (the last word may
+    overhang). Text fits when every word is placed and the lines' total height
+    stays within the ellipse.
+
+    Args:
+        lengths: Characters per word
+        half_width, half_height: Ellipse semi-axes (normalized; equal for a circle)
+        font_sizes: Candidate font sizes in points
+
+    Returns:
+        Boolean array aligned with font_sizes
+    """
+    line_height, max_lines, capacity = _ellipse_bands(
+        half_width, half_height, tuple(font_sizes), char_width_ratio, line_height_ratio
+    )
+    n_words = len(lengths)
+    if n_words == 0:
+        return np.ones(max_lines.shape, dtype=bool)
+
+    # cumulative[k] = width (in character cells, incl. one space per word) of words[:k]
+    cumulative = np.zeros(n_words + 1, dtype=np.float64)
+    np.cumsum(np.asarray(lengths, dtype=np.float64) + 1, out=cumulative[1:])
+
+    # Every size places one line per step; the first word whose predecessors on the
+    # line already exceed the capacity starts the next line
+    start = np.zeros(max_lines.shape, dtype=np.int64)
+    lines = np.zeros(max_lines.shape, dtype=np.int64)
+    active = max_lines >= 1
+    for row in capacity:
+        if not active.any():
+            break
+        end = cumulative.searchsorted(cumulative[start] + row, side="right")
+        start = np.where(active, np.maximum(np.minimum(end, n_words), start + 1), start)
+        lines += active
+        active &= (start < n_words) & (lines < max_lines)
+
+    return (start >= n_words) & (-half_height + lines * line_height <= half_height)
+
+
+@lru_cache(maxsize=4096)
+def fit_ellipse_font_size(lengths: Tuple[int, ...], half_width: float, half_height: float,
+                          font_range: Tuple[int, int], char_width_ratio: float,
+                          line_height_ratio: float) -> Optional[int]:
+    """
+    Largest whole font size in font_range whose wrapped text fits the ellipse, or None.
+
+    Cached on the word lengths and geometry, so repeated callouts cost a dict lookup.
+    """
+    fonts = range(font_range[0], font_range[1] + 1)
+    fits = ellipse_fits(lengths, half_width, half_height, fonts, char_width_ratio, line_height_ratio)
+    if not fits.any():
+        return None
+    return fonts[int(np.flatnonzero(fits)[-1])]
+
+
+class _Paragraphs:
+    """
+    Rectangle wrapping tables for one text. Paragraph totals are enough for the
+    line-count bounds; per-word arrays are only built if a size needs an exact wrap.
+    """
+
+    def __init__(self, paragraphs: Sequence[Sequence[int]]):
+        self.paragraphs = paragraphs
+        self.n_words = sum(len(paragraph) for paragraph in paragraphs)
+        # Paragraph width in character cells (words + spaces) plus one trailing space
+        self.spans = np.array([sum(paragraph) + len(paragraph) for paragraph in paragraphs], dtype=np.float64)
+        self.longest = max((max(paragraph) for paragraph in paragraphs if paragraph), default=0)
+        self.cumulative = None
+
+    def _build_words(self):
+        sizes = [len(paragraph) for paragraph in self.paragraphs]
+        self.lengths = [n for paragraph in self.paragraphs for n in paragraph]
+        # cumulative[k] = width (in character cells, incl. one space per word) of words[:k]
+        self.cumulative = np.zeros(self.n_words + 1, dtype=np.float64)
+        np.cumsum(np.asarray(self.lengths, dtype=np.float64) + 1, out=self.cumulative[1:])
+        # paragraph_end[k] = index one past the last word of word k's paragraph
+        self.paragraph_end = np.repeat(np.cumsum(sizes), sizes)
+
+    def line_bounds(self, capacity: np.ndarray):
+        """
+        (lower, upper) line counts per capacity without wrapping.
+
+        Each line holds at most `capacity` cells plus the space dropped at its
+        break, and under greedy wrapping every line but a paragraph's last is
+        filled to more than capacity - longest word, so the exact count lies
+        between the two (upper is inf when a word may not fit on a line).
+        """
+        lower = np.ceil(self.spans / (capacity[:, None] + 1)).sum(axis=1)
+        slack = capacity - self.longest
+        wraps = slack > 0
+        upper = (np.floor(self.spans / np.where(wraps, slack, 1.0)[:, None]) + 1).sum(axis=1)
+        return lower, np.where(wraps, upper, np.inf)
+
+    def lines_needed(self, capacity: float, limit: int) -> int:
+        """Exact greedy line count at one capacity (stops counting past limit)."""
+        if self.cumulative is None:
+            self._build_words()
+        # next_start[k]: first word of the line after a line starting at word k
+        next_start = self.cumulative.searchsorted(self.cumulative[:-1] + capacity + 1, side="right") - 1
+        next_start = np.minimum(next_start, self.paragraph_end).tolist()
+        lines = start = 0
+        while start < self.n_words and lines <= limit:
+            following = next_start[start]
+            if following <= start:  # Word wider than the line: broken across lines
+                lines += math.ceil(self.lengths[start] / capacity)
+                following = start + 1
+            else:
+                lines += 1
+            start = following
+        return lines
+
+
+def rect_fits(paragraphs: Sequence[Sequence[int]], width_pt: float, height_pt: float,
+              font_sizes: Sequence[float], char_width_ratio: float, line_height_ratio: float) -> np.ndarray:
+    """
+    For each font size: do the paragraphs wrap inside a width_pt x height_pt box?
+
+    Greedy line breaking as a text frame does it: a word joins the line while the
+    line (words plus single spaces) stays within the width, every paragraph starts
+    on a new line, and a word wider than the whole line is broken across
+    ceil(length / capacity) lines.
+
+    Line-count bounds decide most sizes for all sizes at once; only sizes whose
+    bounds straddle the available lines are wrapped exactly.
+
+    Args:
+        paragraphs: Characters per word, per paragraph (see paragraph_lengths)
+        width_pt, height_pt: Usable text area in points (insets already removed)
+        font_sizes: Candidate font sizes in points
+
+    Returns:
+        Boolean array aligned with font_sizes
+    """
+    text = _Paragraphs(paragraphs)
+    fonts = np.asarray(font_sizes, dtype=np.float64)
+    if text.n_words == 0:
+        return np.ones(fonts.shape, dtype=bool)
+    if width_pt <= 0:
+        return np.zeros(fonts.shape, dtype=bool)
+
+    capacity = width_pt / (fonts * char_width_ratio)
+    max_lines = np.floor(height_pt / (fonts * line_height_ratio))
+    lower, upper = text.line_bounds(capacity)
+    fits = upper <= max_lines
+    for k in np.flatnonzero(~fits & (lower <= max_lines)):
+        fits[k] = text.lines_needed(capacity[k], max_lines[k]) <= max_lines[k]
+    return fits
+
+
+@lru_cache(maxsize=4096)
+def fit_rect_font_size(paragraphs: Tuple[Tuple[int, ...], ...], width_pt: float, height_pt: float,
+                       font_range: Tuple[int, int], char_width_ratio: float,
+                       line_height_ratio: float) -> Optional[int]:
+    """
+    Largest whole font size in font_range whose wrapped paragraphs fit the box, or None.
+
+    Sizes are tried from the largest down after the vectorized bounds, so usually
+    at most one or two sizes are wrapped exactly. Cached on the paragraphs' word
+    lengths (the only part of the text that affects wrapping) and the slot's
+    usable area and bounds, so the same text in the same slot - repeated footers,
+    regenerated decks - costs a dict lookup.
+    """
+    text = _Paragraphs(paragraphs)
+    if text.n_words == 0:
+        return font_range[1]
+    if width_pt <= 0:
+        return None
+
+    fonts = np.arange(font_range[1], font_range[0] - 1, -1, dtype=np.float64)
+    capacity = width_pt / (fonts * char_width_ratio)
+    max_lines = np.floor(height_pt / (fonts * line_height_ratio))
+    lower, upper = text.line_bounds(capacity)
+    for k in np.flatnonzero(lower <= max_lines).tolist():
+        if upper[k] <= max_lines[k] or text.lines_needed(capacity[k], max_lines[k]) <= max_lines[k]:
+            return int(fonts[k])
+    return None
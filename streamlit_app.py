@@ -25,8 +25,8 @@ for mod_name in [
     if mod_name in sys.modules:
         importlib.reload(sys.modules[mod_name])
 
-from src.core.graph_pipeline2 import create_pipeline2_graph
-from src.utils.registry_helper import load_all_registries
+from src.core.graph_pipeline2 import get_pipeline2_graph
+from src.utils.registry_helper import get_registry_store
 from src.core.state import PPTState
 from langchain_core.runnables import RunnableConfig
 
@@ -105,20 +105,20 @@ def ensure_directories():
 def get_available_templates():
     """Get list of available templates with registry status."""
     templates_dir = Path('data/templates')
-    registry_dir = Path('data/registry')
     
     if not templates_dir.exists():
         return []
     
+    registry_catalog = get_registry_store().catalog()
+    
     templates = []
     for file in templates_dir.glob('*.pptx'):
         template_name = file.stem
-        registry_file = registry_dir / f"{template_name}.json"
         
         templates.append({
             'filename': file.name,
             'display_name': template_name.replace('_', ' ').replace('-', ' ').title(),
-            'has_registry': registry_file.exists(),
+            'has_registry': template_name in registry_catalog,
             'path': str(file)
         })
     
@@ -150,20 +150,19 @@ def get_presentation_history():
 def generate_presentation(documentation: str, template_name: str):
     """Generate a presentation from documentation text."""
     try:
-        # Load all template registries
-        combined_registry = load_all_registries()
+        # Look up the selected template's registry (cached, lazily loaded)
+        registry_store = get_registry_store()
         
-        if not combined_registry:
+        if not registry_store.catalog():
             return False, "No templates found in registry. Please run Pipeline 1 first to index templates."
         
         # Get the registry for the selected template
         template_key = Path(template_name).stem
+        target_registry = registry_store.get(template_key)
         
-        if template_key not in combined_registry:
+        if target_registry is None:
             return False, f"Registry for {template_name} not found. Please index this template first using Pipeline 1."
         
-        target_registry = combined_registry[template_key]
-        
         # Generate unique filename
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_filename = f"presentation_{timestamp}.pptx"
@@ -187,7 +186,7 @@ def generate_presentation(documentation: str, template_name: str):
         progress_placeholder = st.empty()
         progress_placeholder.info("🚀 Initializing pipeline...")
         
-        app_graph = create_pipeline2_graph()
+        app_graph = get_pipeline2_graph()
         config_obj = RunnableConfig(configurable={"thread_id": f"streamlit_gen_{timestamp}"})
         
         progress_placeholder.info("📝 Processing documentation...")
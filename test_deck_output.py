@@ -0,0 +1,93 @@
+"""
+Tests for in-memory deck delivery: the injector's render_to_memory mode, the
+background DeckPersister and the /api/generate stream mode.
+
+Run: pytest test_deck_output.py -v
+"""
+import io
+import threading
+
+from pptx import Presentation
+import app as web_app
+from src.nodes.pipeline_2_generation import injector
+from src.utils.deck_output import DeckPersister, iter_chunks
+from src.utils.template_pool import TemplatePool
+
+MANIFEST = [{
+    "layout_index": 1,
+    "content": {"0": {"runs": [{"text": "Streamed", "bold": False, "italic": False}],
+                      "font_size": None, "alignment": None, "semantic_role": "title"}},
+    "slide_role": "CONTENT",
+    "background_image": {"enabled": False},
+    "_is_semantic": True,
+}]
+
+
+def test_injector_renders_to_memory(tmp_path):
+    """render_to_memory returns the deck bytes and leaves the output path untouched"""
+    TemplatePool.reset()
+    template = tmp_path / "master.pptx"
+    Presentation().save(str(template))
+    output = tmp_path / "outputs" / "deck.pptx"
+
+    result = injector.surgical_injection_node({
+        "primary_master_path": str(template), "manifest": MANIFEST,
+        "final_file_path": str(output), "render_to_memory": True,
+    })
+
+    assert not output.exists()
+    assert result["final_file_path"] == str(output)
+    deck = Presentation(io.BytesIO(result["final_file_bytes"]))
+    assert deck.slides[0].shapes.title.text == "Streamed"
+
+
+def test_iter_chunks_covers_the_deck():
+    data = bytes(range(256)) * 10
+    chunks = [bytes(c) for c in iter_chunks(data, 1000)]
+    assert [len(c) for c in chunks] == [1000, 1000, 560]
+    assert b"".join(chunks) == data
+
+
+def test_persister_serves_pending_decks_until_written(tmp_path, monkeypatch):
+    """A queued deck is readable from memory until its atomic write finishes"""
+    gate = threading.Event()
+    persister = DeckPersister()
+    real_write = persister._write
+    monkeypatch.setattr(persister, "_write", lambda key, data: (gate.wait(5), real_write(key, data)))
+    path = str(tmp_path / "out" / "deck.pptx")
+
+    persister.submit(path, b"deck")
+    assert persister.pending(path) == b"deck"
+    assert not (tmp_path / "out" / "deck.pptx").exists()
+
+    gate.set()
+    assert persister.flush(timeout=5)
+    assert persister.pending(path) is None
+    assert (tmp_path / "out" / "deck.pptx").read_bytes() == b"deck"
+    assert list((tmp_path / "out").iterdir()) == [tmp_path / "out" / "deck.pptx"]  # No temp files left
+
+
+class _Graph:
+    def invoke(self, state, config=None):
+        return {**state, "final_file_bytes": b"PK-deck-bytes"}
+
+
+def test_generate_stream_mode(tmp_path, monkeypatch):
+    """stream: true returns the deck itself with a Content-Length and persists it in the background"""
+    persister = DeckPersister()
+    monkeypatch.setattr(web_app, "get_deck_persister", lambda: persister)
+    monkeypatch.setattr(web_app, "get_pipeline2_graph", lambda: _Graph())
+    monkeypatch.setattr(web_app.get_registry_store(), "catalog", lambda: {"t": {}})
+    monkeypatch.setattr(web_app.get_registry_store(), "get", lambda key: {"layouts": []})
+    monkeypatch.setitem(web_app.app.config, "OUTPUT_FOLDER", str(tmp_path))
+
+    client = web_app.app.test_client()
+    response = client.post("/api/generate", json={"documentation": "x" * 60, "template": "t.pptx", "stream": True})
+
+    assert response.status_code == 200
+    assert response.mimetype == web_app.PPTX_MIMETYPE
+    assert response.headers["Content-Length"] == str(len(b"PK-deck-bytes"))
+    assert "attachment" in response.headers["Content-Disposition"]
+    assert response.data == b"PK-deck-bytes"
+    assert persister.flush(timeout=5)
+    assert [p.read_bytes() for p in tmp_path.iterdir()] == [b"PK-deck-bytes"]
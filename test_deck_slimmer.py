@@ -0,0 +1,115 @@
+"""
+Tests for output slimming (src/utils/deck_slimmer.py).
+
+Run: pytest test_deck_slimmer.py -v
+"""
+import copy
+import io
+import zipfile
+
+from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.opc.packuri import PackURI
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.parts.slide import SlideLayoutPart, SlideMasterPart
+from src.nodes.pipeline_2_generation import injector
+from src.utils.deck_slimmer import slim_presentation, slimmed_layout_indices
+from src.utils.template_pool import TemplatePool
+
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def _add_second_master(prs):
+    """A second master (own theme, one layout) appended to the default template."""
+    package = prs.part.package
+    master = prs.slide_masters[0].part
+    theme = master.part_related_by(RT.THEME)
+
+    new_theme = Part(PackURI("/ppt/theme/theme9.xml"), theme.content_type, package, theme.blob)
+    new_master = SlideMasterPart(PackURI("/ppt/slideMasters/slideMaster2.xml"), CT.PML_SLIDE_MASTER,
+                                 package, copy.deepcopy(master._element))
+    new_master.relate_to(new_theme, RT.THEME)
+    new_layout = SlideLayoutPart(PackURI("/ppt/slideLayouts/slideLayout12.xml"), CT.PML_SLIDE_LAYOUT,
+                                 package, copy.deepcopy(prs.slide_layouts[0].part._element))
+    new_layout.relate_to(new_master, RT.SLIDE_MASTER)
+
+    layout_ids = new_master._element.sldLayoutIdLst
+    for entry in list(layout_ids):
+        layout_ids.remove(entry)
+    layout_ids.append(parse_xml('<p:sldLayoutId %s id="2147483700" r:id="%s"/>'
+                                % (nsdecls("p", "r"), new_master.relate_to(new_layout, RT.SLIDE_LAYOUT))))
+    prs.part._element.sldMasterIdLst.append(parse_xml('<p:sldMasterId %s id="2147483699" r:id="%s"/>'
+                                            % (nsdecls("p", "r"), prs.part.relate_to(new_master, RT.SLIDE_MASTER))))
+
+
+def _master(tmp_path):
+    """Default template + picture on an unused layout + second master + custom XML."""
+    prs = Presentation()
+    prs.slide_layouts[6].part.get_or_add_image_part(io.BytesIO(PNG))
+    _add_second_master(prs)
+    custom = Part(PackURI("/customXml/item1.xml"), CT.XML, prs.part.package, b"<root/>")
+    prs.part.relate_to(custom, RT.CUSTOM_XML)
+    path = tmp_path / "master.pptx"
+    prs.save(str(path))
+    return str(path)
+
+
+def _render(template, output, slim, monkeypatch):
+    monkeypatch.setattr(injector, "SLIM_OUTPUT_DECKS", slim)
+    injector.surgical_injection_node({
+        "primary_master_path": template,
+        "manifest": [{"layout_index": 1, "content": {"0": {"runs": [{"text": "Kept"}], "font_size": None,
+                                                         "alignment": None, "semantic_role": "title"}},
+                      "slide_role": "CONTENT", "background_image": {}, "_is_semantic": True}],
+        "final_file_path": str(output),
+    })
+    with zipfile.ZipFile(output) as zf:
+        return set(zf.namelist())
+
+
+def test_slim_presentation_drops_unreachable_parts(tmp_path):
+    TemplatePool.reset()
+    path = _master(tmp_path)
+    prs = TemplatePool.checkout(path)
+    prs.slides.add_slide(prs.slide_layouts[1])
+    prs.slides.add_slide(prs.slide_layouts[1])
+
+    stats = slim_presentation(prs, TemplatePool.archive(path))
+
+    assert stats["layouts_removed"] == 11  # 10 unused in master 1 + the layout of master 2
+    assert stats["masters_removed"] == 1
+    assert stats["parts_removed"] == 11 + 1 + 1 + 1 + 1  # + master, its theme, media, custom XML
+    assert stats["bytes_saved"] > 0
+    assert len(prs.slide_masters) == 1 and len(prs.slide_layouts) == 1
+
+
+def test_slimmed_deck_is_smaller_and_opens(tmp_path, monkeypatch):
+    TemplatePool.reset()
+    path = _master(tmp_path)
+    full = _render(path, tmp_path / "full.pptx", False, monkeypatch)
+    slim = _render(path, tmp_path / "slim.pptx", True, monkeypatch)
+
+    assert "customXml/item1.xml" in full and "customXml/item1.xml" not in slim
+    assert any(name.startswith("ppt/media/") for name in full)
+    assert not any(name.startswith("ppt/media/") for name in slim)
+    assert "ppt/slideMasters/slideMaster2.xml" not in slim
+    assert (tmp_path / "slim.pptx").stat().st_size < (tmp_path / "full.pptx").stat().st_size
+
+    deck = Presentation(str(tmp_path / "slim.pptx"))
+    assert deck.slides[0].shapes.title.text == "Kept"
+    assert deck.slides[0].slide_layout.name == "Title and Content"
+    assert len(deck.slide_layouts) == 1
+    assert slimmed_layout_indices(deck) == [1]
+    assert slimmed_layout_indices(Presentation(str(tmp_path / "full.pptx"))) is None
+
+
+def test_empty_deck_is_left_alone():
+    prs = Presentation()
+    assert slim_presentation(prs)["parts_removed"] == 0
+    assert len(prs.slide_layouts) == 11
@@ -0,0 +1,113 @@
+"""
+Tests for the passthrough deck writer (src/utils/deck_writer.py).
+
+Run: pytest test_deck_writer.py -v
+"""
+import io
+import struct
+import zipfile
+
+from pptx import Presentation
+from pptx.util import Inches
+from src.utils.deck_writer import save_presentation
+from src.utils.template_pool import TemplatePool
+
+# 1x1 PNG: gives the master a ppt/media entry
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def _master(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_picture(io.BytesIO(PNG), Inches(1), Inches(1))
+    path = tmp_path / "master.pptx"
+    prs.save(str(path))
+    return str(path)
+
+
+def _entries(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        return {info.filename: (info, zf.read(info.filename)) for info in zf.infolist()}
+
+
+def _raw(data, info):
+    """Compressed bytes of one entry, straight from the archive."""
+    name_length, extra_length = struct.unpack_from("<HH", data, info.header_offset + 26)
+    start = info.header_offset + 30 + name_length + extra_length
+    return data[start:start + info.compress_size]
+
+
+def test_passthrough_matches_python_pptx_save(tmp_path):
+    """Same entries, same order, same uncompressed content as prs.save"""
+    TemplatePool.reset()
+    path = _master(tmp_path)
+    prs = TemplatePool.checkout(path)
+    prs.slides.add_slide(prs.slide_layouts[1]).shapes.title.text = "New slide"
+
+    expected, actual = io.BytesIO(), io.BytesIO()
+    prs.save(expected)
+    stats = save_presentation(prs, actual, TemplatePool.archive(path), compresslevel=1)
+
+    expected, actual = _entries(expected.getvalue()), _entries(actual.getvalue())
+    assert list(actual) == list(expected)
+    for name, (_, blob) in expected.items():
+        assert actual[name][1] == blob, name
+    assert stats["copied"] + stats["written"] == len(expected)
+    assert stats["copied"] > stats["written"] > 0
+
+
+def test_unchanged_entries_keep_their_compressed_bytes(tmp_path):
+    """Master entries are copied raw; only new and modified parts are rewritten"""
+    TemplatePool.reset()
+    path = _master(tmp_path)
+    with open(path, "rb") as f:
+        master = f.read()
+    prs = TemplatePool.checkout(path)
+    prs.slides.add_slide(prs.slide_layouts[1])
+
+    out = io.BytesIO()
+    save_presentation(prs, out, TemplatePool.archive(path), compresslevel=9)
+    data = out.getvalue()
+    before, after = _entries(master), _entries(data)
+
+    media = next(name for name in before if name.startswith("ppt/media/"))
+    for name in (media, "ppt/theme/theme1.xml", "ppt/slideLayouts/slideLayout1.xml", "ppt/slides/slide1.xml"):
+        assert _raw(data, after[name][0]) == _raw(master, before[name][0]), name
+    assert "ppt/slides/slide2.xml" not in before
+    assert after["ppt/presentation.xml"][1] != before["ppt/presentation.xml"][1]
+
+    deck = Presentation(io.BytesIO(data))
+    assert len(deck.slides) == 2
+    assert zipfile.ZipFile(io.BytesIO(data)).testzip() is None
+
+
+def test_without_archive_every_part_is_written(tmp_path):
+    """No archive (e.g. a master not in the pool): a plain save at the given level"""
+    prs = Presentation()
+    prs.slides.add_slide(prs.slide_layouts[0])
+    out = io.BytesIO()
+    stats = save_presentation(prs, out, None, compresslevel=0)
+
+    assert stats["copied"] == 0
+    assert len(Presentation(io.BytesIO(out.getvalue())).slides) == 1
+
+
+def test_missing_zipfile_internals_fall_back_to_writing(tmp_path, monkeypatch):
+    """Without the private ZipFile state copy_raw relies on, every entry is recompressed"""
+    from src.utils import deck_writer
+
+    TemplatePool.reset()
+    path = _master(tmp_path)
+    prs = TemplatePool.checkout(path)
+    prs.slides.add_slide(prs.slide_layouts[1])
+    monkeypatch.setattr(deck_writer, "_RAW_COPY_ATTRS", deck_writer._RAW_COPY_ATTRS + ("_no_such_attr",))
+
+    out = io.BytesIO()
+    stats = save_presentation(prs, out, TemplatePool.archive(path))
+
+    assert stats["copied"] == 0
+    assert zipfile.ZipFile(io.BytesIO(out.getvalue())).testzip() is None
+    assert len(Presentation(io.BytesIO(out.getvalue())).slides) == 2
@@ -0,0 +1,289 @@
+"""
+Unit tests for the extractor node: chunking, map-reduce summarization,
+streaming extraction and the content-addressed cache.
+Uses a fake LLM so no API keys are required.
+
+Run: pytest test_extractor.py -v
+"""
+import threading
+import pytest
+from langchain_core.messages import AIMessage
+from src.nodes.pipeline_2_generation import extractor
+from src.nodes.pipeline_2_generation.extractor import chunk_paragraphs, _estimate_tokens
+from src.utils.llm_cache import SqliteCache
+
+
+class FakeLLM:
+    """Records prompts; map prompts get a short note, the reduce prompt gets the content map."""
+
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        if "SECTION:" in prompt:
+            return AIMessage(content="note")
+        return AIMessage(content="CONTENT MAP")
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeLLM()
+    monkeypatch.setattr(extractor, "get_llm", lambda **kwargs: llm)
+    monkeypatch.setattr(extractor, "EXTRACTOR_SINGLE_PASS_TOKENS", 500)
+    monkeypatch.setattr(extractor, "EXTRACTOR_CHUNK_TOKENS", 200)
+    monkeypatch.setattr(extractor, "_content_cache", lambda: None)
+    return llm
+
+
+@pytest.fixture
+def content_cache(fake_llm, tmp_path, monkeypatch):
+    cache = SqliteCache(str(tmp_path / "content.sqlite"))
+    monkeypatch.setattr(extractor, "_content_cache", lambda: cache)
+    return cache
+
+
+# --- Chunking Tests ---
+
+def test_chunks_respect_token_budget():
+    """No chunk exceeds the budget and no paragraph is lost"""
+    paragraphs = [f"Paragraph {i} " + "lorem ipsum dolor. " * 10 for i in range(40)]
+    chunks = list(chunk_paragraphs(paragraphs, token_budget=150))
+
+    assert len(chunks) > 1
+    assert all(_estimate_tokens(c) <= 150 for c in chunks)
+    assert sum(c.count("Paragraph ") for c in chunks) == 40
+
+
+def test_chunks_prefer_heading_boundaries():
+    """Once half full, a heading starts a new chunk"""
+    body = "Sentence of body text here. " * 8
+    paragraphs = ["Introduction", body, body, "Architecture", body]
+    chunks = list(chunk_paragraphs(paragraphs, token_budget=200))
+
+    assert chunks[-1].startswith("Architecture")
+
+
+def test_oversized_paragraph_is_split():
+    """A single paragraph larger than the budget is split on sentences"""
+    paragraph = "This is one sentence. " * 100
+    chunks = list(chunk_paragraphs([paragraph], token_budget=100))
+
+    assert len(chunks) > 1
+    assert all(_estimate_tokens(c) <= 100 for c in chunks)
+
+
+# --- Node Tests ---
+
+def test_short_document_uses_single_prompt(fake_llm):
+    """Short inputs keep the original single-call path"""
+    result = extractor.extract_context_node({"raw_docs": "A short project description."})
+
+    assert result["content_map"] == "CONTENT MAP"
+    assert len(fake_llm.prompts) == 1
+
+
+def test_long_document_is_map_reduced(fake_llm):
+    """Long inputs are summarized per chunk, then reduced into one content map"""
+    doc = "\n".join(f"Section {i}\n" + "Detail sentence for the section. " * 30 for i in range(12))
+    result = extractor.extract_context_node({"raw_docs": doc})
+
+    map_prompts = [p for p in fake_llm.prompts if "SECTION:" in p]
+    reduce_prompts = [p for p in fake_llm.prompts if "SECTION:" not in p]
+    assert len(map_prompts) > 1
+    assert len(reduce_prompts) == 1
+    assert "note" in reduce_prompts[0]
+    assert result["content_map"] == "CONTENT MAP"
+
+
+def test_map_prompts_are_position_independent(fake_llm):
+    """An unchanged chunk produces an identical prompt (and therefore a cache hit)"""
+    section = "Stable section\n" + "Unchanged sentence in this section. " * 30
+    extractor.extract_context_node({"raw_docs": section + "\nEdited tail\n" + "Version one text. " * 60})
+    first = set(p for p in fake_llm.prompts if "SECTION:" in p)
+    fake_llm.prompts.clear()
+    extractor.extract_context_node({"raw_docs": section + "\nEdited tail\n" + "Version two text. " * 60})
+    second = set(p for p in fake_llm.prompts if "SECTION:" in p)
+
+    assert first & second
+
+
+# --- Streaming Extraction Tests ---
+
+def _make_docx(path, n=5):
+    from docx import Document
+    doc = Document()
+    doc.add_heading("Overview", 1)
+    for i in range(n):
+        p = doc.add_paragraph(f"Paragraph {i} with ")
+        p.add_run("bold").bold = True
+        p.add_run("\tand a tab")
+    doc.add_paragraph("")
+    table = doc.add_table(rows=1, cols=1)
+    table.cell(0, 0).text = "table cell"
+    p = doc.add_paragraph("line one")
+    p.add_run().add_break()
+    p.add_run("line two")
+    doc.save(path)
+
+
+def _make_pptx(path, n=3):
+    from pptx import Presentation
+    from pptx.util import Inches
+    prs = Presentation()
+    for i in range(n):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text = f"First bullet {i}\nSecond bullet"
+        box = slide.shapes.add_textbox(0, 0, Inches(2), Inches(1))
+        box.text_frame.text = "soft\vbreak"
+    prs.save(path)
+
+
+@pytest.mark.parametrize("suffix, make", [(".docx", _make_docx), (".pptx", _make_pptx)])
+def test_streaming_matches_object_model(tmp_path, suffix, make):
+    """The iterparse fast path returns exactly what python-docx / python-pptx return"""
+    path = str(tmp_path / f"doc{suffix}")
+    make(path)
+
+    assert extractor.extract_text_from_file(path) == extractor._extract_text_object_model(path)
+
+
+def test_iter_text_is_lazy(tmp_path):
+    """Blocks are yielded one at a time rather than after the whole file is parsed"""
+    path = str(tmp_path / "doc.docx")
+    _make_docx(path, n=50)
+
+    stream = extractor.iter_text_from_file(path)
+    assert next(stream) == "Overview"
+    assert next(stream).startswith("Paragraph 0")
+
+
+def test_corrupt_package_falls_back(tmp_path, monkeypatch):
+    """A part the streaming parser cannot read falls back to the object model"""
+    path = str(tmp_path / "doc.docx")
+    _make_docx(path)
+
+    def broken_stream(_):
+        raise KeyError("word/document.xml")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(extractor, "_iter_docx_paragraphs", broken_stream)
+
+    assert extractor.extract_text_from_file(path) == extractor._extract_text_object_model(path)
+
+
+def test_damaged_slide_is_skipped(tmp_path):
+    """Malformed XML in a later slide skips that slide instead of failing the extraction"""
+    import zipfile
+    source, path = str(tmp_path / "source.pptx"), str(tmp_path / "deck.pptx")
+    _make_pptx(source)
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(path, "w") as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            dst.writestr(info, data[:len(data) // 2] if info.filename == "ppt/slides/slide2.xml" else data)
+
+    text = extractor.extract_text_from_file(path)
+    assert "Slide 0" in text and "Slide 2" in text
+    assert "First bullet 1" not in text
+
+
+def test_stream_failing_midway_keeps_text_read(tmp_path, fake_llm, monkeypatch):
+    """An error after the first block no longer escapes into extract_context_node"""
+    from lxml import etree
+    path = str(tmp_path / "doc.docx")
+    _make_docx(path)
+
+    def failing_stream(_):
+        yield "Readable paragraph."
+        raise etree.XMLSyntaxError("broken", None, 1, 1)
+
+    monkeypatch.setattr(extractor, "_iter_docx_paragraphs", failing_stream)
+
+    assert extractor.extract_text_from_file(path) == "Readable paragraph."
+    assert extractor.extract_context_node({"raw_docs": path})["content_map"] == "CONTENT MAP"
+    assert "Readable paragraph." in fake_llm.prompts[-1]
+
+
+def test_long_file_is_streamed_into_map_reduce(tmp_path, fake_llm):
+    """Files over the single-pass budget are chunked straight from the stream"""
+    path = str(tmp_path / "long.docx")
+    _make_docx(path, n=200)
+    result = extractor.extract_context_node({"raw_docs": path})
+
+    map_prompts = [p for p in fake_llm.prompts if "SECTION:" in p]
+    assert len(map_prompts) > 1
+    assert "Paragraph 199" in "".join(map_prompts)
+    assert result["content_map"] == "CONTENT MAP"
+
+
+# --- Content Cache Tests ---
+
+def test_repeat_text_skips_llm(content_cache, fake_llm):
+    """The same raw text is answered from the content cache"""
+    extractor.extract_context_node({"raw_docs": "Same input text."})
+    result = extractor.extract_context_node({"raw_docs": "Same input text."})
+
+    assert result["content_map"] == "CONTENT MAP"
+    assert len(fake_llm.prompts) == 1
+    assert content_cache.stats()["hits"] == 1
+
+
+def test_repeat_file_skips_parsing_and_llm(content_cache, fake_llm, tmp_path, monkeypatch):
+    """A re-uploaded file (new path, same bytes) is neither parsed nor summarized again"""
+    first, second = str(tmp_path / "a.docx"), str(tmp_path / "b.docx")
+    _make_docx(first)
+    _make_docx(second)
+    with open(first, "rb") as f:
+        data = f.read()
+    with open(second, "wb") as f:
+        f.write(data)
+
+    extractor.extract_context_node({"raw_docs": first})
+    monkeypatch.setattr(extractor, "iter_text_from_file", lambda _: pytest.fail("file was re-parsed"))
+    extractor.extract_context_node({"raw_docs": second})
+
+    assert len(fake_llm.prompts) == 1
+
+
+def test_prompt_version_bump_reuses_extracted_text(content_cache, fake_llm, tmp_path, monkeypatch):
+    """A new prompt version re-runs the LLM but still skips parsing"""
+    path = str(tmp_path / "doc.docx")
+    _make_docx(path)
+    extractor.extract_context_node({"raw_docs": path})
+
+    monkeypatch.setattr(extractor, "EXTRACTOR_PROMPT_VERSION", "test-bump")
+    monkeypatch.setattr(extractor, "iter_text_from_file", lambda _: pytest.fail("file was re-parsed"))
+    extractor.extract_context_node({"raw_docs": path})
+
+    assert len(fake_llm.prompts) == 2
+    assert "Paragraph 0" in fake_llm.prompts[1]
+
+
+def test_text_is_not_recorded_without_cache(fake_llm, tmp_path, monkeypatch):
+    """With the content cache off, streamed blocks are not copied aside"""
+    path = str(tmp_path / "doc.docx")
+    _make_docx(path)
+    monkeypatch.setattr(extractor, "_TextRecorder", lambda *_: pytest.fail("text was recorded"))
+
+    assert extractor.extract_context_node({"raw_docs": path})["content_map"] == "CONTENT MAP"
+
+
+def test_oversized_text_is_not_text_cached(content_cache, fake_llm, tmp_path, monkeypatch):
+    """Text past CONTENT_CACHE_MAX_TEXT_MB is dropped from the recorder; the content map is still cached"""
+    path = str(tmp_path / "long.docx")
+    _make_docx(path, n=200)
+    monkeypatch.setattr(extractor, "CONTENT_CACHE_MAX_TEXT_MB", 0.001)  # ~1 KB
+    extractor.extract_context_node({"raw_docs": path})
+
+    digest = extractor._source_digest(path, True)
+    assert content_cache.get(f"text:{digest}") is None
+    assert content_cache.get(f"content_map:{extractor.EXTRACTOR_PROMPT_VERSION}:{digest}") is not None
+
+
+def test_text_recorder_stops_past_limit():
+    recorder = extractor._TextRecorder(max_chars=10)
+    assert list(recorder.record(["abcd", "efgh", "ijkl"])) == ["abcd", "efgh", "ijkl"]
+    assert recorder.text() is None and recorder.blocks == []
@@ -0,0 +1,111 @@
+"""
+Parity tests: lxml fast template parser vs the python-pptx parser.
+Uses python-pptx's default template, plus a copy with explicit formatting.
+
+Run: pytest test_fast_parser.py -v
+"""
+import pytest
+from pptx import Presentation
+from pptx.enum.text import MSO_AUTO_SIZE, PP_ALIGN
+from pptx.util import Pt, Emu
+from src.nodes.pipeline_1_indexing import parser
+
+# Values python-pptx reports when a property is only inherited from the master
+UNSET = {
+    "default_font_size_pt": None,
+    "auto_size": "None",
+    "default_alignment": "LEFT",
+}
+
+
+@pytest.fixture
+def default_template(tmp_path):
+    path = str(tmp_path / "default.pptx")
+    Presentation().save(path)
+    return path
+
+
+@pytest.fixture
+def formatted_template(tmp_path):
+    """Default template with explicit run/paragraph/body formatting on one layout"""
+    prs = Presentation()
+    layout = prs.slide_layouts[1]
+    title, body = layout.placeholders[0], layout.placeholders[1]
+
+    run = title.text_frame.paragraphs[0].runs[0]
+    run.font.size = Pt(30)
+    run.font.bold = True
+    run.font.name = "Georgia"
+    title.text_frame.paragraphs[0].alignment = PP_ALIGN.RIGHT
+    title.text_frame.word_wrap = False
+    title.text_frame.auto_size = MSO_AUTO_SIZE.NONE
+    title.text_frame.margin_left = Emu(12345)
+
+    body.text_frame.paragraphs[0].line_spacing = 1.2
+    body.left = Emu(500000)
+
+    path = str(tmp_path / "formatted.pptx")
+    prs.save(path)
+    return path
+
+
+def _assert_parity(path):
+    fast_layouts, fast_fps, _, fast_size = parser._parse_layouts_fast(path, set())
+    slow_layouts, slow_fps, _, slow_size = parser._parse_layouts(path, set())
+
+    assert fast_fps == slow_fps
+    assert fast_size == slow_size
+    assert [(l["index"], l["name"]) for l in fast_layouts] == [(l["index"], l["name"]) for l in slow_layouts]
+    for fast_layout, slow_layout in zip(fast_layouts, slow_layouts):
+        assert len(fast_layout["shapes"]) == len(slow_layout["shapes"])
+        for fast, slow in zip(fast_layout["shapes"], slow_layout["shapes"]):
+            assert set(fast) == set(slow)
+            for key in slow:
+                if key in UNSET and slow[key] == UNSET[key]:
+                    continue  # Fast parser may resolve the inherited value instead
+                assert fast[key] == slow[key], (slow_layout["name"], slow["name"], key)
+    return fast_layouts
+
+
+def test_parity_on_default_template(default_template):
+    """Identical raw_shape_data except for values python-pptx leaves unresolved"""
+    _assert_parity(default_template)
+
+
+def test_parity_with_explicit_formatting(formatted_template):
+    """Directly-applied formatting is reported exactly as python-pptx reports it"""
+    layouts = _assert_parity(formatted_template)
+    title = layouts[1]["shapes"][0]
+
+    assert title["default_font_size_pt"] == 30.0
+    assert title["is_bold"] is True
+    assert title["default_font_name"] == "Georgia"
+    assert title["default_alignment"] == "RIGHT (3)"
+    assert title["word_wrap"] is False
+    assert title["auto_size"] == "NONE (0)"
+    assert title["margin_left"] == 12345
+    assert layouts[1]["shapes"][1]["line_spacing"] == 1.2
+
+
+def test_inherited_defaults_are_recovered(default_template):
+    """Font size, alignment and autosize come from the master when the layout omits them"""
+    layouts, _, _, _ = parser._parse_layouts_fast(default_template, set())
+    title, body = layouts[1]["shapes"][0], layouts[1]["shapes"][1]
+
+    assert title["default_font_size_pt"] == 44.0
+    assert title["default_alignment"] == "CENTER (2)"
+    assert title["auto_size"] == "TEXT_TO_FIT_SHAPE (2)"
+    assert body["default_font_size_pt"] == 32.0
+    assert layouts[3]["shapes"][1]["default_font_size_pt"] == 28.0  # Layout lstStyle overrides master
+
+
+def test_node_uses_fallback_when_disabled(default_template, monkeypatch):
+    """FAST_TEMPLATE_PARSER=false keeps the python-pptx path"""
+    monkeypatch.setattr(parser, "FAST_TEMPLATE_PARSER", False)
+    slow = parser.parse_template_node({"template_path": default_template})
+    monkeypatch.setattr(parser, "FAST_TEMPLATE_PARSER", True)
+    fast = parser.parse_template_node({"template_path": default_template})
+
+    assert slow["raw_shape_data"][1]["shapes"][0]["default_font_size_pt"] is None
+    assert fast["raw_shape_data"][1]["shapes"][0]["default_font_size_pt"] == 44.0
+    assert fast["layout_fingerprints"] == slow["layout_fingerprints"]
@@ -0,0 +1,131 @@
+"""
+Unit tests for the columnar slot geometry store (src/core/geometry.py): the vectorized
+rules must match the per-shape Pipeline 1 logic exactly.
+
+Run: pytest test_geometry.py -v
+"""
+import random
+import numpy as np
+from src.core.geometry import SlotGeometry
+from src.nodes.pipeline_1_indexing.parser import _enrich_layouts
+from src.nodes.pipeline_1_indexing.registry_builder import derive_role_hint
+from src.utils.registry_index import get_registry_index
+
+SLIDE_W, SLIDE_H = 12192000, 6858000
+
+
+def _random_layouts(seed=7, n_layouts=40):
+    rng = random.Random(seed)
+    layouts = []
+    for i in range(n_layouts):
+        shapes = []
+        for j in range(rng.randint(0, 7)):
+            shapes.append({
+                "idx": j,
+                "name": rng.choice(["Title 1", "Content Placeholder 2", "Picture Placeholder 3", "Footer 4"]),
+                "left": rng.randint(0, SLIDE_W),
+                "top": rng.randint(0, SLIDE_H),
+                "width": rng.choice([None, rng.randint(0, SLIDE_W)]),
+                "height": rng.randint(0, SLIDE_H),
+                "shape_type": rng.choice(["rectangle", "oval", "other"]),
+            })
+        layouts.append({"index": i, "name": f"Layout {i}", "shapes": shapes})
+    return layouts
+
+
+def _scalar_enrich(shape):
+    """The per-shape normalization Pipeline 1 used before the columnar store."""
+    width, height = shape.get("width") or 0, shape.get("height") or 0
+    out = {
+        "norm_left": (shape.get("left") or 0) / SLIDE_W,
+        "norm_top": (shape.get("top") or 0) / SLIDE_H,
+        "norm_width": width / SLIDE_W,
+        "norm_height": height / SLIDE_H,
+        "area_ratio": (width * height) / (SLIDE_W * SLIDE_H),
+        "area_score": (width * height) / (914400 ** 2),
+        "is_circular": shape["shape_type"] == "oval",
+    }
+    if out["is_circular"]:
+        out["radius"] = min(out["norm_width"], out["norm_height"]) / 2
+        if abs(out["norm_width"] - out["norm_height"]) > 0.01:
+            out["ellipse_axes"] = (out["norm_width"] / 2, out["norm_height"] / 2)
+    return out
+
+
+def test_normalization_is_bit_identical():
+    """Vectorized enrichment produces exactly the scalar values (same floats, same keys)"""
+    layouts = _random_layouts()
+    expected = [_scalar_enrich(s) for layout in layouts for s in layout["shapes"]]
+    _enrich_layouts(layouts, SLIDE_W, SLIDE_H)
+    actual = [s for layout in layouts for s in layout["shapes"]]
+
+    for shape, want in zip(actual, expected):
+        assert {k: shape[k] for k in want} == want
+        assert ("radius" in shape) == ("radius" in want)
+        assert type(shape["norm_top"]) is float
+
+
+def test_zero_slide_size_normalizes_to_zero():
+    """A zero slide dimension yields 0.0 instead of dividing by zero"""
+    geometry = SlotGeometry.from_emu([{"shapes": [{"left": 5, "top": 5, "width": 5, "height": 5}]}], 0, 0)
+    assert geometry.norm_left.tolist() == [0.0]
+    assert geometry.area_ratio.tolist() == [0.0]
+
+
+def test_role_hints_match_scalar_rule():
+    """role_hints() agrees with derive_role_hint, including rule boundaries"""
+    values = [0.0, 0.1, 0.2, 0.3, 0.5, 0.8, 0.81, 1.0]
+    rows = [{"norm_top": t, "norm_height": h, "area_ratio": a}
+            for t in values for h in values for a in values]
+    geometry = SlotGeometry.from_layouts([{"shapes": rows}], key="shapes")
+
+    assert geometry.role_hints().tolist() == [derive_role_hint(r) for r in rows]
+
+
+def test_classify_layouts_matches_builder_rules():
+    """Purpose and density per layout follow the registry builder's composition rules"""
+    def title(area=0.06):
+        return {"norm_top": 0.05, "norm_height": 0.1, "area_ratio": area}
+
+    def content():
+        return {"norm_top": 0.5, "norm_height": 0.3, "area_ratio": 0.15}
+
+    def body():
+        return {"norm_top": 0.3, "norm_height": 0.6, "area_ratio": 0.5}
+
+    layouts = [
+        {"shapes": [title()]},                                   # TITLE_SLIDE, low
+        {"shapes": [title(0.01)]},                               # small title only
+        {"shapes": [title(), body()]},                           # image (mask below)
+        {"shapes": [title(), content(), content()]},             # COMPARISON_SLIDE
+        {"shapes": [title(), body(), body(), body(), body()]},   # CONTENT_SLIDE, high
+        {"shapes": []},
+    ]
+    geometry = SlotGeometry.from_layouts(layouts, key="shapes")
+    is_picture = np.zeros(len(geometry), dtype=bool)
+    is_picture[geometry.rows(2).start + 1] = True
+
+    purposes, densities = geometry.classify_layouts(is_picture=is_picture)
+
+    assert purposes.tolist() == ["TITLE_SLIDE", "GENERAL_CONTENT", "VISUAL_SLIDE",
+                                 "COMPARISON_SLIDE", "CONTENT_SLIDE", "GENERAL_CONTENT"]
+    assert densities.tolist() == ["low", "low", "low", "medium", "high", "low"]
+
+
+def test_registry_geometry_rows_follow_slots():
+    """RegistryIndex.geometry() exposes the registry's slot geometry, grouped by layout"""
+    registry = {"layouts": [
+        {"layout_index": 0, "slots": [{"geometry": {"norm_top": 0.1, "area_ratio": 0.2}}]},
+        {"layout_index": 3, "slots": [
+            {"geometry": {"norm_top": 0.4, "area_ratio": 0.5, "shape_type": "oval",
+                          "norm_width": 0.2, "norm_height": 0.3}},
+            {"geometry": None},
+        ]},
+    ]}
+    geometry = get_registry_index(registry).geometry()
+
+    assert geometry is get_registry_index(registry).geometry()
+    assert geometry.layout.tolist() == [0, 1, 1]
+    assert geometry.norm_top[geometry.rows(1)].tolist() == [0.4, 0.0]
+    assert geometry.is_circular.tolist() == [False, True, False]
+    assert geometry.radius()[1] == 0.1
@@ -0,0 +1,180 @@
+"""
+Tests for batch template indexing (index_templates.py): process pool, incremental
+re-indexing and atomic registry writes.
+Pipeline 1 needs no LLM, so these run against python-pptx's default template.
+
+Run: pytest test_index_templates.py -v
+"""
+import json
+import os
+import pytest
+from pptx import Presentation
+import index_templates
+from src.utils.registry_helper import write_registry, load_registry
+
+
+@pytest.fixture
+def library(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    for name in ("alpha", "beta", "gamma"):
+        Presentation().save(str(templates / f"{name}.pptx"))
+    (templates / "broken.pptx").write_bytes(b"not a zip")
+    return templates, tmp_path / "registry"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failures_are_isolated(library, workers):
+    """A corrupt template is reported without stopping the others (sequential and pooled)"""
+    templates, registry = library
+    results = index_templates.start_indexing(workers=workers, templates_dir=templates, registry_dir=registry)
+
+    by_name = {r["template"]: r for r in results}
+    assert len(results) == 4
+    assert not by_name["broken.pptx"]["ok"]
+    assert by_name["broken.pptx"]["error"]
+    assert all(by_name[f"{n}.pptx"]["ok"] for n in ("alpha", "beta", "gamma"))
+    assert sorted(p.name for p in registry.glob("*.json")) == ["alpha.json", "beta.json", "gamma.json"]
+    assert len(load_registry(registry / "alpha.json")["layouts"]) == 11
+
+
+def test_pool_matches_sequential(library, tmp_path):
+    """Parallel indexing produces the same registries as sequential indexing"""
+    templates, _ = library
+    seq, par = tmp_path / "seq", tmp_path / "par"
+    index_templates.start_indexing(workers=1, templates_dir=templates, registry_dir=seq)
+    index_templates.start_indexing(workers=3, templates_dir=templates, registry_dir=par)
+
+    for name in ("alpha.json", "beta.json", "gamma.json"):
+        assert json.loads((seq / name).read_text()) == json.loads((par / name).read_text())
+
+
+def test_atomic_write_keeps_previous_registry_on_failure(tmp_path, monkeypatch):
+    """A crash while writing leaves the old registry intact and no temp files behind"""
+    path = tmp_path / "alpha.json"
+    write_registry(path, {"master_name": "v1", "layouts": []})
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        write_registry(path, {"master_name": "v2", "layouts": []})
+
+    assert json.loads(path.read_text())["master_name"] == "v1"
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+
+# --- Incremental Re-indexing Tests ---
+
+def _count_parsed_layouts(monkeypatch):
+    from src.nodes.pipeline_1_indexing import parser
+    from src.nodes.pipeline_1_indexing.fast_parser import TemplatePackage
+    calls = []
+    original = TemplatePackage.layout_shapes
+
+    def counting(self, index):
+        calls.append(self.layout_name(index))
+        return original(self, index)
+
+    monkeypatch.setattr(parser, "FAST_TEMPLATE_PARSER", True)
+    monkeypatch.setattr(TemplatePackage, "layout_shapes", counting)
+    return calls
+
+
+def test_unchanged_template_is_skipped(tmp_path):
+    """A template whose hash matches its registry is not re-run or re-written"""
+    template = tmp_path / "alpha.pptx"
+    Presentation().save(str(template))
+    first = index_templates.index_template(str(template), str(tmp_path))
+    mtime = os.stat(first["registry"]).st_mtime_ns
+
+    second = index_templates.index_template(str(template), str(tmp_path))
+
+    assert second["ok"] and second["skipped"]
+    assert os.stat(second["registry"]).st_mtime_ns == mtime
+    assert not index_templates.index_template(str(template), str(tmp_path), full=True)["skipped"]
+
+
+def test_only_changed_layouts_are_reparsed(tmp_path, monkeypatch):
+    """Editing one layout re-parses just that layout; the merged registry equals a full rebuild"""
+    template = tmp_path / "alpha.pptx"
+    Presentation().save(str(template))
+    index_templates.index_template(str(template), str(tmp_path))
+
+    prs = Presentation(str(template))
+    prs.slide_layouts[5].name = "Title Only (edited)"
+    prs.save(str(template))
+
+    parsed = _count_parsed_layouts(monkeypatch)
+    result = index_templates.index_template(str(template), str(tmp_path))
+    incremental = load_registry(result["registry"])
+
+    assert result["ok"] and not result["skipped"]
+    assert parsed == ["Title Only (edited)"]
+
+    full_dir = tmp_path / "full"
+    index_templates.index_template(str(template), str(full_dir), full=True)
+    assert incremental == load_registry(full_dir / "alpha.json")
+
+
+def test_registry_records_fingerprints(tmp_path):
+    """Registries carry the template hash and one fingerprint per layout"""
+    from src.nodes.pipeline_1_indexing.parser import hash_template_file
+
+    template = tmp_path / "alpha.pptx"
+    Presentation().save(str(template))
+    registry = load_registry(index_templates.index_template(str(template), str(tmp_path))["registry"])
+
+    assert registry["template_hash"] == hash_template_file(str(template))
+    assert len(registry["layout_fingerprints"]) == 11
+
+
+def test_registry_from_older_indexer_is_rebuilt(tmp_path, monkeypatch):
+    """An unchanged template is re-indexed in full when its registry predates INDEXER_VERSION"""
+    from src.nodes.pipeline_1_indexing.layout_validator import INDEXER_VERSION
+
+    template = tmp_path / "alpha.pptx"
+    Presentation().save(str(template))
+    path = index_templates.index_template(str(template), str(tmp_path))["registry"]
+    registry = load_registry(path)
+    assert registry["indexer_version"] == INDEXER_VERSION
+    registry["indexer_version"] = INDEXER_VERSION - 1
+    write_registry(path, registry)
+
+    parsed = _count_parsed_layouts(monkeypatch)
+    result = index_templates.index_template(str(template), str(tmp_path))
+
+    assert result["ok"] and not result["skipped"]
+    assert len(parsed) == 11
+    assert load_registry(path)["indexer_version"] == INDEXER_VERSION
+
+
+def test_failed_layout_is_not_fingerprinted(tmp_path, monkeypatch):
+    """A layout dropped by the builder is re-parsed next run instead of counting as unchanged"""
+    from src.nodes.pipeline_1_indexing import registry_builder
+
+    template = tmp_path / "alpha.pptx"
+    Presentation().save(str(template))
+    real_metadata = registry_builder.LayoutMetadata
+
+    def failing_metadata(**kwargs):
+        if kwargs["layout_index"] == 5:
+            raise ValueError("bad layout")
+        return real_metadata(**kwargs)
+
+    monkeypatch.setattr(registry_builder, "LayoutMetadata", failing_metadata)
+    registry = load_registry(index_templates.index_template(str(template), str(tmp_path))["registry"])
+    assert "5" not in registry["layout_fingerprints"]
+    assert 5 not in [l["layout_index"] for l in registry["layouts"]]
+
+    monkeypatch.setattr(registry_builder, "LayoutMetadata", real_metadata)
+    prs = Presentation(str(template))
+    prs.slide_layouts[0].name = "Title Slide (edited)"
+    prs.save(str(template))
+
+    parsed = _count_parsed_layouts(monkeypatch)
+    registry = load_registry(index_templates.index_template(str(template), str(tmp_path))["registry"])
+    assert sorted(parsed) == sorted(["Title Slide (edited)", "Title Only"])
+    assert 5 in [l["layout_index"] for l in registry["layouts"]]
+    assert len(registry["layout_fingerprints"]) == 11
@@ -0,0 +1,107 @@
+"""
+Unit tests for StrictLayout collision detection (sweep line in src/core/geometry.py)
+and batch layout validation.
+
+Run: pytest test_layout_models.py -v
+"""
+import random
+import pytest
+from pydantic import ValidationError
+from src.core.geometry import find_overlaps
+from src.core.layout_models import (
+    StrictLayout,
+    StrictSlot,
+    Styling,
+    find_layout_collisions,
+    validate_layouts,
+)
+
+STYLE = {"font_size": 20, "font_weight": "normal", "alignment": "left", "hex_color": "#000000"}
+
+
+def _slot(slot_id, x, y, w=100, h=100, role="BODY_COPY"):
+    return {"slot_id": slot_id, "role": role, "content_type": "text",
+            "coordinates": {"x": x, "y": y, "w": w, "h": h}, "styling": STYLE, "description": "Box"}
+
+
+def _layout(*slots):
+    return {"template_name": "t", "total_slots": len(slots), "slots": list(slots)}
+
+
+def _too_close(c1, c2, padding):
+    """Pairwise oracle: box 1 expanded by padding intersects box 2."""
+    if c1["x"] - padding >= c2["x"] + c2["w"] or c2["x"] >= c1["x"] + c1["w"] + padding:
+        return False
+    if c1["y"] - padding >= c2["y"] + c2["h"] or c2["y"] >= c1["y"] + c1["h"] + padding:
+        return False
+    return True
+
+
+def _brute_force(boxes, padding):
+    return [
+        (i, j)
+        for i in range(len(boxes))
+        for j in range(i + 1, len(boxes))
+        if _too_close(boxes[i], boxes[j], padding)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sweep_matches_pairwise_check(seed):
+    """The sweep line finds exactly the pairs a pairwise check finds"""
+    rng = random.Random(seed)
+    boxes = [{"x": rng.randint(0, 1800), "y": rng.randint(0, 1000),
+              "w": rng.randint(1, 300), "h": rng.randint(1, 200)} for _ in range(150)]
+    # Edge cases: touching exactly at the padding distance, and stacked columns
+    boxes += [{"x": 0, "y": 0, "w": 100, "h": 100}, {"x": 120, "y": 0, "w": 100, "h": 100},
+              {"x": 0, "y": 119, "w": 100, "h": 100}]
+    boxes += [{"x": 1500, "y": 10 * k, "w": 50, "h": 5} for k in range(40)]
+
+    found = find_overlaps([b["x"] for b in boxes], [b["y"] for b in boxes],
+                          [b["w"] for b in boxes], [b["h"] for b in boxes], padding=20)
+    assert found == _brute_force(boxes, 20)
+
+
+def test_groups_are_checked_independently():
+    """Boxes in different groups never collide with each other"""
+    assert find_overlaps([0, 0, 0], [0, 0, 0], [10, 10, 10], [10, 10, 10], groups=[0, 1, 0]) == [(0, 2)]
+
+
+def test_all_collisions_are_reported():
+    """The validation error lists every colliding pair, first pair first"""
+    data = _layout(_slot(1, 200, 200), _slot(2, 305, 200), _slot(3, 200, 700), _slot(4, 250, 750))
+    with pytest.raises(ValidationError) as exc:
+        StrictLayout.model_validate(data)
+
+    message = str(exc.value)
+    assert "Slot 1 is too close to Slot 2 (min padding 20px)" in message
+    assert "Slot 3 is too close to Slot 4 (min padding 20px)" in message
+
+
+def test_collisions_on_valid_layout():
+    """A layout with exactly padding-wide gaps validates and reports no collisions"""
+    layout = StrictLayout.model_validate(_layout(_slot(1, 200, 200), _slot(2, 320, 200)))
+    assert layout.collisions() == []
+    assert layout.collisions(padding=30) == [(1, 2)]
+
+
+def test_validate_layouts_batch():
+    """A batch reports per-layout results: valid, field errors and collisions"""
+    results = validate_layouts([
+        _layout(_slot(1, 200, 200), _slot(2, 400, 200)),
+        _layout(_slot(1, 10, 200)),
+        _layout(_slot(1, 200, 200), _slot(2, 250, 250)),
+    ])
+
+    assert isinstance(results[0][0], StrictLayout) and results[0][1] == []
+    assert results[1][0] is None and "Safe Zone" in results[1][1][0]
+    assert results[2] == (None, ["Slot 1 is too close to Slot 2 (min padding 20px)"])
+
+
+def test_find_layout_collisions_uses_slot_ids():
+    """Collisions are reported as slot_id pairs per layout"""
+    layouts = [
+        StrictLayout.model_validate(_layout(_slot(2, 200, 200), _slot(1, 600, 200)), context={"skip_collisions": True}),
+        StrictLayout.model_validate(_layout(_slot(1, 200, 200), _slot(2, 210, 210)), context={"skip_collisions": True}),
+    ]
+    assert find_layout_collisions(layouts) == [[], [(1, 2)]]
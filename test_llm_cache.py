@@ -0,0 +1,188 @@
+"""
+Unit tests for the persistent LLM response cache.
+Uses a fake chat model so no API keys are required.
+
+Run: pytest test_llm_cache.py -v
+"""
+import time
+import pytest
+from langchain_core.messages import AIMessage
+from src.core.state import ArchitecturePlan, SlidePlanModel
+from src.utils.llm_cache import SqliteCache, CachedLLM
+
+
+class FakeChatModel:
+    """Counts calls; echoes the prompt or returns a fixed structured plan."""
+
+    def __init__(self, schema=None):
+        self.schema = schema
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        if self.schema is ArchitecturePlan:
+            return ArchitecturePlan(slides=[
+                SlidePlanModel(layout_index=3, layout_name="Title", slide_intent=prompt, slide_role="TITLE")
+            ])
+        return AIMessage(content=f"echo: {prompt}")
+
+    def with_structured_output(self, schema, **kwargs):
+        return FakeChatModel(schema=schema)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SqliteCache(str(tmp_path / "llm.sqlite"))
+
+
+def _wrap(llm, cache, temperature=0):
+    return CachedLLM(llm, cache, provider="fake", model="fake-1", temperature=temperature)
+
+
+def test_repeat_prompt_is_served_from_cache(cache):
+    """Identical prompts hit the cache instead of the model"""
+    llm = FakeChatModel()
+    cached = _wrap(llm, cache)
+
+    first = cached.invoke("hello")
+    second = cached.invoke("hello")
+
+    assert llm.calls == 1
+    assert first.content == second.content == "echo: hello"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_includes_temperature(cache):
+    """Different sampling temperatures never share entries"""
+    llm = FakeChatModel()
+    _wrap(llm, cache, temperature=0).invoke("hello")
+    _wrap(llm, cache, temperature=0.7).invoke("hello")
+    assert llm.calls == 2
+
+
+def test_structured_output_round_trips(cache):
+    """Pydantic structured responses come back as the same model type"""
+    base = FakeChatModel()
+    structured = _wrap(base, cache).with_structured_output(ArchitecturePlan)
+
+    first = structured.invoke("plan it")
+    second = _wrap(base, cache).with_structured_output(ArchitecturePlan).invoke("plan it")
+
+    assert isinstance(second, ArchitecturePlan)
+    assert second == first
+    assert second.slides[0].layout_index == 3
+
+
+def test_structured_and_plain_do_not_collide(cache):
+    """Same prompt with and without a schema uses different keys"""
+    base = FakeChatModel()
+    _wrap(base, cache).invoke("same")
+    plan = _wrap(base, cache).with_structured_output(ArchitecturePlan).invoke("same")
+    assert isinstance(plan, ArchitecturePlan)
+
+
+def test_ttl_expiry(tmp_path):
+    """Entries older than the TTL are treated as misses"""
+    cache = SqliteCache(str(tmp_path / "ttl.sqlite"), ttl_seconds=0.05)
+    cache.set("k", b"v")
+    assert cache.get("k") == b"v"
+    time.sleep(0.1)
+    assert cache.get("k") is None
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    """Total size stays under max_bytes by evicting the least recently accessed entries"""
+    cache = SqliteCache(str(tmp_path / "lru.sqlite"), max_bytes=25)
+    cache.set("a", b"x" * 10)
+    cache.set("b", b"x" * 10)
+    time.sleep(0.01)
+    cache.get("a")  # 'b' is now least recently used
+    cache.set("c", b"x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["bytes"] <= 25
+
+
+def test_cache_shared_across_instances(tmp_path):
+    """A second SqliteCache on the same file (another worker process) sees stored entries"""
+    path = str(tmp_path / "shared.sqlite")
+    SqliteCache(path).set("k", b"v")
+    assert SqliteCache(path).get("k") == b"v"
+
+
+def test_running_total_tracks_writes(tmp_path):
+    """The size total kept for eviction matches the entries after inserts, overwrites and deletes"""
+    path = str(tmp_path / "total.sqlite")
+    cache = SqliteCache(path, ttl_seconds=0.05)
+    cache.set("a", b"x" * 10)
+    cache.set("b", b"x" * 7)
+    cache.set("a", b"x" * 3)  # Overwrite shrinks the entry
+    assert cache.stats()["bytes"] == 10
+    time.sleep(0.1)
+    cache.get("b")  # Expired: deleted
+    assert cache.stats()["bytes"] == 3
+    assert SqliteCache(path).stats()["bytes"] == 3
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+def test_running_total_seeded_for_existing_cache(tmp_path):
+    """A cache file written before the total was kept is seeded from its entries once"""
+    import sqlite3
+    path = str(tmp_path / "legacy.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                 " created REAL NOT NULL, accessed REAL NOT NULL)")
+    conn.execute("INSERT INTO cache VALUES ('old', ?, 12, ?, ?)", (b"x" * 12, time.time(), time.time()))
+    conn.commit()
+    conn.close()
+
+    cache = SqliteCache(path)
+    assert cache.stats()["bytes"] == 12
+    cache.set("new", b"x" * 5)
+    assert cache.stats()["bytes"] == 17
+
+
+def test_rejected_responses_are_not_cached(cache):
+    """A reply the validator rejects is returned but not stored, so a retry asks the model again"""
+    llm = FakeChatModel()
+    cached = _wrap(llm, cache).with_validator(lambda response: response.content.startswith("{"))
+
+    assert cached.invoke("hello").content == "echo: hello"
+    cached.invoke("hello")
+    assert llm.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_rejected_cached_entry_is_dropped(cache):
+    """An entry cached without validation is dropped once a validator rejects it"""
+    llm = FakeChatModel()
+    _wrap(llm, cache).invoke("hello")
+    strict = _wrap(llm, cache).with_validator(lambda response: False)
+
+    strict.invoke("hello")
+    assert llm.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_writer_does_not_cache_unparseable_replies(cache, monkeypatch):
+    """The writer's cached model only keeps replies that parse as JSON"""
+    from src.nodes.pipeline_2_generation import writer
+
+    class ReplyModel(FakeChatModel):
+        def invoke(self, prompt):
+            self.calls += 1
+            return AIMessage(content='```json\n{"content": {"title": "ok"}}\n```' if "good" in prompt else "not json")
+
+    llm = ReplyModel()
+    monkeypatch.setattr(writer, "_llm_instance", None)
+    monkeypatch.setattr(writer, "get_llm", lambda **kwargs: _wrap(llm, cache))
+    writer._get_llm().invoke("bad")
+    writer._get_llm().invoke("good")
+    writer._get_llm().invoke("good")
+
+    assert llm.calls == 2
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,49 @@
+"""
+Unit tests for the Paginator node (split_slide overflow policy).
+
+Run: pytest test_paginator.py -v
+"""
+from src.nodes.pipeline_2_generation.paginator import paginator_node, split_bullets
+
+BULLETS_SLOT = {"semantic_role": "bullets", "max_bullets": 3, "max_chars_per_bullet": 40,
+                "overflow_policy": "split_slide"}
+
+
+def _slide(bullets, slot=BULLETS_SLOT, **content):
+    return {
+        "layout_index": 2,
+        "content": {"title": "Results", "bullets": bullets, **content},
+        "slide_role": "CONTENT",
+        "background_image": {"enabled": False},
+        "_semantic_mapping": {"title": [{"semantic_role": "title"}], "bullets": [slot]},
+    }
+
+
+def test_split_bullets_counts_long_bullets_as_lines():
+    """A bullet over max_chars_per_bullet counts for the lines it wraps to"""
+    long = "x" * 90  # 3 lines at 40 chars
+    assert split_bullets(["a", "b", long, "c"], 3, 40) == [["a", "b"], [long], ["c"]]
+    assert split_bullets(["a", "b"], 3, 40) == [["a", "b"]]
+
+
+def test_overflow_becomes_continuation_slides():
+    """Seven bullets at max 3 become three slides with the same layout, in order"""
+    bullets = [f"Point {i}" for i in range(7)]
+    state = {"manifest": [_slide(["Intro"]), _slide(bullets, body="Only on the first slide")],
+             "slide_plans": [{"slide_intent": "intro"}, {"slide_intent": "results"}]}
+    result = paginator_node(state)
+    manifest = result["manifest"]
+
+    assert [s["content"]["bullets"] for s in manifest[1:]] == [bullets[0:3], bullets[3:6], bullets[6:]]
+    assert [s["content"]["title"] for s in manifest] == ["Results", "Results", "Results (cont.)", "Results (cont.)"]
+    assert all(s["layout_index"] == 2 for s in manifest)
+    assert "body" in manifest[1]["content"] and "body" not in manifest[2]["content"]
+    assert [p["slide_intent"] for p in result["slide_plans"]] == ["intro", "results", "results", "results"]
+    assert state["manifest"][1]["content"]["bullets"] == bullets  # Input not mutated
+
+
+def test_other_policies_are_left_alone():
+    """Slots without split_slide (or lists that fit) produce no state update"""
+    shrink = dict(BULLETS_SLOT, overflow_policy="shrink")
+    state = {"manifest": [_slide([f"Point {i}" for i in range(7)], slot=shrink), _slide(["a", "b"])]}
+    assert paginator_node(state) == {}
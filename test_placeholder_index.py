@@ -0,0 +1,48 @@
+"""
+Unit tests for the per-slide PlaceholderIndex and the lookups that use it.
+
+Run: pytest test_placeholder_index.py -v
+"""
+import pytest
+from pptx import Presentation
+from src.utils.ppt_helper import PlaceholderIndex, find_placeholder_by_id
+from src.nodes.pipeline_2_generation.injector import find_placeholder_by_semantic_role
+
+
+@pytest.fixture
+def slide():
+    prs = Presentation()
+    return prs.slides.add_slide(prs.slide_layouts[1])  # Title and Content
+
+
+def test_index_matches_linear_lookup(slide):
+    """Indexed idx lookups return the same shapes as the linear scan"""
+    index = PlaceholderIndex(slide)
+    for shape in slide.placeholders:
+        idx = shape.placeholder_format.idx
+        assert find_placeholder_by_id(slide, idx, index).shape_id == find_placeholder_by_id(slide, idx).shape_id
+    assert find_placeholder_by_id(slide, 99, index) is None
+
+
+def test_semantic_role_tiers(slide):
+    """idx first, then type name substring, then shape name"""
+    index = PlaceholderIndex(slide)
+    title = slide.shapes.title
+    body_name = slide.placeholders[1].name
+
+    by_idx = [{"semantic_role": "title", "placeholder_idx": 0}]
+    by_type = [{"semantic_role": "body", "placeholder_idx": 42, "placeholder_type": "OBJECT (7)"}]
+    by_name = [{"semantic_role": "body", "placeholder_idx": 42, "placeholder_name": body_name}]
+    missing = [{"semantic_role": "body", "placeholder_idx": 42, "placeholder_name": "Nope"}]
+
+    assert find_placeholder_by_semantic_role(slide, "title", by_idx, index).shape_id == title.shape_id
+    assert find_placeholder_by_semantic_role(slide, "body", by_type, index).name == body_name
+    assert find_placeholder_by_semantic_role(slide, "body", by_name, index).name == body_name
+    assert find_placeholder_by_semantic_role(slide, "body", missing, index) is None
+    assert find_placeholder_by_semantic_role(slide, "footer", by_idx, index) is None
+
+
+def test_semantic_lookup_builds_index_when_missing(slide):
+    """Callers without an index still get the same answer"""
+    slots = [{"semantic_role": "title", "placeholder_type": "TITLE (1)"}]
+    assert find_placeholder_by_semantic_role(slide, "title", slots).shape_id == slide.shapes.title.shape_id
@@ -0,0 +1,113 @@
+"""
+Unit tests for the precomputed registry indexes and the RegistryIndex accessor.
+
+Run: pytest test_registry_index.py -v
+"""
+import copy
+import json
+from src.utils.registry_index import build_registry_indexes, get_registry_index, RegistryIndex
+
+
+def _slot(layout_index, idx, role, ptype="BODY (2)"):
+    return {
+        "layout_index": layout_index,
+        "placeholder_idx": idx,
+        "placeholder_type": ptype,
+        "placeholder_name": f"Placeholder {idx}",
+        "semantic_role": role,
+        "slot_id": idx,
+    }
+
+
+REGISTRY = {
+    "master_name": "test.pptx",
+    "layouts": [
+        {"layout_index": 0, "layout_name": "Title", "slots": [_slot(0, 0, "title", "TITLE (1)")]},
+        {"layout_index": 5, "layout_name": "Two Content", "slots": [
+            _slot(5, 0, "title", "TITLE (1)"),
+            _slot(5, 1, "body"),
+            _slot(5, 2, "body"),
+            _slot(5, 10, "footer", "FOOTER (15)"),
+        ]},
+    ],
+}
+
+
+def test_indexes_are_json_serializable_positions():
+    """Embedded indexes survive a JSON round trip and reference positions, not copies"""
+    indexes = json.loads(json.dumps(build_registry_indexes(REGISTRY)))
+    assert indexes["layout_positions"] == {"0": 0, "5": 1}
+    assert indexes["slots_by_role"]["5"] == {"title": [0], "body": [1, 2], "footer": [3]}
+    assert indexes["slots_by_id"]["5"]["10"] == 3
+    assert indexes["stable_keys"]["5:FOOTER (15):10"] == [1, 3]
+
+
+def test_accessor_with_and_without_embedded_indexes():
+    """Embedded and computed indexes answer identically"""
+    embedded = copy.deepcopy(REGISTRY)
+    embedded["indexes"] = json.loads(json.dumps(build_registry_indexes(embedded)))
+
+    for registry in (REGISTRY, embedded):
+        index = RegistryIndex(registry)
+        assert index.layout(5)["layout_name"] == "Two Content"
+        assert index.layout(99) is None
+        assert [s["placeholder_idx"] for s in index.slots_by_role(5)["body"]] == [1, 2]
+        assert index.slots_by_role(99) == {}
+        assert index.slot(5, 10)["semantic_role"] == "footer"
+        assert index.slot(0, 10) is None
+        assert index.by_stable_key("0:TITLE (1):0") is registry["layouts"][0]["slots"][0]
+
+
+def test_stale_embedded_indexes_are_ignored():
+    """Indexes that no longer match the layouts are recomputed"""
+    registry = copy.deepcopy(REGISTRY)
+    registry["indexes"] = build_registry_indexes(registry)
+    registry["layouts"].reverse()
+
+    assert RegistryIndex(registry).layout(5)["layout_name"] == "Two Content"
+
+
+def test_stale_slot_positions_are_ignored():
+    """Slots removed after indexing fall back to recomputed indexes instead of IndexError"""
+    registry = copy.deepcopy(REGISTRY)
+    registry["indexes"] = build_registry_indexes(registry)
+    del registry["layouts"][1]["slots"][2:]
+
+    index = RegistryIndex(registry)
+    assert [s["placeholder_idx"] for s in index.slots_by_role(5)["body"]] == [1]
+    assert index.slot(5, 10) is None
+    assert index.by_stable_key("5:FOOTER (15):10") is None
+
+
+def test_out_of_range_slot_position_is_ignored():
+    """A hand-edited position past the layout's slots is not trusted"""
+    registry = copy.deepcopy(REGISTRY)
+    registry["indexes"] = build_registry_indexes(registry)
+    registry["indexes"]["slots_by_id"]["5"]["10"] = 7
+
+    assert RegistryIndex(registry).slot(5, 10)["semantic_role"] == "footer"
+
+
+def test_index_is_cached_per_registry_object():
+    """Repeated lookups for the same registry reuse one index"""
+    registry = copy.deepcopy(REGISTRY)
+    assert get_registry_index(registry) is get_registry_index(registry)
+    assert get_registry_index(copy.deepcopy(REGISTRY)) is not get_registry_index(registry)
+
+
+def test_registry_builder_embeds_indexes():
+    """build_registry_node output carries indexes that match its layouts"""
+    from src.nodes.pipeline_1_indexing.registry_builder import build_registry_node
+
+    shape = {
+        "idx": 0, "type": "TITLE (1)", "name": "Title 1", "area_ratio": 0.1,
+        "norm_top": 0.05, "norm_left": 0.05, "norm_width": 0.9, "norm_height": 0.15,
+    }
+    result = build_registry_node({
+        "template_path": "deck.pptx",
+        "raw_shape_data": [{"index": 3, "name": "Title Only", "shapes": [shape]}],
+    })
+    registry = result["json_description"]
+
+    assert registry["indexes"] == build_registry_indexes(registry)
+    assert get_registry_index(registry).slots_by_role(3)["title"][0]["placeholder_name"] == "Title 1"
@@ -0,0 +1,179 @@
+"""
+Unit tests for the lazy, cached RegistryStore and the binary registry snapshots.
+
+Run: pytest test_registry_store.py -v
+"""
+import json
+import os
+import pytest
+from src.utils.registry_helper import (
+    RegistryStore,
+    list_template_files,
+    load_registry,
+    snapshot_path,
+    write_registry,
+    write_registry_snapshot,
+)
+
+
+def _write_registry(registry_dir, key, master_name, bump_ns=0):
+    path = registry_dir / f"{key}.json"
+    with open(path, "w") as f:
+        json.dump({"master_name": master_name, "layouts": []}, f)
+    if bump_ns:
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+    return path
+
+
+@pytest.fixture
+def registry_dir(tmp_path):
+    _write_registry(tmp_path, "alpha", "alpha.pptx")
+    _write_registry(tmp_path, "beta", "beta.pptx")
+    return tmp_path
+
+
+def test_get_loads_lazily_and_caches(registry_dir):
+    """Only the requested registry is parsed, and only once"""
+    store = RegistryStore(str(registry_dir))
+    first = store.get("alpha")
+    second = store.get("alpha")
+
+    assert first["master_name"] == "alpha.pptx"
+    assert first is second
+    assert store.stats()["misses"] == 1
+    assert store.stats()["hits"] == 1
+    assert store.stats()["cached"] == ["alpha"]
+
+
+def test_get_missing_returns_none(registry_dir):
+    """Unknown template keys return None instead of raising"""
+    assert RegistryStore(str(registry_dir)).get("missing") is None
+
+
+def test_mtime_change_revalidates(registry_dir):
+    """A rewritten registry is picked up on the next get()"""
+    store = RegistryStore(str(registry_dir))
+    store.get("alpha")
+    _write_registry(registry_dir, "alpha", "alpha-v2.pptx", bump_ns=10_000_000)
+
+    assert store.get("alpha")["master_name"] == "alpha-v2.pptx"
+    assert store.stats()["misses"] == 2
+
+
+def test_lru_eviction(registry_dir):
+    """Least recently used registries are evicted past max_entries"""
+    _write_registry(registry_dir, "gamma", "gamma.pptx")
+    store = RegistryStore(str(registry_dir), max_entries=2)
+    store.get("alpha")
+    store.get("beta")
+    store.get("alpha")
+    store.get("gamma")
+
+    assert store.stats()["cached"] == ["alpha", "gamma"]
+
+
+def test_catalog_lists_without_parsing(registry_dir):
+    """catalog() enumerates keys but parses nothing"""
+    store = RegistryStore(str(registry_dir))
+    catalog = store.catalog()
+
+    assert set(catalog) == {"alpha", "beta"}
+    assert store.has("beta")
+    assert store.stats()["misses"] == 0
+
+
+def test_catalog_picks_up_new_registry(registry_dir):
+    """Adding a registry file changes the directory mtime and refreshes the catalog"""
+    store = RegistryStore(str(registry_dir))
+    store.catalog()
+    _write_registry(registry_dir, "gamma", "gamma.pptx")
+    st = os.stat(registry_dir)
+    os.utime(registry_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+    assert "gamma" in store.catalog()
+
+
+def test_list_template_files(tmp_path):
+    """Only .pptx files are listed"""
+    (tmp_path / "b.pptx").write_bytes(b"")
+    (tmp_path / "a.pptx").write_bytes(b"")
+    (tmp_path / "notes.txt").write_bytes(b"")
+    assert list_template_files(str(tmp_path)) == ["a.pptx", "b.pptx"]
+
+
+# --- Binary Snapshot Tests ---
+
+def test_snapshot_round_trips(registry_dir):
+    """The snapshot loads to exactly the JSON contents"""
+    path = registry_dir / "alpha.json"
+    write_registry_snapshot(path)
+
+    with open(path) as f:
+        assert load_registry(path) == json.load(f)
+
+
+def test_loader_prefers_fresh_snapshot(registry_dir, monkeypatch):
+    """A fresh snapshot is used without touching the JSON parser"""
+    path = registry_dir / "alpha.json"
+    write_registry_snapshot(path)
+    monkeypatch.setattr(json, "load", lambda *a, **k: pytest.fail("JSON was parsed"))
+
+    assert load_registry(path)["master_name"] == "alpha.pptx"
+
+
+def test_stale_snapshot_falls_back_to_json(registry_dir, monkeypatch):
+    """Rewriting the JSON invalidates the snapshot; the loader then refreshes it"""
+    path = registry_dir / "alpha.json"
+    write_registry_snapshot(path)
+    _write_registry(registry_dir, "alpha", "alpha-v2.pptx", bump_ns=10_000_000)
+
+    assert load_registry(path)["master_name"] == "alpha-v2.pptx"
+    monkeypatch.setattr(json, "load", lambda *a, **k: pytest.fail("JSON was parsed"))
+    assert load_registry(path)["master_name"] == "alpha-v2.pptx"
+
+
+def test_json_replaced_during_load_is_not_stamped_fresh(registry_dir, monkeypatch):
+    """A JSON replaced while it is being parsed leaves a stale (not a falsely fresh) snapshot"""
+    path = registry_dir / "alpha.json"
+    real_load = json.load
+
+    def load_then_replace(f, *args, **kwargs):
+        data = real_load(f, *args, **kwargs)
+        monkeypatch.setattr(json, "load", real_load)
+        _write_registry(registry_dir, "alpha", "alpha-v2.pptx", bump_ns=10_000_000)
+        return data
+
+    monkeypatch.setattr(json, "load", load_then_replace)
+    assert load_registry(path)["master_name"] == "alpha.pptx"
+    assert load_registry(path)["master_name"] == "alpha-v2.pptx"
+
+
+def test_write_registry_keeps_file_mode(registry_dir):
+    """Atomic rewrites keep the registry's mode instead of mkstemp's 0600"""
+    path = registry_dir / "alpha.json"
+    os.chmod(path, 0o644)
+    write_registry(path, {"master_name": "alpha-v2.pptx", "layouts": []})
+
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    assert os.stat(snapshot_path(path)).st_mode & 0o777 == 0o666 & ~_current_umask()
+
+
+def _current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def test_corrupt_snapshot_is_ignored(registry_dir):
+    """An unreadable snapshot never breaks loading"""
+    path = registry_dir / "alpha.json"
+    snapshot_path(path).write_bytes(b"not a pickle")
+
+    assert load_registry(path)["master_name"] == "alpha.pptx"
+
+
+def test_snapshots_are_not_listed_in_catalog(registry_dir):
+    """Snapshot files sit next to the JSON but are not catalog entries"""
+    write_registry_snapshot(registry_dir / "alpha.json")
+    assert set(RegistryStore(str(registry_dir)).catalog()) == {"alpha", "beta"}
@@ -0,0 +1,149 @@
+"""
+Tests for incremental re-render (src/nodes/pipeline_2_generation/rerender.py).
+
+Run: pytest test_rerender.py -v
+"""
+import copy
+import io
+import zipfile
+
+import pytest
+from pptx import Presentation
+from src.nodes.pipeline_2_generation import injector
+from src.nodes.pipeline_2_generation.rerender import rerender_deck
+from src.utils.template_pool import TemplatePool
+
+
+def _slide(title, layout_index=1, background=False):
+    return {
+        "layout_index": layout_index,
+        "content": {
+            "0": {"runs": [{"text": title, "bold": False, "italic": False}], "font_size": None,
+                  "alignment": None, "semantic_role": "title"},
+            "1": {"bullets": [{"runs": [{"text": f"{title} point", "bold": True, "italic": False}]}],
+                  "font_size": 18, "alignment": "LEFT", "semantic_role": "bullets"},
+        },
+        "slide_role": "CONTENT",
+        "background_image": {"enabled": background, "keywords": "k", "mood": "m",
+                             "composition": "c", "overlay_opacity": 0.5},
+        "_is_semantic": True,
+    }
+
+
+MANIFEST = [_slide(f"Slide {i}", layout_index=1 + i % 3) for i in range(6)]
+
+
+def _render(tmp_path, manifest, name):
+    template = tmp_path / "master.pptx"
+    if not template.exists():
+        Presentation().save(str(template))
+    output = tmp_path / name
+    injector.surgical_injection_node({
+        "primary_master_path": str(template), "manifest": manifest, "final_file_path": str(output),
+    })
+    return str(output)
+
+
+def _outline(deck):
+    """(layout name, texts of every shape) per slide."""
+    prs = Presentation(deck)
+    return [(slide.slide_layout.name, [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame])
+            for slide in prs.slides]
+
+
+def test_rerender_matches_a_full_render(tmp_path):
+    """Edit, insert, delete and a background change: same deck as rendering the new manifest from scratch"""
+    TemplatePool.reset()
+    previous = _render(tmp_path, MANIFEST, "previous.pptx")
+
+    edited = copy.deepcopy(MANIFEST)
+    edited[2]["content"]["0"]["runs"][0]["text"] = "Slide 2 (edited)"
+    edited[3] = _slide("Slide 3", layout_index=4, background=True)
+    del edited[4]
+    edited.insert(0, _slide("New opener", layout_index=0))
+
+    output = tmp_path / "updated.pptx"
+    stats = rerender_deck(previous, MANIFEST, edited, str(output))
+
+    assert stats == {"kept": 3, "rendered": 3, "removed": 3}  # Slides 0, 1 and 5 are reused
+    assert _outline(str(output)) == _outline(_render(tmp_path, edited, "full.pptx"))
+    with zipfile.ZipFile(output) as zf:
+        assert zf.testzip() is None
+        slides = {n for n in zf.namelist() if n.startswith("ppt/slides/slide")}
+    assert slides == {f"ppt/slides/slide{i}.xml" for i in range(1, len(edited) + 1)}
+
+
+def test_unchanged_manifest_copies_every_entry(tmp_path):
+    """No edits: nothing is rendered and every entry keeps its compressed bytes"""
+    TemplatePool.reset()
+    previous = _render(tmp_path, MANIFEST, "previous.pptx")
+    out = io.BytesIO()
+    stats = rerender_deck(previous, MANIFEST, copy.deepcopy(MANIFEST), out)
+
+    assert stats == {"kept": 6, "rendered": 0, "removed": 0}
+    with zipfile.ZipFile(previous) as before, zipfile.ZipFile(io.BytesIO(out.getvalue())) as after:
+        assert [(i.filename, i.CRC, i.compress_size) for i in after.infolist()] == \
+            [(i.filename, i.CRC, i.compress_size) for i in before.infolist()]
+
+
+def test_manifest_must_match_the_previous_deck(tmp_path):
+    TemplatePool.reset()
+    previous = _render(tmp_path, MANIFEST, "previous.pptx")
+    with pytest.raises(ValueError):
+        rerender_deck(previous, MANIFEST[:-1], MANIFEST, io.BytesIO())
+
+
+def test_rerender_maps_layouts_of_a_slimmed_deck(tmp_path, monkeypatch):
+    """Manifest layout indices resolve to the layouts a slimmed deck kept, not to shifted positions"""
+    TemplatePool.reset()
+    monkeypatch.setattr(injector, "SLIM_OUTPUT_DECKS", True)
+    manifest = [_slide("Content", layout_index=1), _slide("Title only", layout_index=5)]
+    previous = _render(tmp_path, manifest, "previous.pptx")
+
+    edited = copy.deepcopy(manifest)
+    edited[0]["content"]["0"]["runs"][0]["text"] = "Content (edited)"
+    output = tmp_path / "updated.pptx"
+    rerender_deck(previous, manifest, edited, str(output))
+
+    assert [layout for layout, _ in _outline(str(output))] == ["Title and Content", "Title Only"]
+    assert _outline(str(output))[0][1][0] == "Content (edited)"
+
+
+def test_rerender_rejects_layouts_removed_by_slimming(tmp_path, monkeypatch):
+    TemplatePool.reset()
+    monkeypatch.setattr(injector, "SLIM_OUTPUT_DECKS", True)
+    manifest = [_slide("Content", layout_index=1), _slide("Title only", layout_index=5)]
+    previous = _render(tmp_path, manifest, "previous.pptx")
+
+    edited = copy.deepcopy(manifest)
+    edited[0]["layout_index"] = 3
+    with pytest.raises(ValueError, match="slimmed"):
+        rerender_deck(previous, manifest, edited, io.BytesIO())
+
+
+def test_failed_save_keeps_the_previous_deck(tmp_path, monkeypatch):
+    """Re-rendering in place does not truncate the previous deck when the save fails partway"""
+    from src.nodes.pipeline_2_generation import rerender
+    from src.utils.deck_writer import DeckArchive
+
+    TemplatePool.reset()
+    previous = _render(tmp_path, MANIFEST, "previous.pptx")
+    with open(previous, "rb") as f:
+        original = f.read()
+    edited = copy.deepcopy(MANIFEST)
+    edited[0]["content"]["0"]["runs"][0]["text"] = "Slide 0 (edited)"
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(rerender, "PASSTHROUGH_DECK_WRITER", True)
+    monkeypatch.setattr(DeckArchive, "raw_entry", crash)  # Fails after the zip has been opened
+    with pytest.raises(OSError):
+        rerender_deck(previous, MANIFEST, edited, previous)
+
+    with open(previous, "rb") as f:
+        assert f.read() == original
+    monkeypatch.undo()
+
+    rerender_deck(previous, MANIFEST, edited, previous)
+    assert _outline(previous)[0][1][0] == "Slide 0 (edited)"
@@ -0,0 +1,99 @@
+"""
+Parity tests for the compiled slide renderer (src/utils/slide_compiler.py):
+every part of the saved deck must match the python-pptx injector path byte for byte.
+
+Run: pytest test_slide_compiler.py -v
+"""
+import zipfile
+import pytest
+from pptx import Presentation
+from src.nodes.pipeline_2_generation import injector
+from src.utils.template_pool import TemplatePool
+
+
+def _runs(text, bold=False, italic=False):
+    return [{"text": text, "bold": bold, "italic": italic}]
+
+
+def _semantic(layout_index, content, role="CONTENT", background=False):
+    return {
+        "layout_index": layout_index,
+        "content": content,
+        "slide_role": role,
+        "background_image": {"enabled": background, "keywords": "k", "mood": "m",
+                             "composition": "c", "overlay_opacity": 0.5},
+        "_is_semantic": True,
+    }
+
+
+MANIFEST = [
+    _semantic(0, {
+        "0": {"runs": _runs("Quarterly Review"), "font_size": None, "alignment": "CENTER",
+              "semantic_role": "title", "vertical_anchor": "MIDDLE"},
+        "1": {"runs": _runs("FY24 \x07 results") + _runs("bold", bold=True), "font_size": 28,
+              "alignment": None, "semantic_role": "body"},
+    }, role="TITLE", background=True),
+    _semantic(1, {
+        "0": {"runs": _runs("Highlights"), "font_size": None, "alignment": None, "semantic_role": "title"},
+        "1": {"bullets": [{"runs": _runs("Revenue ") + _runs("up", italic=True)}, {"runs": _runs("Costs down")},
+                          {"runs": _runs("")}],
+              "font_size": None, "alignment": "LEFT", "semantic_role": "bullets",
+              "autofit": {"fitted_font_pt": 16, "font_scale": 80.0}},
+        "99": {"runs": _runs("No such placeholder"), "font_size": 12, "alignment": None, "semantic_role": "body"},
+    }),
+    _semantic(8, {
+        "0": {"runs": _runs("Photo"), "font_size": 20, "alignment": "RIGHT", "semantic_role": "title"},
+        "1": {"runs": _runs("Picture slot"), "font_size": None, "alignment": None, "semantic_role": "caption"},
+        "2": {"runs": _runs("   "), "font_size": None, "alignment": None, "semantic_role": "caption"},
+    }),
+    _semantic(5, {
+        "0": {"runs": _runs("Closing"), "font_size": None, "alignment": None, "semantic_role": "title",
+              "autofit": {"fitted_font_pt": 30, "font_scale": None}},
+    }, role="CLOSING", background=True),
+    {  # Legacy slot_id content (python-pptx text path in both modes)
+        "layout_index": 1,
+        "content": {"0": {"runs": _runs("Legacy"), "font_size": 24, "alignment": "LEFT"}},
+        "slide_role": "CONTENT",
+        "background_image": {},
+    },
+]
+
+
+def _render(tmp_path, monkeypatch, compiled, manifest):
+    template = tmp_path / "master.pptx"
+    if not template.exists():
+        Presentation().save(str(template))
+    monkeypatch.setattr(injector, "COMPILED_SLIDE_RENDERER", compiled)
+    output = tmp_path / f"deck_{compiled}.pptx"
+    injector.surgical_injection_node({
+        "primary_master_path": str(template),
+        "manifest": manifest,
+        "final_file_path": str(output),
+    })
+    with zipfile.ZipFile(output) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+@pytest.mark.parametrize("repeat", [1, 3])
+def test_compiled_deck_matches_python_pptx(tmp_path, monkeypatch, repeat):
+    """Same parts, same bytes: slides, rels, presentation.xml, notes and content types"""
+    TemplatePool.reset()
+    manifest = MANIFEST * repeat
+    expected = _render(tmp_path, monkeypatch, False, manifest)
+    actual = _render(tmp_path, monkeypatch, True, manifest)
+
+    assert sorted(actual) == sorted(expected)
+    for name in expected:
+        assert actual[name] == expected[name], name
+
+
+def test_compiled_deck_round_trips(tmp_path, monkeypatch):
+    """The compiled deck opens in python-pptx with the injected text in place"""
+    TemplatePool.reset()
+    _render(tmp_path, monkeypatch, True, MANIFEST)
+    prs = Presentation(str(tmp_path / "deck_True.pptx"))
+
+    assert len(prs.slides) == len(MANIFEST)
+    body = prs.slides[1].placeholders[1].text_frame
+    assert [p.text for p in body.paragraphs] == ["Revenue up", "Costs down", ""]
+    assert body._txBody.bodyPr.normAutofit.fontScale == 80.0
@@ -0,0 +1,90 @@
+"""
+Unit tests for the pre-parsed master template pool.
+
+Run: pytest test_template_pool.py -v
+"""
+import os
+import pytest
+from pptx import Presentation
+from src.utils.template_pool import TemplatePool
+
+
+@pytest.fixture
+def master_path(tmp_path):
+    """Save python-pptx's default template as a stand-in master."""
+    path = tmp_path / "master.pptx"
+    Presentation().save(path)
+    TemplatePool.reset()
+    yield str(path)
+    TemplatePool.reset()
+
+
+def test_master_parsed_once(master_path):
+    """Repeated checkouts reuse the pooled parse"""
+    for _ in range(3):
+        TemplatePool.checkout(master_path)
+    stats = TemplatePool.stats()
+    assert stats["parses"] == 1
+    assert stats["hits"] == 2
+
+
+def test_clones_are_independent(master_path):
+    """Adding slides to one clone must not leak into the pool or other clones"""
+    first = TemplatePool.checkout(master_path)
+    first.slides.add_slide(first.slide_layouts[0])
+
+    second = TemplatePool.checkout(master_path)
+    assert len(first.slides) == 1
+    assert len(second.slides) == 0
+
+
+def test_clone_saves_valid_deck(master_path, tmp_path):
+    """A pooled clone renders and saves like a freshly opened Presentation"""
+    prs = TemplatePool.checkout(master_path)
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Pooled"
+    out = tmp_path / "out.pptx"
+    prs.save(out)
+
+    reopened = Presentation(out)
+    assert reopened.slides[0].shapes.title.text == "Pooled"
+
+
+def test_touch_without_change_does_not_reparse(master_path):
+    """A new mtime with identical bytes keeps the parsed copy (hash check)"""
+    TemplatePool.checkout(master_path)
+    st = os.stat(master_path)
+    os.utime(master_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    TemplatePool.checkout(master_path)
+    assert TemplatePool.stats()["parses"] == 1
+
+
+def test_changed_master_is_reparsed(master_path):
+    """Changed bytes invalidate the pooled copy"""
+    TemplatePool.checkout(master_path)
+
+    prs = Presentation(master_path)
+    prs.slides.add_slide(prs.slide_layouts[0])
+    prs.save(master_path)
+    st = os.stat(master_path)
+    os.utime(master_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+    clone = TemplatePool.checkout(master_path)
+    assert TemplatePool.stats()["parses"] == 2
+    assert len(clone.slides) == 1
+
+
+def test_clone_made_outside_pool_lock(master_path, monkeypatch):
+    """Concurrent checkouts must not serialize on the deep copy"""
+    import copy
+    real_deepcopy = copy.deepcopy
+    held = []
+
+    def spy(obj, *args):
+        held.append(TemplatePool._lock.locked())
+        return real_deepcopy(obj, *args)
+
+    monkeypatch.setattr("src.utils.template_pool.copy.deepcopy", spy)
+    TemplatePool.checkout(master_path)
+    TemplatePool.checkout(master_path)
+    assert held and not any(held)
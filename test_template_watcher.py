@@ -0,0 +1,129 @@
+"""
+Tests for watch-mode indexing (src/utils/template_watcher.py): debouncing, file
+filtering, background re-indexing and publishing to the RegistryStore.
+
+Run: pytest test_template_watcher.py -v
+"""
+import time
+import pytest
+from pptx import Presentation
+import index_templates
+from src.utils.registry_helper import get_registry_store
+from src.utils import template_watcher
+from src.utils.template_watcher import TemplateWatcher
+
+
+def _wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class FakeIndexer:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, template_path, registry_dir):
+        self.calls.append(template_path)
+        if self.fail:
+            raise RuntimeError("boom")
+        return {"template": template_path, "ok": True, "skipped": True, "registry": None, "error": None}
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    return templates, tmp_path / "registry"
+
+
+def test_events_are_debounced(dirs):
+    """A burst of events for one file triggers a single re-index"""
+    templates, registry = dirs
+    (templates / "alpha.pptx").write_bytes(b"")
+    indexer = FakeIndexer()
+    watcher = TemplateWatcher(indexer, str(templates), str(registry), debounce_seconds=0.2, backend="poll")
+    watcher.start(initial_scan=False)
+    try:
+        for _ in range(5):
+            watcher.notify(str(templates / "alpha.pptx"))
+            time.sleep(0.02)
+        assert watcher.wait_idle(timeout=5)
+    finally:
+        watcher.stop()
+
+    assert len(indexer.calls) == 1
+
+
+def test_only_templates_are_indexed(dirs):
+    """Non-.pptx files and Office lock files are ignored"""
+    templates, registry = dirs
+    indexer = FakeIndexer()
+    watcher = TemplateWatcher(indexer, str(templates), str(registry), debounce_seconds=0.05, backend="poll")
+    for name in ("notes.txt", "~$alpha.pptx", "alpha.pptx"):
+        (templates / name).write_bytes(b"")
+    watcher.start()
+    try:
+        assert watcher.wait_idle(timeout=5)
+    finally:
+        watcher.stop()
+
+    assert [c.rsplit("/", 1)[-1] for c in indexer.calls] == ["alpha.pptx"]
+
+
+def test_indexer_errors_do_not_stop_watcher(dirs):
+    """A failing re-index is recorded and later events are still processed"""
+    templates, registry = dirs
+    (templates / "alpha.pptx").write_bytes(b"")
+    indexer = FakeIndexer(fail=True)
+    watcher = TemplateWatcher(indexer, str(templates), str(registry), debounce_seconds=0.05, backend="poll")
+    watcher.start()
+    try:
+        assert watcher.wait_idle(timeout=5)
+        watcher.notify(str(templates / "alpha.pptx"))
+        assert watcher.wait_idle(timeout=5)
+    finally:
+        watcher.stop()
+
+    assert len(indexer.calls) == 2
+    assert not watcher.results[0]["ok"]
+
+
+def test_results_are_bounded(dirs):
+    """Only the most recent max_results indexer results are kept"""
+    templates, registry = dirs
+    for name in ("alpha", "beta", "gamma"):
+        (templates / f"{name}.pptx").write_bytes(b"")
+    watcher = TemplateWatcher(FakeIndexer(), str(templates), str(registry), backend="poll", max_results=2)
+    for name in ("alpha", "beta", "gamma"):
+        watcher._reindex(str(templates / f"{name}.pptx"))
+
+    assert [r["template"].rsplit("/", 1)[-1] for r in watcher.results] == ["beta.pptx", "gamma.pptx"]
+
+
+@pytest.mark.parametrize("backend", [
+    "poll",
+    pytest.param("watchdog", marks=pytest.mark.skipif(not template_watcher.WATCHDOG_AVAILABLE,
+                                                      reason="watchdog not installed")),
+])
+def test_new_template_is_indexed_and_published(dirs, backend):
+    """A template dropped into the folder is indexed and served from the store without a reload"""
+    templates, registry = dirs
+    watcher = TemplateWatcher(index_templates.index_template, str(templates), str(registry),
+                              debounce_seconds=0.1, poll_seconds=0.05, backend=backend)
+    watcher.start()
+    try:
+        Presentation().save(str(templates / "alpha.pptx"))
+        assert _wait_for(lambda: any(r["ok"] for r in watcher.results))
+    finally:
+        watcher.stop()
+
+    store = get_registry_store(str(registry))
+    registry_data = store.get("alpha")
+    assert len(registry_data["layouts"]) == 11
+    assert store.stats()["misses"] == 0  # Published by the watcher, not loaded on demand
+    assert "alpha" in store.catalog()
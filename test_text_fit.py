@@ -0,0 +1,179 @@
+"""
+Unit tests for the vectorized text fitting engine (src/utils/text_fit.py) and its
+use by the beautifier's circle/ellipse and placeholder (rectangle) fitting.
+
+Run: pytest test_text_fit.py -v
+"""
+import math
+import random
+import pytest
+from pptx import Presentation
+from src.nodes.pipeline_2_generation.beautifier import (
+    CHAR_WIDTH_RATIO,
+    FONT_SIZE_RANGE,
+    LINE_HEIGHT_RATIO,
+    _beautify_semantic_content,
+    _fit_text_in_circle,
+)
+from src.utils.ppt_helper import set_norm_autofit
+from src.utils.text_fit import (
+    ellipse_fits,
+    fit_ellipse_font_size,
+    fit_rect_font_size,
+    paragraph_lengths,
+    rect_fits,
+    word_lengths,
+)
+
+
+def _reference_fits(text, half_width, half_height, font):
+    """Scalar greedy wrap (the original per-probe loop), generalized to an ellipse chord."""
+    line_height = font * LINE_HEIGHT_RATIO / 720.0
+    char_width = font * CHAR_WIDTH_RATIO / 960.0
+    current_line, current_y = [], -half_height
+    for word in text.split():
+        y = current_y + line_height / 2
+        available = 2 * half_width * math.sqrt(max(0.0, 1 - (y / half_height) ** 2))
+        if current_line and sum(len(w) + 1 for w in current_line) * char_width > available:
+            current_line = [word]
+            current_y += line_height
+            if current_y + line_height > half_height:
+                return False
+        else:
+            current_line.append(word)
+    if current_line:
+        current_y += line_height
+    return current_y <= half_height
+
+
+def _random_text(rng, max_words):
+    return " ".join("x" * rng.randint(1, 14) for _ in range(rng.randint(1, max_words)))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_all_sizes_match_scalar_wrap(seed):
+    """Every candidate size gets the same verdict as the scalar greedy wrap"""
+    rng = random.Random(seed)
+    fonts = list(range(FONT_SIZE_RANGE[0], FONT_SIZE_RANGE[1] + 1))
+    for _ in range(25):
+        text = _random_text(rng, 60)
+        half_width, half_height = rng.uniform(0.05, 0.3), rng.uniform(0.05, 0.3)
+        fits = ellipse_fits(word_lengths(text), half_width, half_height, fonts, CHAR_WIDTH_RATIO, LINE_HEIGHT_RATIO)
+        assert fits.tolist() == [_reference_fits(text, half_width, half_height, f) for f in fonts]
+
+
+def test_circle_picks_largest_fitting_size():
+    """The chosen size fits and the next size up does not (or is out of range)"""
+    text = "Quarterly revenue grew twelve percent on platform adoption"
+    radius = 0.15 * (1 - 0.1)
+    size = _fit_text_in_circle(text, [], 0.15)
+
+    assert _reference_fits(text, radius, radius, size)
+    assert size == FONT_SIZE_RANGE[1] or not _reference_fits(text, radius, radius, size + 1)
+
+
+def test_ellipse_axes_are_used():
+    """A wide, short ellipse fits differently from the circle on its smaller axis"""
+    text = "Net retention improved across every enterprise customer segment this year"
+    circle = _fit_text_in_circle(text, [], 0.08)
+    wide = _fit_text_in_circle(text, [], 0.08, ellipse_axes=[0.3, 0.08])
+
+    assert wide > circle
+
+
+def test_fit_is_cached_by_word_lengths():
+    """Texts with the same word lengths and geometry reuse one fitting result"""
+    fit_ellipse_font_size.cache_clear()
+    _fit_text_in_circle("alpha beta gamma", [], 0.2)
+    _fit_text_in_circle("omega zeta delta", [], 0.2)
+
+    assert fit_ellipse_font_size.cache_info().hits == 1
+
+
+def _reference_rect_fits(paragraphs, width, height, font):
+    """Scalar greedy wrap of paragraphs in a box; over-long words break across lines."""
+    capacity = width / (font * CHAR_WIDTH_RATIO)
+    lines = 0
+    for paragraph in paragraphs:
+        line = None
+        for word in paragraph.split() or [""]:
+            if line is not None and line + 1 + len(word) <= capacity:
+                line += 1 + len(word)
+            elif len(word) > capacity:
+                lines, line = lines + math.ceil(len(word) / capacity), None
+            else:
+                lines, line = lines + 1, len(word)
+    return lines <= math.floor(height / (font * LINE_HEIGHT_RATIO))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_rect_sizes_match_scalar_wrap(seed):
+    """Every candidate size gets the same verdict as the scalar paragraph wrap"""
+    rng = random.Random(seed)
+    fonts = list(range(FONT_SIZE_RANGE[0], FONT_SIZE_RANGE[1] + 1))
+    for _ in range(50):
+        paragraphs = [_random_text(rng, 30) if rng.random() > 0.1 else "" for _ in range(rng.randint(1, 6))]
+        width, height = rng.uniform(30, 800), rng.uniform(15, 500)
+        fits = rect_fits(paragraph_lengths(paragraphs), width, height, fonts, CHAR_WIDTH_RATIO, LINE_HEIGHT_RATIO)
+        assert fits.tolist() == [_reference_rect_fits(paragraphs, width, height, f) for f in fonts]
+
+
+def _body_slot(default_font=None, policy="split_slide"):
+    return {
+        "slot_id": 1, "semantic_role": "bullets", "role_hint": "body", "overflow_policy": policy,
+        "min_font_pt": 12, "max_font_pt": 24,
+        "template_formatting": {"default_font_size_pt": default_font, "auto_size": "None"},
+        "geometry": {"norm_width": 0.4, "norm_height": 0.3, "area_ratio": 0.12},
+    }
+
+
+def _fit_bullets(slot, bullets):
+    return _beautify_semantic_content(
+        semantic_content={"bullets": bullets}, layout={"layout_name": "Content"},
+        slide_role="CONTENT", slide_idx=0, semantic_mapping={"bullets": [slot]},
+    )["1"]
+
+
+def test_short_text_keeps_template_size():
+    """Text that fits at the template size gets no font size or autofit"""
+    style = _fit_bullets(_body_slot(default_font=20), ["Revenue grew", "Costs fell"])
+    assert style["font_size"] is None and "autofit" not in style
+
+
+def test_overflowing_text_gets_font_scale():
+    """Overflowing text keeps the template size and is shrunk by fontScale"""
+    bullets = ["Quarterly revenue grew twelve percent on **platform** adoption across regions"] * 8
+    style = _fit_bullets(_body_slot(default_font=20), bullets)
+    fitted = style["autofit"]["fitted_font_pt"]
+
+    assert style["font_size"] is None
+    assert 12 <= fitted < 20
+    assert style["autofit"]["font_scale"] == round(fitted / 20 * 100, 1)
+
+
+def test_unknown_template_size_writes_fitted_size():
+    """Without a template size the fitted size is explicit; policy 'truncate' is left alone"""
+    bullets = ["Quarterly revenue grew twelve percent on platform adoption across regions"] * 8
+    style = _fit_bullets(_body_slot(), bullets)
+    assert style["font_size"] == style["autofit"]["fitted_font_pt"] < 24
+    assert style["autofit"]["font_scale"] is None
+    assert "autofit" not in _fit_bullets(_body_slot(policy="truncate"), bullets)
+
+
+def test_rect_fit_is_cached_per_text_and_slot():
+    """The same text in the same slot is fitted once"""
+    fit_rect_font_size.cache_clear()
+    for _ in range(3):
+        _fit_bullets(_body_slot(default_font=20), ["Alpha beta gamma"] * 9)
+    assert fit_rect_font_size.cache_info().misses == 1
+
+
+def test_set_norm_autofit_writes_font_scale():
+    """The injector helper writes <a:normAutofit fontScale=...> in thousandths of a percent"""
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    tf = slide.placeholders[1].text_frame
+    set_norm_autofit(tf, 62.5)
+
+    autofit = tf._txBody.bodyPr.normAutofit
+    assert autofit is not None and autofit.get("fontScale") == "62500"
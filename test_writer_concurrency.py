@@ -0,0 +1,97 @@
+"""
+Unit tests for the concurrent per-slide writer.
+Uses a fake LLM so no API keys are required.
+
+Run: pytest test_writer_concurrency.py -v
+"""
+import json
+import threading
+import time
+import pytest
+from src.nodes.pipeline_2_generation import writer
+
+
+class FakeLLM:
+    """Returns a title echoing the slide intent; tracks peak concurrency."""
+
+    def __init__(self, delay=0.05, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            intent = prompt.split("INTENT: ", 1)[1].split("\n", 1)[0]
+            if self.fail_on and self.fail_on in intent:
+                raise RuntimeError("simulated LLM failure")
+            return type("Msg", (), {"content": json.dumps({"content": {"title": intent}})})()
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+REGISTRY = {
+    "layouts": [
+        {
+            "layout_index": 0,
+            "layout_name": "Title Only",
+            "slots": [{"semantic_role": "title", "slot_id": 0, "max_chars": 100}],
+        }
+    ]
+}
+
+
+def _state(n):
+    return {
+        "content_map": "context",
+        "registry": REGISTRY,
+        "slide_plans": [
+            {"layout_index": 0, "layout_name": "Title Only", "slide_intent": f"Intent {i}", "slide_role": "CONTENT"}
+            for i in range(n)
+        ],
+    }
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeLLM()
+    monkeypatch.setattr(writer, "_get_llm", lambda: llm)
+    monkeypatch.setattr(writer, "WRITER_MAX_CONCURRENCY", 4)
+    return llm
+
+
+def test_manifest_keeps_plan_order(fake_llm):
+    """Concurrent results are reassembled in plan order"""
+    result = writer.writer_node(_state(8))
+    titles = [entry["content"]["title"] for entry in result["manifest"]]
+    assert titles == [f"Intent {i}" for i in range(8)]
+
+
+def test_calls_run_concurrently_within_limit(fake_llm):
+    """Slide prompts overlap but never exceed WRITER_MAX_CONCURRENCY"""
+    writer.writer_node(_state(8))
+    assert 1 < fake_llm.peak <= 4
+
+
+def test_sequential_when_concurrency_is_one(fake_llm, monkeypatch):
+    """WRITER_MAX_CONCURRENCY=1 restores strictly sequential calls"""
+    monkeypatch.setattr(writer, "WRITER_MAX_CONCURRENCY", 1)
+    writer.writer_node(_state(3))
+    assert fake_llm.peak == 1
+
+
+def test_failed_slide_uses_fallback(fake_llm):
+    """A failing slide gets role-based fallback content without affecting the others"""
+    fake_llm.fail_on = "Intent 2"
+    manifest = writer.writer_node(_state(4))["manifest"]
+
+    assert len(manifest) == 4
+    assert manifest[1]["content"]["title"] == "Intent 1"
+    assert manifest[2]["content"]["title"] == "Intent 2"  # Fallback uses slide_intent
+    assert manifest[3]["content"]["title"] == "Intent 3"